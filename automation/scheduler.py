@@ -16,12 +16,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from utils.logger import logger
 from utils.helpers import load_json_file, save_json_file, load_posted_games
-from services.affiliate_service import fetch_all_affiliate_products, insert_gamersgate_offers
+from database.db_connect import get_query_stats
+from services.affiliate_service import run_affiliate_sources
 from services.steam_service import fetch_steam_topsellers
 from services.deals_service import find_matching_deals
 from services.validation_service import validate_deals_batch
 from services.twitter_service import post_deal_to_twitter
-from services.igdb_data_service import fetch_all_genres, fetch_all_igdb_games, download_igdb_images_for_items
+from services.igdb_data_service import fetch_all_genres, fetch_all_igdb_games, download_igdb_images_for_items, backfill_normalized_titles
 
 def daily_data_collection():
     """
@@ -33,17 +34,18 @@ def daily_data_collection():
     logger.info("="*60)
     
     try:
-        # Step 1: Fetch all affiliate products (CJ + IndieGala)
         start_time = time.time()
-        logger.info("Step 1/4: Fetching all affiliate products (CJ + IndieGala)...")
-        if not fetch_all_affiliate_products():
+        db_time_before = sum(stat["total_ms"] for stat in get_query_stats()) / 1000
+        
+        # Make sure every item has a normalized title for offer matching (no-op when up to date)
+        backfill_normalized_titles()
+        
+        # Step 1: Fetch all offer sources concurrently (CJ + IndieGala, then GamersGate matched with the CSV)
+        logger.info("Step 1/4: Fetching all offer sources (CJ, IndieGala, GamersGate)...")
+        if run_affiliate_sources() is None:
             logger.error("Failed to fetch affiliate products")
             return
         
-        # Step 1b: Insert GamersGate offers (matches with affiliate products from CSV)
-        logger.info("Step 1b/4: Inserting GamersGate offers...")
-        insert_gamersgate_offers()
-        
         # Step 2: Fetch Steam top sellers
         logger.info("Step 2/4: Fetching Steam top sellers...")
         if not fetch_steam_topsellers():
@@ -67,8 +69,11 @@ def daily_data_collection():
         end_time = time.time()
         elapsed_time = end_time - start_time
         
+        db_time = sum(stat["total_ms"] for stat in get_query_stats()) / 1000 - db_time_before
+        
         logger.info("="*60)
         logger.info(f"Data collection and validation completed in {elapsed_time:.2f} seconds")
+        logger.info(f"Time spent in database queries: {db_time:.2f} seconds")
         logger.info("="*60)
         
         # Shuffle deals for random posting
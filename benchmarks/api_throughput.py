@@ -0,0 +1,69 @@
+"""
+API throughput benchmark
+Measures requests/sec of the read endpoints with sequential and concurrent clients
+
+Run against a live API server, once on the old code and once on the new code:
+    python benchmarks/api_throughput.py --base-url http://localhost:8001 --concurrency 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ENDPOINTS = [
+    "/api/offers_list?limit=60",
+    "/api/topsellers?limit=60",
+    "/api/search?q=the&limit=60",
+    "/api/genres",
+]
+
+def _run(session, url, total_requests, concurrency):
+    """
+    Fire total_requests GETs at url using concurrency client threads
+
+    Returns:
+        tuple: (requests per second, error count)
+    """
+    errors = 0
+
+    def _request(_):
+        try:
+            return session.get(url, timeout=60).status_code == 200
+        except requests.RequestException:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for ok in executor.map(_request, range(total_requests)):
+            if not ok:
+                errors += 1
+    elapsed = time.perf_counter() - start
+
+    return total_requests / elapsed, errors
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API requests/sec")
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint per run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    print(f"{'endpoint':<32} {'seq req/s':>10} {'conc req/s':>11} {'speedup':>8} {'errors':>7}")
+    for endpoint in ENDPOINTS:
+        url = args.base_url.rstrip("/") + endpoint
+        # Warm up connection pool and query cache
+        _run(session, url, min(args.requests, 10), 1)
+
+        seq_rps, seq_errors = _run(session, url, args.requests, 1)
+        conc_rps, conc_errors = _run(session, url, args.requests, args.concurrency)
+        speedup = conc_rps / seq_rps if seq_rps else 0
+        print(f"{endpoint:<32} {seq_rps:>10.1f} {conc_rps:>11.1f} {speedup:>7.2f}x {seq_errors + conc_errors:>7}")
+
+if __name__ == "__main__":
+    main()
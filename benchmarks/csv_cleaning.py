@@ -0,0 +1,87 @@
+"""
+Feed CSV cleaning benchmark
+Times _iter_cleaned_rows on a synthetic CJ feed for each process count and
+checks that the merged output is identical to single-process cleaning
+
+    python benchmarks/csv_cleaning.py --rows 500000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.affiliate_service import _iter_cleaned_rows
+
+FIELDS = ["PROGRAM_NAME", "ID", "TITLE", "LINK", "IMAGE_LINK", "AVAILABILITY", "PRICE", "SALE_PRICE", "DISCOUNT"]
+# CJ feeds carry more columns than the ones kept
+EXTRA_FIELDS = ["DESCRIPTION", "BRAND", "GTIN", "MPN", "CATEGORY"]
+
+def write_feed(path, rows, rng):
+    """Write a synthetic CJ feed with embedded newlines/tabs and padding to clean"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS + EXTRA_FIELDS)
+        for i in range(rows):
+            writer.writerow([
+                rng.choice(["GOG.COM INT", "YUPLAY", "GamersGate.com"]),
+                str(i),
+                f"  Synthetic Game {i}:\tChapter {rng.randint(1, 9)}\n",
+                f"https://example.com/game/{i}",
+                f"https://example.com/img/{i}.jpg ",
+                "in stock",
+                f"{rng.choice([19.99, 29.99, 59.99])} USD",
+                f"{rng.uniform(1, 19):.2f} USD",
+                "",
+                "A long\r\ndescription " * 10,
+                "Brand",
+                "",
+                "",
+                "Games"
+            ])
+
+def _levels(max_workers):
+    levels = [1]
+    while levels[-1] * 2 <= max_workers:
+        levels.append(levels[-1] * 2)
+    if levels[-1] != max_workers:
+        levels.append(max_workers)
+    return levels
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-process feed CSV cleaning")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--files", type=int, default=4, help="Number of data files the rows are split into (one per process at a time)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix="affiliate_clean_bench_")
+    data_files = []
+    for i in range(args.files):
+        path = os.path.join(workdir, f"feed_{i}.csv")
+        write_feed(path, args.rows // args.files, rng)
+        data_files.append(path)
+
+    print(f"rows={args.rows} files={args.files} cpus={os.cpu_count()}")
+    print(f"{'processes':>9} {'seconds':>9} {'rows/s':>10} {'speedup':>8} {'identical':>9}")
+
+    baseline_rows = None
+    baseline_time = None
+    for workers in _levels(args.max_workers):
+        start = time.perf_counter()
+        rows = list(_iter_cleaned_rows(data_files, FIELDS, workers=workers))
+        elapsed = time.perf_counter() - start
+
+        if baseline_rows is None:
+            baseline_rows = rows
+            baseline_time = elapsed
+        print(f"{workers:>9} {elapsed:>9.3f} {len(rows) / elapsed:>10.0f} {baseline_time / elapsed:>7.2f}x {str(rows == baseline_rows):>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Offline ingestion benchmark
+Seeds the embedded SQLite backend with a synthetic catalogue and feed, then times
+offer preparation, database ingestion, deal matching and the API list queries
+
+No MySQL server or network access needed:
+    python benchmarks/ingest_pipeline.py --items 50000 --feed 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Use the embedded backend before config is imported anywhere
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("DB_SQLITE_PATH", ":memory:")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from database.db_connect import get_connection, execute_many
+from utils.title_normalizer import normalize_title
+
+DISTRIBUTORS = ["GOG", "YUPLAY", "GamersGate", "IndieGala"]
+PROGRAM_NAMES = ["GOG.COM INT", "YUPLAY", "GamersGate.com", "IndieGala"]
+
+def _timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<32} {time.perf_counter() - start:>8.3f}s")
+    return result
+
+def seed_database(item_count, rng):
+    """Insert distributors, genres, items and topsellers"""
+    connection = get_connection()
+    titles = [f"Synthetic Game {i}: Chapter {rng.randint(1, 9)}" for i in range(item_count)]
+
+    execute_many("INSERT INTO distributors (name) VALUES (%s)", [(name,) for name in DISTRIBUTORS], connection=connection)
+    execute_many("INSERT INTO genres (id, name) VALUES (%s, %s)", [(i, f"Genre {i}") for i in range(1, 21)], connection=connection)
+    execute_many(
+        "INSERT INTO items (title, normalized_title, item_type, igdb_id, igdb_cover_image_id) VALUES (%s, %s, %s, %s, %s)",
+        [(title, normalize_title(title), "base game", i + 1, None) for i, title in enumerate(titles)],
+        connection=connection
+    )
+    execute_many(
+        "INSERT INTO item_genres (item_id, genre_id) VALUES (%s, %s)",
+        [(i + 1, rng.randint(1, 20)) for i in range(item_count)],
+        connection=connection
+    )
+    execute_many(
+        "INSERT INTO topsellers (id, title, price) VALUES (%s, %s, %s)",
+        [(rank + 1, title, 59.99) for rank, title in enumerate(rng.sample(titles, min(500, item_count)))],
+        connection=connection
+    )
+    connection.commit()
+    connection.close()
+    return titles
+
+def build_feed(titles, feed_size, rng):
+    """Build synthetic cleaned feed rows (same shape as the catalogue source records)"""
+    rows = []
+    for i in range(feed_size):
+        # Roughly 10% of titles don't exist in the catalogue
+        title = rng.choice(titles) if rng.random() > 0.1 else f"Unknown Game {i}"
+        list_price = rng.choice([19.99, 29.99, 39.99, 59.99])
+        sale_price = round(list_price * rng.uniform(0.2, 0.95), 2)
+        rows.append({
+            "PROGRAM_NAME": rng.choice(PROGRAM_NAMES),
+            "ID": str(i),
+            "TITLE": title,
+            "LINK": f"https://example.com/game/{i}",
+            "IMAGE_LINK": f"https://example.com/img/{i}.jpg",
+            "AVAILABILITY": "in stock",
+            "PRICE": f"${list_price}",
+            "SALE_PRICE": f"${sale_price}",
+            "DISCOUNT": ""
+        })
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline ingestion benchmark (SQLite backend)")
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--feed", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Every data path the pipeline writes points into the workdir, never the real data/ tree
+    workdir = tempfile.mkdtemp(prefix="affiliate_bench_")
+    config.CSV_DIR = workdir
+    config.TEMP_DIR = workdir
+    config.PRODUCTS_CSV = os.path.join(workdir, "items_info.csv")
+    config.PRODUCTS_SNAPSHOT = os.path.join(workdir, "items_info.snap")
+    config.MISSING_TITLES_CSV = os.path.join(workdir, "missing_game_titles.csv")
+    config.CJ_FEED_DIR = os.path.join(workdir, "cj_feed")
+    config.CJ_FEED_STATE_JSON = os.path.join(config.CJ_FEED_DIR, "feed_state.json")
+
+    from services import affiliate_service
+    from services.deals_service import find_matching_deals
+    from routes import items as items_routes
+
+    print(f"backend={config.DB_BACKEND} items={args.items} feed={args.feed}")
+    titles = _timed("seed database", seed_database, args.items, rng)
+    feed = _timed("build feed", build_feed, titles, args.feed, rng)
+
+    connection = get_connection()
+    unique_titles = {row["TITLE"] for row in feed}
+    item_id_map = _timed("_batch_lookup_item_ids", affiliate_service._batch_lookup_item_ids, connection, unique_titles)
+    distributor_id_map = _timed(
+        "_batch_lookup_distributor_ids",
+        affiliate_service._batch_lookup_distributor_ids,
+        connection,
+        {row["PROGRAM_NAME"] for row in feed}
+    )
+    _timed("_prepare_offer_inserts", affiliate_service._prepare_offer_inserts, feed, item_id_map, distributor_id_map)
+    _timed("_insert_offers_to_database", affiliate_service._insert_offers_to_database, connection, feed)
+
+    # Deal matching reads the products CSV
+    import csv
+    with open(config.PRODUCTS_CSV, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(feed[0].keys()))
+        writer.writeheader()
+        writer.writerows(feed)
+    _timed("find_matching_deals", find_matching_deals)
+
+    async def _api_queries():
+        for _ in range(20):
+            await items_routes.get_offers(distributor=None, genre=None, sort_by=None, limit=60, offset=0, db=connection)
+            await items_routes.get_topsellers(genre=None, limit=60, offset=0, db=connection)
+            await items_routes.search_offers(q="synthetic game 12", distributor=None, genre=None, sort_by=None, limit=60, offset=0, db=connection)
+
+    _timed("API queries (20 x 3 routes)", asyncio.run, _api_queries())
+    connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Price parsing micro-benchmark
+Compares utils.price_parser with the ad-hoc .replace() chains it replaced, on a
+synthetic feed of price strings, and checks both agree where the old code was correct
+
+    python benchmarks/price_parsing.py --values 500000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.price_parser import parse_price, parse_prices, _parse_price_cached
+
+def legacy_feed_price(value):
+    """Previous _prepare_offer_inserts cleaning"""
+    cleaned = str(value).replace("$", "").replace("€", "").replace("£", "").replace("¥", "").replace(",", "").upper().replace("USD", "").replace("EUR", "").replace("GBP", "").strip() if value else ""
+    try:
+        return float(cleaned) if cleaned else None
+    except ValueError:
+        return None
+
+def legacy_steam_price(value):
+    """Previous steam_service._parse_price"""
+    if not value or value in ["Free", "N/A", "?", ""]:
+        return 0.00
+    cleaned = str(value).replace("$", "").replace("€", "").replace("£", "").replace(",", "").strip()
+    match = re.search(r'(\d+\.?\d*)', cleaned)
+    return float(match.group(1)) if match else 0.00
+
+# Inputs the legacy code parsed correctly that a fast path could misread
+EQUIVALENCE_CASES = [".99", "$.99", "USD .50", "-5.00", "$-5.00", "0.5", "1,299.00", "$1,299"]
+
+def build_values(count, rng):
+    """Price strings in the shapes seen in CJ, GamersGate, IndieGala and Steam data"""
+    amounts = [round(rng.uniform(0.5, 80), 2) for _ in range(2000)]
+    shapes = [
+        lambda a: f"${a:.2f}",
+        lambda a: f"{a:.2f} USD",
+        lambda a: f"USD {a:.2f}",
+        lambda a: f"£{a:.2f}",
+        lambda a: f"{a:.2f}",
+        lambda a: f"${a * 100:,.2f}",
+    ]
+    return [rng.choice(shapes)(rng.choice(amounts)) for _ in range(count)]
+
+def _time(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:>8.3f}s {count / elapsed:>12.0f} values/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark price parsing")
+    parser.add_argument("--values", type=int, default=500000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    values = build_values(args.values, random.Random(args.seed))
+
+    # Agreement on the inputs the legacy code handled correctly
+    mismatches = [v for v in values + EQUIVALENCE_CASES if legacy_feed_price(v) != parse_price(v)]
+    print(f"values={len(values)} unique={len(set(values))} mismatches_vs_legacy={len(mismatches)}")
+    for value in sorted(set(mismatches))[:10]:
+        print(f"  MISMATCH {value!r:<18} legacy={legacy_feed_price(value)!r:<10} new={parse_price(value)!r}")
+    for value in ["19,99 €", "1.234,56 EUR", "€&nbsp;9,99", "1 299,00 zł"]:
+        print(f"  {value!r:<18} legacy={legacy_feed_price(value)!r:<10} new={parse_price(value)!r}")
+
+    legacy = _time("legacy feed .replace() chain", lambda: [legacy_feed_price(v) for v in values], len(values))
+    _time("legacy steam regex", lambda: [legacy_steam_price(v) for v in values], len(values))
+
+    _parse_price_cached.cache_clear()
+    _time("parse_price (cold cache)", lambda: [parse_price(v) for v in values], len(values))
+    single = _time("parse_price (warm cache)", lambda: [parse_price(v) for v in values], len(values))
+    _parse_price_cached.cache_clear()
+    batch = _time("parse_prices batch", lambda: parse_prices(values), len(values))
+    uncached = _time("parser without cache", lambda: [_parse_price_cached.__wrapped__(v) for v in values], len(values))
+
+    print(f"speedup vs legacy: single {legacy / single:.2f}x, batch {legacy / batch:.2f}x, uncached {legacy / uncached:.2f}x")
+
+if __name__ == "__main__":
+    main()
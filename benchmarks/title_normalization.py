@@ -0,0 +1,80 @@
+"""
+Title normalization benchmark
+Checks utils.title_normalizer against the three-pass regex normalizer it replaced
+(outputs must be identical, they are stored in items.normalized_title) and compares throughput
+
+    python benchmarks/title_normalization.py --titles 500000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.title_normalizer import normalize_title, normalize_many, _normalize_cached
+
+def legacy_normalize(title):
+    """Previous _normalize_title_for_matching"""
+    normalized = title.lower().strip()
+    normalized = re.sub(r'[-:;–—]', ' ', normalized)
+    normalized = re.sub(r'[^\w\s\']', '', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized)
+    return normalized.strip()
+
+def build_titles(count, rng):
+    """Store-style titles with editions, punctuation, trademarks and non-ASCII names"""
+    words = ["Dark", "Souls", "Cronos", "New", "Dawn", "Baldur's", "Gate", "Pokémon", "Ōkami", "Witcher",
+             "Half-Life", "S.T.A.L.K.E.R.", "Café", "Ærø", "Ünterwelt", "Tom Clancy's", "NieR", "Ys"]
+    suffixes = ["", ": Deluxe Edition", " - GOTY", " – Director's Cut", "™", "® Complete", " (2024)",
+                " — Season Pass", " [EU]", " Vol. 2", "!", " & Friends", "  \t  Remastered  "]
+    unique = [
+        " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) + rng.choice(suffixes)
+        for _ in range(max(1, count // 5))
+    ]
+    return [rng.choice(unique) for _ in range(count)]
+
+def random_strings(count, rng):
+    """Random strings over ASCII, punctuation, Latin-1, dashes, symbols and odd whitespace"""
+    alphabet = [chr(c) for c in range(0, 0x250)] + list("–—‐‑’“”™®©…  　​日本語한국어")
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))) for _ in range(count)]
+
+def _time(label, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:>8.3f}s {count / elapsed:>12.0f} titles/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark title normalization")
+    parser.add_argument("--titles", type=int, default=500000)
+    parser.add_argument("--fuzz", type=int, default=200000, help="Random strings checked for identical output")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    titles = build_titles(args.titles, rng)
+
+    # Outputs must match the legacy normalizer exactly
+    checked = set(titles) | set(random_strings(args.fuzz, rng))
+    mismatches = [t for t in checked if legacy_normalize(t) != normalize_title(t)]
+    print(f"titles={len(titles)} unique={len(set(titles))} checked={len(checked)} mismatches={len(mismatches)}")
+    for title in mismatches[:5]:
+        print(f"  {title!r}: legacy={legacy_normalize(title)!r} new={normalize_title(title)!r}")
+
+    legacy = _time("legacy regex (3 passes)", lambda: [legacy_normalize(t) for t in titles], len(titles))
+    uncached = _time("translate (uncached)", lambda: [_normalize_cached.__wrapped__(t) for t in titles], len(titles))
+    _normalize_cached.cache_clear()
+    _time("normalize_title (cold cache)", lambda: [normalize_title(t) for t in titles], len(titles))
+    warm = _time("normalize_title (warm cache)", lambda: [normalize_title(t) for t in titles], len(titles))
+    _normalize_cached.cache_clear()
+    batch = _time("normalize_many", lambda: normalize_many(titles), len(titles))
+
+    print(f"speedup vs legacy: uncached {legacy / uncached:.2f}x, warm {legacy / warm:.2f}x, batch {legacy / batch:.2f}x")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 Configuration management for Affiliate Bot
 Centralized place for all configuration settings and environment variables
 """
+import json
 import os
 
 SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,11 +22,33 @@ TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 ROTATING_PROXY = "http://p.webshare.io:9999"
 
 # Database configuration
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")  # "mysql" or "sqlite" (embedded, for offline benchmarks/CI)
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", ":memory:")  # SQLite database file, or :memory:
 DB_HOST = "localhost"
 DB_USER = "root"
 DB_PASSWORD = ""
 DB_NAME = "affiliate_marketing"
 
+# Read replica used by the public API routes (empty host = read from the primary)
+DB_READ_HOST = os.getenv("DB_READ_HOST", "")
+DB_READ_USER = os.getenv("DB_READ_USER", DB_USER)
+DB_READ_PASSWORD = os.getenv("DB_READ_PASSWORD", DB_PASSWORD)
+DB_READ_NAME = os.getenv("DB_READ_NAME", DB_NAME)
+
+# Database connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(DB_POOL_SIZE)))  # Connections to the read replica
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # Seconds to wait for a free connection
+DB_UPSERT_CHUNK_SIZE = int(os.getenv("DB_UPSERT_CHUNK_SIZE", "1000"))  # Rows per multi-row INSERT/commit
+DB_ALLOW_LOCAL_INFILE = os.getenv("DB_ALLOW_LOCAL_INFILE", "false").lower() == "true"  # Enables LOAD DATA LOCAL INFILE
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", str(DB_POOL_SIZE)))  # Threads for async API queries (callers pass in a checked-out connection)
+DB_PREPARED_STATEMENTS = os.getenv("DB_PREPARED_STATEMENTS", "true").lower() == "true"  # Cache server-side prepared statements
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64"))  # Prepared statements kept per connection
+
+# Query instrumentation settings
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "500"))  # Queries slower than this go to the slow-query log
+DB_QUERY_STATS_WINDOW = int(os.getenv("DB_QUERY_STATS_WINDOW", "1000"))  # Recent samples kept per statement for histograms
+
 # File paths
 DATA_DIR = os.path.join(SERVER_DIR, "data")
 CSV_DIR = os.path.join(DATA_DIR, "csv")
@@ -33,19 +56,71 @@ JSON_DIR = os.path.join(DATA_DIR, "json")
 IMAGES_DIR = os.path.join(DATA_DIR, "images")
 LOGS_DIR = os.path.join(SERVER_DIR, "logs")
 TEMP_DIR = os.path.join(SERVER_DIR, "items_files")
+CJ_FEED_DIR = os.path.join(DATA_DIR, "cj_feed")  # Last downloaded CJ feeds (one subdirectory each), kept for conditional/resumed downloads
 
 # CSV files
 PRODUCTS_CSV = os.path.join(CSV_DIR, "items_info.csv")
+PRODUCTS_SNAPSHOT = os.path.join(CSV_DIR, "items_info.snap")  # Indexed, memory-mapped copy of PRODUCTS_CSV
 STEAMDB_CSV = os.path.join(CSV_DIR, "steamdb_results.csv")
 MISSING_TITLES_CSV = os.path.join(CSV_DIR, "missing_game_titles.csv")
 
 # JSON files
+CJ_FEED_STATE_JSON = os.path.join(CJ_FEED_DIR, "feed_state.json")  # Last processed catalogue hash
 VALID_DEALS_JSON = os.path.join(JSON_DIR, "valid_deals.json")
 SHUFFLED_DEALS_JSON = os.path.join(JSON_DIR, "shuffled_deals.json")
 
 # Text files
 POSTED_GAMES_FILE = os.path.join(SERVER_DIR, "posted_games.txt")
 
+# CJ feed download settings
+CJ_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Bytes written per streamed chunk
+CJ_DOWNLOAD_TIMEOUT = (10, 120)  # (connect, read) timeouts in seconds
+CJ_DOWNLOAD_RETRIES = 3  # Attempts per download, interrupted downloads resume with HTTP Range
+CJ_FETCH_TIMEOUT = 1800  # Seconds the source runner waits for the CJ feed
+
+# CJ Affiliate product feeds, one source per entry (override with a JSON list in CJ_FEEDS)
+#   name: download subdirectory of CJ_FEED_DIR and log/source name
+#   path: file path on datatransfer.cj.com, {date} is replaced with today's YYYYMMDD
+#   required: a failed download aborts the daily run
+CJ_FEEDS = json.loads(os.getenv("CJ_FEEDS") or "null") or [
+    {
+        "name": "shopping",
+        "path": "/datatransfer/files/7609708/outgoing/productcatalog/306393/product_feedex-shopping-{date}.zip",
+        "required": True
+    },
+]
+CJ_FEED_CONCURRENCY = 2  # Feeds downloaded at the same time
+
+# GamersGate API pagination settings
+GAMERSGATE_CONCURRENCY = 4  # Pages fetched in parallel
+GAMERSGATE_RATE = 1.0  # Initial requests/sec, adapted on 429/5xx responses
+GAMERSGATE_MAX_RATE = 6.0
+GAMERSGATE_MAX_RETRIES = 3  # Attempts per throttled page
+GAMERSGATE_FETCH_TIMEOUT = 900  # Seconds the source runner waits for the GamersGate catalogue
+
+# IndieGala catalogue settings
+INDIEGALA_FETCH_MODE = os.getenv("INDIEGALA_FETCH_MODE", "http")  # "http" (HTML parser, Selenium fallback) or "selenium"
+INDIEGALA_CONCURRENCY = 4  # Listing pages fetched in parallel
+INDIEGALA_MAX_PAGES = 200  # Safety cap when the page count can't be read from the pagination
+INDIEGALA_FETCH_TIMEOUT = 900  # Seconds the source runner waits for IndieGala before processing without it
+INDIEGALA_RATE = 4.0  # Initial listing requests/sec, adapted on 429/5xx responses
+INDIEGALA_MAX_RATE = 8.0
+
+# Feed CSV cleaning settings
+# Parallel cleaning is opt-in until a speedup is measured on the production host (benchmarks/csv_cleaning.py)
+CSV_CLEAN_WORKERS = int(os.getenv("CSV_CLEAN_WORKERS", "1"))  # Processes each parsing and cleaning whole data files (1 = inline)
+CSV_CLEAN_CHUNK_ROWS = 20000  # Rows read per chunk when cleaning inline
+
+# Feed rows looked up, compared and written per batch (bounds ingestion memory)
+OFFER_BATCH_ROWS = int(os.getenv("OFFER_BATCH_ROWS", "20000"))
+
+# Fuzzy title matching for feed titles with no exact items.normalized_title match
+FUZZY_TITLE_MATCHING = os.getenv("FUZZY_TITLE_MATCHING", "true").lower() == "true"
+FUZZY_TITLE_THRESHOLD = float(os.getenv("FUZZY_TITLE_THRESHOLD", "0.85"))  # Minimum trigram similarity (0-1)
+
+# Offer ingestion mode: "upsert" (chunked multi-row upserts) or "staging" (bulk load + set-based merge)
+OFFER_INGEST_MODE = os.getenv("OFFER_INGEST_MODE", "upsert")
+
 # Application settings
 POSTED_GAMES_LIMIT = 60
 MIN_DISCOUNT_THRESHOLD = 10
@@ -60,6 +135,7 @@ STEAM_LANGUAGE = "en"
 # Browser pool settings
 BROWSER_POOL_SIZE = 3
 VALIDATION_WORKERS = 3
+BROWSER_CHECKOUT_TIMEOUT = 120  # Seconds a validation worker waits in line for a browser
 
 # Authentication settings
 SECRET_KEY = os.getenv("JWT_SECRET_KEY") or "change-this-secret-key-in-production"
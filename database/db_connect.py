@@ -1,8 +1,12 @@
 """
 MySQL database connection management
 """
-import mysql.connector
-from mysql.connector import Error
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import threading
+import time
 import sys
 import os
 
@@ -11,28 +15,603 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
 from utils.logger import logger
+from database.query_metrics import query_metrics
 
-def get_connection():
+# Error is the driver-neutral database error callers catch (both backends raise it)
+try:
+    import mysql.connector
+    from mysql.connector import Error
+except ImportError:
+    # Only the embedded SQLite backend (DB_BACKEND=sqlite) works without the MySQL driver
+    mysql = None
+    from database.sqlite_backend import Error
+
+
+class PooledConnection:
+    """
+    Wrapper around a pooled MySQL connection
+    Behaves like a regular connection, but close() returns it to the pool
+    A wrapper that is garbage collected without close() gives its slot back as well
+    """
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def close(self):
+        """Return the underlying connection to the pool"""
+        if self._connection is not None:
+            connection = self._connection
+            self._connection = None
+            self._pool.release(connection)
+
+    def __del__(self):
+        # Safety net for callers that never closed the connection
+        connection = self.__dict__.get("_connection")
+        if connection is not None:
+            self._connection = None
+            self._pool.reclaim(connection)
+
+    def is_connected(self):
+        """Check if the connection is still checked out and alive"""
+        return self._connection is not None and self._connection.is_connected()
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise Error("Connection has already been returned to the pool")
+        return getattr(self._connection, name)
+
+
+class StatementCache:
+    """
+    Per-connection LRU cache of server-side prepared cursors keyed by statement text
+    Re-executing a cached statement only sends parameters, the server skips parsing
+    """
+    # Counters shared by all connections, exposed through get_statement_cache_stats()
+    stats_lock = threading.Lock()
+    hits = 0
+    misses = 0
+    evictions = 0
+    fallbacks = 0
+
+    def __init__(self, connection, max_size=64):
+        self.connection = connection
+        self.max_size = max_size
+        self.cursors = OrderedDict()
+        self.dictionary_supported = True
+
+    def cursor(self, query, dictionary=False):
+        """
+        Get a prepared cursor for query (must not be closed by the caller)
+        
+        Args:
+            query: SQL statement text
+            dictionary: Return rows as dictionaries
+        
+        Returns:
+            cursor: Prepared cursor, or None if prepared cursors are unavailable
+        """
+        key = (query, dictionary)
+        cursor = self.cursors.get(key)
+        if cursor is not None:
+            self.cursors.move_to_end(key)
+            StatementCache._count("hits")
+            return cursor
+        
+        if dictionary and not self.dictionary_supported:
+            StatementCache._count("fallbacks")
+            return None
+        
+        try:
+            if dictionary:
+                cursor = self.connection.cursor(prepared=True, dictionary=True)
+            else:
+                cursor = self.connection.cursor(prepared=True)
+        except (Error, TypeError, ValueError, AttributeError):
+            # Older connectors don't support prepared dictionary cursors
+            if dictionary:
+                self.dictionary_supported = False
+            StatementCache._count("fallbacks")
+            return None
+        
+        StatementCache._count("misses")
+        self.cursors[key] = cursor
+        if len(self.cursors) > self.max_size:
+            _, evicted = self.cursors.popitem(last=False)
+            StatementCache._count("evictions")
+            try:
+                evicted.close()
+            except Exception:
+                pass
+        return cursor
+
+    def discard(self, query, dictionary=False):
+        """Drop a statement from the cache (e.g. after an execution error)"""
+        cursor = self.cursors.pop((query, dictionary), None)
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    @classmethod
+    def _count(cls, counter):
+        with cls.stats_lock:
+            setattr(cls, counter, getattr(cls, counter) + 1)
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections
+    Connections are created lazily up to pool_size and checked for liveness on checkout
+    connect_func opens a new connection (default: mysql.connector.connect)
+    """
+    def __init__(self, pool_size=10, timeout=10, connect_func=None, **connect_args):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        if connect_func is None:
+            if mysql is None:
+                raise ImportError("mysql-connector-python is required for DB_BACKEND=mysql")
+            connect_func = mysql.connector.connect
+        self.connect_func = connect_func
+        self.connect_args = connect_args
+        
+        self.idle_connections = deque()
+        self.created = 0
+        self.in_use = 0
+        self.condition = threading.Condition()
+        
+        # Counters exposed through stats()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.failed_connects = 0
+        self.dead_connections = 0
+        self.leaked_connections = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def get_connection(self, timeout=None):
+        """
+        Check out a connection, waiting up to timeout seconds for a free slot
+        
+        Args:
+            timeout: Seconds to wait (default: pool timeout)
+        
+        Returns:
+            PooledConnection: Wrapped connection, or None on timeout/failure
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        
+        while True:
+            connection = None
+            with self.condition:
+                while not self.idle_connections and self.created >= self.pool_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        logger.error(f"Timed out after {timeout}s waiting for a database connection")
+                        return None
+                    self.condition.wait(remaining)
+                
+                if self.idle_connections:
+                    connection = self.idle_connections.pop()
+                else:
+                    # Reserve a slot, connect outside the lock
+                    self.created += 1
+            
+            if connection is None:
+                connection = self._connect()
+                if connection is None:
+                    self._discard()
+                    return None
+            elif not self._is_alive(connection):
+                self._close_quietly(connection)
+                self._discard(dead=True)
+                continue
+            
+            wait_time = time.monotonic() - start
+            with self.condition:
+                self.in_use += 1
+                self.checkouts += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+            
+            return PooledConnection(self, connection)
+
+    def release(self, connection):
+        """
+        Return a connection to the pool
+        Any open transaction is rolled back so the next user starts clean
+        
+        Args:
+            connection: Raw MySQL connection
+        """
+        try:
+            connection.rollback()
+            reusable = True
+        except Exception:
+            reusable = False
+        
+        with self.condition:
+            self.in_use -= 1
+            if reusable:
+                self.idle_connections.append(connection)
+            else:
+                self.created -= 1
+            self.condition.notify()
+        
+        if not reusable:
+            self._close_quietly(connection)
+
+    def reclaim(self, connection):
+        """
+        Free the slot of a connection whose wrapper was dropped without close()
+        The connection is closed instead of reused, its session state is unknown
+        
+        Args:
+            connection: Raw MySQL connection
+        """
+        with self.condition:
+            self.in_use -= 1
+            self.created -= 1
+            self.leaked_connections += 1
+            self.condition.notify()
+        
+        logger.warning("Reclaimed a database connection that was never closed")
+        self._close_quietly(connection)
+
+    def stats(self):
+        """
+        Get pool usage statistics
+        
+        Returns:
+            dict: Pool size, in-use/idle counts and wait time counters
+        """
+        with self.condition:
+            return {
+                "pool_size": self.pool_size,
+                "created": self.created,
+                "in_use": self.in_use,
+                "idle": len(self.idle_connections),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "failed_connects": self.failed_connects,
+                "dead_connections": self.dead_connections,
+                "leaked_connections": self.leaked_connections,
+                "total_wait_seconds": round(self.total_wait_time, 4),
+                "avg_wait_seconds": round(self.total_wait_time / self.checkouts, 4) if self.checkouts else 0.0,
+                "max_wait_seconds": round(self.max_wait_time, 4)
+            }
+
+    def close_all(self):
+        """Close all idle connections in the pool"""
+        with self.condition:
+            connections = list(self.idle_connections)
+            self.idle_connections.clear()
+            self.created -= len(connections)
+            self.condition.notify_all()
+        
+        for connection in connections:
+            self._close_quietly(connection)
+
+    def _connect(self):
+        """Open a new database connection"""
+        try:
+            connection = self.connect_func(**self.connect_args)
+            if connection.is_connected():
+                return connection
+        except Error as e:
+            logger.error(f"Error connecting to MySQL database: {e}")
+        with self.condition:
+            self.failed_connects += 1
+        return None
+
+    def _discard(self, dead=False):
+        """Free a reserved slot after a failed or dead connection"""
+        with self.condition:
+            self.created -= 1
+            if dead:
+                self.dead_connections += 1
+            self.condition.notify()
+
+    def _is_alive(self, connection):
+        """Liveness check on checkout (pings the server)"""
+        try:
+            return connection.is_connected()
+        except Exception:
+            return False
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+# Connection roles: services write to the primary, API read routes use the replica
+ROLE_WRITE = "write"
+ROLE_READ = "read"
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+def has_read_replica():
     """
-    Create and return a MySQL database connection
+    Check whether a separate read replica is configured
     
     Returns:
-        connection: MySQL connection object or None if failed
+        bool: True if read connections go to DB_READ_HOST
     """
-    try:
-        connection = mysql.connector.connect(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME
+    return bool(config.DB_READ_HOST) and config.DB_BACKEND != "sqlite"
+
+def _create_pool(role):
+    """Create the connection pool for a role"""
+    if config.DB_BACKEND == "sqlite":
+        from database import sqlite_backend
+        return ConnectionPool(
+            pool_size=config.DB_POOL_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            connect_func=sqlite_backend.connect
         )
-        
-        if connection.is_connected():
-            return connection
-            
-    except Error as e:
-        logger.error(f"Error connecting to MySQL database: {e}")
+    
+    if role == ROLE_READ:
+        return ConnectionPool(
+            pool_size=config.DB_READ_POOL_SIZE,
+            timeout=config.DB_POOL_TIMEOUT,
+            host=config.DB_READ_HOST,
+            user=config.DB_READ_USER,
+            password=config.DB_READ_PASSWORD,
+            database=config.DB_READ_NAME
+        )
+    
+    return ConnectionPool(
+        pool_size=config.DB_POOL_SIZE,
+        timeout=config.DB_POOL_TIMEOUT,
+        host=config.DB_HOST,
+        user=config.DB_USER,
+        password=config.DB_PASSWORD,
+        database=config.DB_NAME,
+        allow_local_infile=config.DB_ALLOW_LOCAL_INFILE
+    )
+
+def get_pool(role=ROLE_WRITE):
+    """
+    Get the shared connection pool for a role, creating it on first use
+    Without a configured read replica both roles share the primary pool
+    
+    Args:
+        role: ROLE_WRITE (primary) or ROLE_READ (replica)
+    
+    Returns:
+        ConnectionPool: Shared pool instance
+    """
+    if role == ROLE_READ and not has_read_replica():
+        role = ROLE_WRITE
+    
+    pool = _pools.get(role)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(role)
+            if pool is None:
+                pool = _create_pool(role)
+                _pools[role] = pool
+    return pool
+
+def get_pool_stats():
+    """
+    Get statistics of the shared connection pools
+    
+    Returns:
+        dict: Primary pool statistics, and replica pool statistics if configured
+    """
+    stats = {"primary": get_pool(ROLE_WRITE).stats()}
+    if has_read_replica():
+        stats["replica"] = get_pool(ROLE_READ).stats()
+    return stats
+
+def get_query_stats():
+    """
+    Get per-statement timing statistics
+    
+    Returns:
+        list: Statement stats with rolling histograms, slowest total first
+    """
+    return query_metrics.stats()
+
+def get_slow_queries():
+    """
+    Get recent queries slower than config.DB_SLOW_QUERY_MS
+    
+    Returns:
+        list: Slow query log entries
+    """
+    return query_metrics.slow_log()
+
+def column_exists(connection, table, column):
+    """
+    Check whether a table column exists (works for every backend)
+    
+    Args:
+        connection: Database connection
+        table: Table name
+        column: Column name
+    
+    Returns:
+        bool: True if the column exists
+    """
+    if config.DB_BACKEND == "sqlite":
+        from database import sqlite_backend
+        return sqlite_backend.column_exists(connection, table, column)
+    
+    result = execute_query(
+        """SELECT COUNT(*) FROM information_schema.COLUMNS
+           WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s""",
+        (table, column),
+        fetch=True,
+        connection=connection,
+        buffered=True
+    )
+    return bool(result and result[0][0] > 0)
+
+def get_statement_cache_stats():
+    """
+    Get prepared statement cache counters (all connections)
+    
+    Returns:
+        dict: Hits, misses, evictions, fallbacks and hit ratio
+    """
+    with StatementCache.stats_lock:
+        lookups = StatementCache.hits + StatementCache.misses
+        return {
+            "enabled": config.DB_PREPARED_STATEMENTS and config.DB_BACKEND != "sqlite",
+            "hits": StatementCache.hits,
+            "misses": StatementCache.misses,
+            "evictions": StatementCache.evictions,
+            "fallbacks": StatementCache.fallbacks,
+            "hit_ratio": round(StatementCache.hits / lookups, 4) if lookups else 0.0
+        }
+
+# Statements worth a prepared statement slot; DDL, SHOW, SET etc. go through a plain cursor
+_PREPARABLE_VERBS = frozenset(["SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"])
+
+def _is_preparable(query):
+    """Check whether query is a DML/SELECT statement (by its first keyword)"""
+    words = query.lstrip(" \t\r\n(").split(None, 1)
+    return bool(words) and words[0].upper() in _PREPARABLE_VERBS
+
+def _prepared_cursor(connection, query, dictionary=False):
+    """
+    Get a cached prepared cursor for query on this connection
+    Only DML/SELECT statements are prepared, one-off DDL would evict hot statements
+    
+    Returns:
+        cursor: Prepared cursor (do not close), or None to use a regular cursor
+    """
+    if not config.DB_PREPARED_STATEMENTS or config.DB_BACKEND == "sqlite":
+        return None
+    if not _is_preparable(query):
+        return None
+    
+    # Cache lives on the underlying connection so it survives pool checkouts
+    raw = connection._connection if isinstance(connection, PooledConnection) else connection
+    if raw is None:
         return None
+    
+    cache = getattr(raw, "_statement_cache", None)
+    if cache is None:
+        cache = StatementCache(raw, max_size=config.DB_STATEMENT_CACHE_SIZE)
+        try:
+            raw._statement_cache = cache
+        except AttributeError:
+            return None
+    return cache.cursor(query, dictionary=dictionary)
+
+def _discard_prepared(connection, query, dictionary=False):
+    raw = connection._connection if isinstance(connection, PooledConnection) else connection
+    cache = getattr(raw, "_statement_cache", None)
+    if cache is not None:
+        cache.discard(query, dictionary=dictionary)
+
+def get_connection(role=ROLE_WRITE):
+    """
+    Check out a MySQL database connection from the shared pool
+    Call close() on the connection to return it to the pool
+    
+    Args:
+        role: ROLE_WRITE for the primary (default), ROLE_READ for the read replica
+    
+    Returns:
+        connection: Pooled MySQL connection object or None if failed
+    """
+    if role == ROLE_READ:
+        return get_read_connection()
+    return get_pool(ROLE_WRITE).get_connection()
+
+def get_read_connection():
+    """
+    Check out a connection for read-only queries (API routes)
+    Uses the read replica if configured and falls back to the primary if it is unavailable
+    Replica reads may lag behind recent writes, use get_connection() to read your own writes
+    
+    Returns:
+        connection: Pooled MySQL connection object or None if failed
+    """
+    if not has_read_replica():
+        return get_pool(ROLE_WRITE).get_connection()
+    
+    connection = get_pool(ROLE_READ).get_connection()
+    if connection is None:
+        logger.warning("Read replica unavailable, falling back to the primary database")
+        connection = get_pool(ROLE_WRITE).get_connection()
+    return connection
+
+_db_executor = None
+_db_executor_lock = threading.Lock()
+
+def get_db_executor():
+    """
+    Get the shared bounded executor used to run blocking queries off the event loop
+    
+    Returns:
+        ThreadPoolExecutor: Shared executor instance
+    """
+    global _db_executor
+    if _db_executor is None:
+        with _db_executor_lock:
+            if _db_executor is None:
+                _db_executor = ThreadPoolExecutor(
+                    max_workers=config.DB_EXECUTOR_WORKERS,
+                    thread_name_prefix="DBWorker"
+                )
+    return _db_executor
+
+async def run_in_db_executor(func, *args, **kwargs):
+    """
+    Run a blocking database function in the DB executor and await its result
+    Keeps async API handlers from blocking the event loop on MySQL calls
+    func must use a connection checked out before the call: a worker waiting on the pool
+    can deadlock against requests that hold connections and queue for a worker
+    
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments passed to func
+    
+    Returns:
+        Return value of func (exceptions are re-raised)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), functools.partial(func, *args, **kwargs))
+
+def fetch_all_dict(connection, query, params=None):
+    """
+    Execute a SELECT and return all rows as dictionaries
+    Raises database errors to the caller (used by API handlers)
+    
+    Args:
+        connection: Database connection
+        query: SQL query string
+        params: Query parameters (sequence)
+    
+    Returns:
+        list: List of row dictionaries
+    """
+    prepared = _prepared_cursor(connection, query, dictionary=True)
+    cursor = prepared or connection.cursor(dictionary=True)
+    start = time.perf_counter()
+    try:
+        cursor.execute(query, params or ())
+        rows = cursor.fetchall()
+        query_metrics.record(query, time.perf_counter() - start, rows=len(rows))
+        return rows
+    except Error as e:
+        query_metrics.record(query, time.perf_counter() - start, error=str(e))
+        if prepared:
+            _discard_prepared(connection, query, dictionary=True)
+        raise
+    finally:
+        if not prepared:
+            cursor.close()
 
 def execute_query(query, params=None, fetch=False, connection=None, buffered=False):
     """
@@ -51,22 +630,31 @@ def execute_query(query, params=None, fetch=False, connection=None, buffered=Fal
         logger.error("Connection parameter is required")
         return None
 
+    start = time.perf_counter()
+    prepared = _prepared_cursor(connection, query)
     try:
-        cursor = connection.cursor(buffered=buffered)
+        cursor = prepared or connection.cursor(buffered=buffered)
         cursor.execute(query, params or ())
         
         if fetch:
             results = cursor.fetchall()
-            cursor.close()
+            if not prepared:
+                cursor.close()
+            query_metrics.record(query, time.perf_counter() - start, rows=len(results))
             return results
         else:
             rowcount = cursor.rowcount
-            cursor.close()
+            if not prepared:
+                cursor.close()
+            query_metrics.record(query, time.perf_counter() - start, rows=rowcount)
             return rowcount
             
     except Error as e:
+        query_metrics.record(query, time.perf_counter() - start, error=str(e))
         logger.error(f"Error executing query: {e}")
-        if 'cursor' in locals():
+        if prepared:
+            _discard_prepared(connection, query)
+        elif 'cursor' in locals():
             cursor.close()
         return None
 
@@ -91,16 +679,92 @@ def execute_many(query, params_list, connection=None, buffered=False):
         logger.warning("execute_many called with empty params_list")
         return 0
 
+    start = time.perf_counter()
     try:
         cursor = connection.cursor(buffered=buffered)
         cursor.executemany(query, params_list)
         rowcount = cursor.rowcount
         cursor.close()
+        query_metrics.record(query, time.perf_counter() - start, rows=rowcount)
         return rowcount
             
     except Error as e:
+        query_metrics.record(query, time.perf_counter() - start, error=str(e))
         logger.error(f"Error executing batch query: {e}")
         if 'cursor' in locals():
             cursor.close()
         return None
 
+
+def execute_chunked_upsert(insert_sql, row_template, rows, update_sql="", connection=None, chunk_size=None, label="rows"):
+    """
+    Insert rows in chunks using multi-row VALUES statements, committing after each chunk
+    Keeps transaction size, row locks and memory bounded regardless of input size
+    
+    Args:
+        insert_sql: Statement head, e.g. "INSERT INTO t (a, b) VALUES"
+        row_template: Placeholder group for one row, e.g. "(%s, %s)"
+        rows: Iterable of parameter tuples (may be a generator)
+        update_sql: Optional tail, e.g. "ON DUPLICATE KEY UPDATE a = VALUES(a)"
+        connection: Database connection (required)
+        chunk_size: Rows per statement/commit (default: config.DB_UPSERT_CHUNK_SIZE)
+        label: Name used in progress log messages
+    
+    Returns:
+        tuple: (rows written, rows in failed chunks), or None if no connection
+    """
+    if connection is None:
+        logger.error("Connection parameter is required")
+        return None
+    
+    chunk_size = chunk_size or config.DB_UPSERT_CHUNK_SIZE
+    written = 0
+    failed = 0
+    chunk_count = 0
+    start = time.monotonic()
+    cursor = connection.cursor()
+    # Record metrics under the single-row form so every chunk shares one fingerprint
+    metrics_query = f"{insert_sql} {row_template} {update_sql}"
+    
+    def _flush(chunk):
+        nonlocal written, failed, chunk_count
+        statement = f"{insert_sql} {','.join([row_template] * len(chunk))} {update_sql}"
+        params = [value for row in chunk for value in row]
+        chunk_count += 1
+        chunk_start = time.perf_counter()
+        # Full-size chunks share one statement text, so they reuse a prepared statement
+        prepared = _prepared_cursor(connection, statement)
+        try:
+            (prepared or cursor).execute(statement, params)
+            connection.commit()
+            written += len(chunk)
+            query_metrics.record(metrics_query, time.perf_counter() - chunk_start, rows=len(chunk))
+        except Error as e:
+            query_metrics.record(metrics_query, time.perf_counter() - chunk_start, error=str(e))
+            if prepared:
+                _discard_prepared(connection, statement)
+            logger.error(f"Error upserting {label} chunk {chunk_count} ({len(chunk)} rows): {e}")
+            connection.rollback()
+            failed += len(chunk)
+            return
+        
+        if chunk_count % 10 == 0:
+            elapsed = time.monotonic() - start
+            logger.info(f"Upserted {written} {label} in {chunk_count} chunks ({written / elapsed:.0f} rows/s)")
+    
+    try:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                _flush(chunk)
+                chunk = []
+        if chunk:
+            _flush(chunk)
+    finally:
+        cursor.close()
+    
+    elapsed = time.monotonic() - start
+    rate = written / elapsed if elapsed > 0 else 0
+    logger.info(f"Upserted {written} {label} in {chunk_count} chunks, {elapsed:.2f}s ({rate:.0f} rows/s), {failed} failed")
+    return written, failed
@@ -0,0 +1,376 @@
+"""
+Versioned schema migrations and query plan checks
+
+Usage:
+    python -m database.migrations migrate   # apply pending migrations
+    python -m database.migrations status    # list applied/pending migrations
+    python -m database.migrations check     # EXPLAIN router queries, flag full table scans
+"""
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from database.db_connect import get_connection, execute_query, column_exists
+from utils.logger import logger
+
+# Tables smaller than this many estimated rows may be scanned without being flagged
+FULL_SCAN_ROW_THRESHOLD = 1000
+
+
+# ============================================================================
+# MIGRATIONS
+# ============================================================================
+
+def _create_base_schema(connection):
+    """Create all tables used by the services and API routes"""
+    statements = [
+        """CREATE TABLE IF NOT EXISTS items (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               title VARCHAR(255) NOT NULL,
+               item_type VARCHAR(50),
+               igdb_id INT,
+               igdb_cover_image_id VARCHAR(100),
+               UNIQUE KEY uq_items_igdb_id (igdb_id)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS distributors (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               name VARCHAR(100) NOT NULL,
+               UNIQUE KEY uq_distributors_name (name)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS offers (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               item_id INT NOT NULL,
+               distributor_id INT NOT NULL,
+               affiliate_url TEXT,
+               image_url TEXT,
+               list_price DECIMAL(10,2) NULL,
+               sale_price DECIMAL(10,2) NULL,
+               discount INT,
+               is_valid TINYINT(1) NOT NULL DEFAULT 1,
+               is_hidden TINYINT(1) NOT NULL DEFAULT 0,
+               is_manually_edited TINYINT(1) NOT NULL DEFAULT 0,
+               UNIQUE KEY uq_offers_item_distributor (item_id, distributor_id),
+               CONSTRAINT fk_offers_item FOREIGN KEY (item_id) REFERENCES items (id),
+               CONSTRAINT fk_offers_distributor FOREIGN KEY (distributor_id) REFERENCES distributors (id)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS genres (
+               id INT PRIMARY KEY,
+               name VARCHAR(100) NOT NULL
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS item_genres (
+               item_id INT NOT NULL,
+               genre_id INT NOT NULL,
+               PRIMARY KEY (item_id, genre_id),
+               CONSTRAINT fk_item_genres_item FOREIGN KEY (item_id) REFERENCES items (id),
+               CONSTRAINT fk_item_genres_genre FOREIGN KEY (genre_id) REFERENCES genres (id)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS topsellers (
+               id INT PRIMARY KEY,
+               title VARCHAR(255) NOT NULL,
+               price DECIMAL(10,2) NULL
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS twitter_posts (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               offer_id INT NOT NULL,
+               posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               CONSTRAINT fk_twitter_posts_offer FOREIGN KEY (offer_id) REFERENCES offers (id)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+        """CREATE TABLE IF NOT EXISTS users (
+               id INT AUTO_INCREMENT PRIMARY KEY,
+               username VARCHAR(100) NOT NULL,
+               password_hash VARCHAR(255) NOT NULL,
+               role VARCHAR(20) NOT NULL DEFAULT 'user',
+               UNIQUE KEY uq_users_username (username)
+           ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4""",
+    ]
+    for statement in statements:
+        _execute(connection, statement)
+
+def _add_hot_path_indexes(connection):
+    """Indexes for the filters and joins used by the API routes and ingestion"""
+    # Offer listing: filter on visibility, join to items/distributors, sort by discount
+    _ensure_index(connection, "offers", "idx_offers_visibility", ["is_hidden", "is_valid", "distributor_id", "item_id", "discount"])
+    _ensure_index(connection, "offers", "idx_offers_distributor", ["distributor_id", "is_hidden"])
+    # Distributor filter (d.name IN (...)) and ingestion lookups
+    _ensure_index(connection, "distributors", "uq_distributors_name", ["name"], unique=True)
+    # Genre filter (ig.genre_id IN (...)) joined back to offers by item_id
+    _ensure_index(connection, "item_genres", "idx_item_genres_genre", ["genre_id", "item_id"])
+    # Topsellers join (topsellers.title = items.title), covering the rank
+    _ensure_index(connection, "topsellers", "idx_topsellers_title", ["title", "id"])
+    _ensure_index(connection, "items", "idx_items_title", ["title"])
+    # Twitter post lookups by offer
+    _ensure_index(connection, "twitter_posts", "idx_twitter_posts_offer", ["offer_id"])
+
+def _add_items_normalized_title(connection):
+    """Persisted normalized title used by offer ingestion lookups"""
+    if not column_exists(connection, "items", "normalized_title"):
+        _execute(connection, "ALTER TABLE items ADD COLUMN normalized_title VARCHAR(512) NULL")
+    _ensure_index(connection, "items", "idx_items_normalized_title", ["normalized_title"])
+
+def _add_offers_content_hash(connection):
+    """Per-offer feed content fingerprint used by delta ingestion"""
+    if not column_exists(connection, "offers", "content_hash"):
+        _execute(connection, "ALTER TABLE offers ADD COLUMN content_hash CHAR(32) NULL")
+
+# Ordered list of (version, description, function); never renumber applied versions
+MIGRATIONS = [
+    (1, "Create base schema", _create_base_schema),
+    (2, "Add hot-path indexes", _add_hot_path_indexes),
+    (3, "Add items.normalized_title", _add_items_normalized_title),
+    (4, "Add offers.content_hash", _add_offers_content_hash),
+]
+
+
+# ============================================================================
+# MIGRATION RUNNER
+# ============================================================================
+
+def migrate(connection=None):
+    """
+    Apply all pending migrations in version order
+
+    Args:
+        connection: Database connection (optional, opens one if not given)
+
+    Returns:
+        list: Versions applied in this run
+    """
+    if config.DB_BACKEND == "sqlite":
+        logger.info("SQLite backend creates its schema on connect, nothing to migrate")
+        return []
+
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+        if not connection:
+            logger.error("Failed to get database connection")
+            return []
+
+    applied_now = []
+    try:
+        _ensure_migrations_table(connection)
+        applied = _applied_versions(connection)
+
+        for version, description, migration in MIGRATIONS:
+            if version in applied:
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            migration(connection)
+            _execute(
+                connection,
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            connection.commit()
+            applied_now.append(version)
+
+        if applied_now:
+            logger.info(f"Applied {len(applied_now)} migrations, schema at version {applied_now[-1]}")
+        else:
+            logger.info("Schema is up to date")
+    finally:
+        if own_connection:
+            connection.close()
+
+    return applied_now
+
+def status(connection=None):
+    """
+    Get the status of every known migration
+
+    Returns:
+        list: (version, description, applied) tuples
+    """
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+
+    try:
+        _ensure_migrations_table(connection)
+        applied = _applied_versions(connection)
+        return [(version, description, version in applied) for version, description, _ in MIGRATIONS]
+    finally:
+        if own_connection:
+            connection.close()
+
+def _ensure_migrations_table(connection):
+    _execute(
+        connection,
+        """CREATE TABLE IF NOT EXISTS schema_migrations (
+               version INT PRIMARY KEY,
+               description VARCHAR(255) NOT NULL,
+               applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+    connection.commit()
+
+def _applied_versions(connection):
+    rows = execute_query("SELECT version FROM schema_migrations", fetch=True, connection=connection, buffered=True)
+    return {row[0] for row in rows or []}
+
+def _execute(connection, query, params=None):
+    """Execute a DDL/DML statement, raising on error (migrations must not half-apply silently)"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params or ())
+    finally:
+        cursor.close()
+
+def _ensure_index(connection, table, index_name, columns, unique=False):
+    """
+    Create an index unless an index with the same leading columns already exists
+
+    Args:
+        connection: Database connection
+        table: Table name
+        index_name: Name for the new index
+        columns: Indexed columns in order
+        unique: Create a UNIQUE index
+    """
+    rows = execute_query(
+        """SELECT INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS
+           WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+           ORDER BY INDEX_NAME, SEQ_IN_INDEX""",
+        (table,),
+        fetch=True,
+        connection=connection,
+        buffered=True
+    ) or []
+
+    existing = {}
+    for name, column in rows:
+        existing.setdefault(name, []).append(column)
+
+    for indexed_columns in existing.values():
+        if indexed_columns[:len(columns)] == columns:
+            return
+
+    unique_sql = "UNIQUE " if unique else ""
+    logger.info(f"Creating index {index_name} on {table} ({', '.join(columns)})")
+    _execute(connection, f"CREATE {unique_sql}INDEX {index_name} ON {table} ({', '.join(columns)})")
+
+
+# ============================================================================
+# QUERY PLAN CHECK
+# ============================================================================
+
+def _router_queries():
+    """
+    Representative queries issued by the API routers
+
+    Returns:
+        list: (label, query, params) tuples
+    """
+    from routes.items import build_offers_list_query, build_topsellers_query, build_search_query
+
+    queries = []
+
+    query, params = build_offers_list_query()
+    queries.append(("offers_list (default)", query + " LIMIT %s OFFSET %s", params + [60, 0]))
+
+    query, params = build_offers_list_query(distributor=["GOG"], genre=[1, 2], sort_by="discount_desc")
+    queries.append(("offers_list (distributor+genre)", query + " LIMIT %s OFFSET %s", params + [60, 0]))
+
+    query, params = build_topsellers_query()
+    queries.append(("topsellers", query + " LIMIT %s OFFSET %s", params + [60, 0]))
+
+    query, params = build_topsellers_query(genre=[1])
+    queries.append(("topsellers (genre)", query + " LIMIT %s OFFSET %s", params + [60, 0]))
+
+    query, params = build_search_query("witcher", ["witcher"])
+    queries.append(("search", query + " LIMIT %s OFFSET %s", params + [10, 0]))
+
+    queries.append(("genres", "SELECT id, name FROM genres ORDER BY name ASC", []))
+    queries.append(("admin offer by id", "SELECT o.id, i.title, d.name FROM offers o LEFT JOIN items i ON o.item_id = i.id LEFT JOIN distributors d ON o.distributor_id = d.id WHERE o.id = %s", [1]))
+    queries.append(("login user lookup", "SELECT * FROM users WHERE username = %s", ["admin"]))
+
+    return queries
+
+def check(connection=None, row_threshold=FULL_SCAN_ROW_THRESHOLD):
+    """
+    EXPLAIN every router query and flag full table scans
+
+    Args:
+        connection: Database connection (optional, opens one if not given)
+        row_threshold: Ignore scans of tables estimated below this many rows
+
+    Returns:
+        list: (label, table, detail) tuples for each flagged full scan
+    """
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+        if not connection:
+            logger.error("Failed to get database connection")
+            return []
+
+    flagged = []
+    try:
+        for label, query, params in _router_queries():
+            if config.DB_BACKEND == "sqlite":
+                scans = _sqlite_full_scans(connection, query, params)
+            else:
+                scans = _mysql_full_scans(connection, query, params, row_threshold)
+
+            if scans:
+                for table, detail in scans:
+                    logger.warning(f"[FULL SCAN] {label}: {table} ({detail})")
+                    flagged.append((label, table, detail))
+            else:
+                logger.info(f"[OK] {label}")
+    finally:
+        if own_connection:
+            connection.close()
+
+    return flagged
+
+def _mysql_full_scans(connection, query, params, row_threshold):
+    cursor = connection.cursor(dictionary=True, buffered=True)
+    try:
+        cursor.execute("EXPLAIN " + query, params)
+        plan = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    scans = []
+    for row in plan:
+        rows = row.get("rows") or 0
+        if row.get("type") == "ALL" and rows >= row_threshold:
+            scans.append((row.get("table"), f"type=ALL, rows~{rows}, extra={row.get('Extra')}"))
+    return scans
+
+def _sqlite_full_scans(connection, query, params):
+    cursor = connection.cursor()
+    try:
+        cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+        plan = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    scans = []
+    for row in plan:
+        detail = row[3]
+        # "SCAN o" is a full table scan; "SCAN o USING INDEX ..." walks an index
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            scans.append((detail.split()[1], detail))
+    return scans
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+
+    if command == "migrate":
+        migrate()
+    elif command == "status":
+        for version, description, applied in status():
+            print(f"{version:>4}  {'applied' if applied else 'pending':<8} {description}")
+    elif command == "check":
+        flagged = check()
+        print(f"{len(flagged)} full table scans flagged")
+        sys.exit(1 if flagged else 0)
+    else:
+        print("Usage: python -m database.migrations [migrate|status|check]")
+        sys.exit(2)
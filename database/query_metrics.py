@@ -0,0 +1,208 @@
+"""
+Query timing and slow-query instrumentation
+Collects per-statement latency, row counts and call sites for db_connect
+"""
+from collections import deque
+from functools import lru_cache
+import threading
+import sysconfig
+import time
+import sys
+import os
+import re
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.logger import logger
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+HISTOGRAM_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_DATABASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+
+_STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """
+    Reduce a SQL statement to a fingerprint shared by all its executions
+    Literals become ?, placeholder lists collapse to (...), whitespace is normalized
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        str: Statement fingerprint
+    """
+    normalized = _STRING_LITERAL.sub("?", query)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(...)", normalized)
+    # Multi-row VALUES lists collapse to a single group
+    normalized = re.sub(r"(\(\.\.\.\)\s*,\s*)+\(\.\.\.\)", "(...)", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return normalized
+
+def _call_site():
+    """Find the first caller outside the database package and the standard library"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(_DATABASE_DIR) and not filename.startswith(_STDLIB_DIR):
+            module = os.path.splitext(os.path.basename(filename))[0]
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class QueryMetrics:
+    """
+    Thread-safe collector of query timings
+    Keeps cumulative totals per fingerprint, a rolling window of recent
+    samples for histograms, and a bounded slow-query log
+    """
+    def __init__(self, slow_query_ms=500, window_size=1000, slow_log_size=200):
+        self.slow_query_ms = slow_query_ms
+        self.window_size = window_size
+        self.lock = threading.Lock()
+        self.statements = {}
+        self.slow_queries = deque(maxlen=slow_log_size)
+
+    def record(self, query, duration, rows=None, call_site=None, error=None):
+        """
+        Record one statement execution
+
+        Args:
+            query: SQL query string
+            duration: Execution time in seconds
+            rows: Rows affected/returned (optional)
+            call_site: Caller identifier (default: detected from the stack)
+            error: Error message if the statement failed
+        """
+        key = fingerprint(query)
+        call_site = call_site or _call_site()
+        duration_ms = duration * 1000
+
+        with self.lock:
+            entry = self.statements.get(key)
+            if entry is None:
+                entry = {
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "call_sites": {},
+                    "samples": deque(maxlen=self.window_size)
+                }
+                self.statements[key] = entry
+
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            if rows is not None and rows > 0:
+                entry["rows"] += rows
+            if error is not None:
+                entry["errors"] += 1
+            entry["call_sites"][call_site] = entry["call_sites"].get(call_site, 0) + 1
+            entry["samples"].append(duration_ms)
+
+            is_slow = duration_ms >= self.slow_query_ms
+            if is_slow:
+                self.slow_queries.append({
+                    "fingerprint": key,
+                    "duration_ms": round(duration_ms, 2),
+                    "rows": rows,
+                    "call_site": call_site,
+                    "error": error,
+                    "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+                })
+
+        if is_slow:
+            logger.warning(f"Slow query ({duration_ms:.0f} ms, rows={rows}) at {call_site}: {key[:200]}")
+
+    def stats(self):
+        """
+        Get per-statement statistics with rolling-window histograms
+
+        Returns:
+            list: Statement stats sorted by total time (descending)
+        """
+        with self.lock:
+            snapshot = [
+                (key, dict(entry, samples=list(entry["samples"]), call_sites=dict(entry["call_sites"])))
+                for key, entry in self.statements.items()
+            ]
+
+        results = []
+        for key, entry in snapshot:
+            samples = sorted(entry["samples"])
+            results.append({
+                "fingerprint": key,
+                "count": entry["count"],
+                "errors": entry["errors"],
+                "rows": entry["rows"],
+                "total_ms": round(entry["total_ms"], 2),
+                "avg_ms": round(entry["total_ms"] / entry["count"], 2),
+                "max_ms": round(entry["max_ms"], 2),
+                "window": {
+                    "samples": len(samples),
+                    "p50_ms": _percentile(samples, 50),
+                    "p95_ms": _percentile(samples, 95),
+                    "p99_ms": _percentile(samples, 99),
+                    "histogram": _histogram(samples)
+                },
+                "call_sites": entry["call_sites"]
+            })
+
+        results.sort(key=lambda r: r["total_ms"], reverse=True)
+        return results
+
+    def slow_log(self):
+        """
+        Get the most recent slow queries
+
+        Returns:
+            list: Slow query entries, newest last
+        """
+        with self.lock:
+            return list(self.slow_queries)
+
+    def reset(self):
+        """Clear all collected statistics"""
+        with self.lock:
+            self.statements.clear()
+            self.slow_queries.clear()
+
+
+def _percentile(sorted_samples, percent):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(percent / 100 * (len(sorted_samples) - 1))))
+    return round(sorted_samples[index], 2)
+
+def _histogram(samples):
+    """Bucket samples by HISTOGRAM_BUCKETS_MS upper bounds"""
+    counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    for sample in samples:
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if sample <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+
+    labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+    return dict(zip(labels, counts))
+
+
+# Shared collector used by db_connect
+query_metrics = QueryMetrics(
+    slow_query_ms=config.DB_SLOW_QUERY_MS,
+    window_size=config.DB_QUERY_STATS_WINDOW
+)
@@ -0,0 +1,276 @@
+"""
+Embedded SQLite database backend
+Implements the subset of the mysql.connector connection/cursor API used by the
+services and routes, so the pipeline can run without a MySQL server
+(offline benchmarks, CI, local development)
+"""
+from functools import lru_cache
+import sqlite3
+import zlib
+import threading
+import re
+import sys
+import os
+
+try:
+    from mysql.connector import Error
+except ImportError:
+    # The embedded backend runs without the MySQL driver installed
+    class Error(Exception):
+        """Database error raised by the backend (stand-in for mysql.connector.Error)"""
+        def __init__(self, msg=None, errno=None, sqlstate=None):
+            super().__init__(msg)
+            self.msg = msg
+            self.errno = errno
+            self.sqlstate = sqlstate
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# Schema of the tables used by the services and API routes
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    normalized_title VARCHAR(512),
+    item_type VARCHAR(50),
+    igdb_id INTEGER UNIQUE,
+    igdb_cover_image_id VARCHAR(100)
+);
+CREATE INDEX IF NOT EXISTS idx_items_normalized_title ON items (normalized_title);
+CREATE INDEX IF NOT EXISTS idx_items_title ON items (title);
+
+CREATE TABLE IF NOT EXISTS distributors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name VARCHAR(100) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    distributor_id INTEGER NOT NULL REFERENCES distributors (id),
+    affiliate_url TEXT,
+    image_url TEXT,
+    list_price DECIMAL(10,2),
+    sale_price DECIMAL(10,2),
+    discount INTEGER,
+    is_valid TINYINT NOT NULL DEFAULT 1,
+    is_hidden TINYINT NOT NULL DEFAULT 0,
+    is_manually_edited TINYINT NOT NULL DEFAULT 0,
+    content_hash CHAR(32),
+    UNIQUE (item_id, distributor_id)
+);
+CREATE INDEX IF NOT EXISTS idx_offers_hidden_valid ON offers (is_hidden, is_valid);
+
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS item_genres (
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    genre_id INTEGER NOT NULL REFERENCES genres (id),
+    PRIMARY KEY (item_id, genre_id)
+);
+CREATE INDEX IF NOT EXISTS idx_item_genres_genre ON item_genres (genre_id, item_id);
+
+CREATE TABLE IF NOT EXISTS topsellers (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    price DECIMAL(10,2)
+);
+CREATE INDEX IF NOT EXISTS idx_topsellers_title ON topsellers (title);
+
+CREATE TABLE IF NOT EXISTS twitter_posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    offer_id INTEGER NOT NULL REFERENCES offers (id),
+    posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(100) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    role VARCHAR(20) NOT NULL DEFAULT 'user'
+);
+"""
+
+# Unique key used as the ON CONFLICT target when translating ON DUPLICATE KEY UPDATE
+CONFLICT_TARGETS = {
+    "items": "(igdb_id)",
+    "distributors": "(name)",
+    "offers": "(item_id, distributor_id)",
+    "genres": "(id)",
+    "item_genres": "(item_id, genre_id)",
+    "topsellers": "(id)",
+    "users": "(username)",
+}
+
+_INSERT_TABLE = re.compile(r"INSERT\s+INTO\s+(\w+)", re.IGNORECASE)
+_ON_DUPLICATE = re.compile(r"ON\s+DUPLICATE\s+KEY\s+UPDATE", re.IGNORECASE)
+_VALUES_FUNC = re.compile(r"\bVALUES\((\w+)\)", re.IGNORECASE)
+
+@lru_cache(maxsize=512)
+def translate_query(query):
+    """
+    Translate a MySQL-dialect statement to SQLite
+
+    Args:
+        query: MySQL query string using %s placeholders
+
+    Returns:
+        str: Equivalent SQLite query string
+    """
+    translated = query.replace("%s", "?")
+    translated = re.sub(r"DROP\s+TEMPORARY\s+TABLE", "DROP TABLE", translated, flags=re.IGNORECASE)
+    translated = re.sub(r"TRUNCATE\s+TABLE\s+(\w+)", r"DELETE FROM \1", translated, flags=re.IGNORECASE)
+
+    match = _ON_DUPLICATE.search(translated)
+    if match:
+        head = translated[:match.start()]
+        tail = translated[match.end():]
+        table = _INSERT_TABLE.search(head).group(1)
+        target = CONFLICT_TARGETS.get(table.lower(), "")
+
+        # INSERT ... SELECT needs a WHERE clause before ON CONFLICT to parse
+        if re.search(r"\bSELECT\b", head, re.IGNORECASE) and not re.search(r"\bWHERE\b", head, re.IGNORECASE):
+            head = head.rstrip() + " WHERE true "
+
+        tail = _VALUES_FUNC.sub(r"excluded.\1", tail)
+        translated = f"{head}ON CONFLICT {target} DO UPDATE SET {tail}"
+
+    return translated
+
+
+class SQLiteCursor:
+    """mysql.connector-style cursor over a sqlite3 cursor"""
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query, params=()):
+        try:
+            self._cursor.execute(translate_query(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+
+    def executemany(self, query, params_list):
+        try:
+            self._cursor.executemany(translate_query(query), [tuple(p) for p in params_list])
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is None or not self._dictionary:
+            return row
+        return self._to_dict(row)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        if not self._dictionary:
+            return rows
+        return [self._to_dict(row) for row in rows]
+
+    def close(self):
+        self._cursor.close()
+
+    def _to_dict(self, row):
+        return {column[0]: value for column, value in zip(self._cursor.description, row)}
+
+
+class SQLiteConnection:
+    """mysql.connector-style connection over sqlite3"""
+    def __init__(self, connection):
+        self._connection = connection
+
+    def cursor(self, buffered=False, dictionary=False):
+        return SQLiteCursor(self._connection, dictionary=dictionary)
+
+    def commit(self):
+        self._connection.commit()
+
+    def rollback(self):
+        self._connection.rollback()
+
+    def is_connected(self):
+        return self._connection is not None
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+_keeper = None
+_keeper_lock = threading.Lock()
+
+def _database_uri():
+    """SQLite URI; in-memory databases use a shared cache so all connections see one database"""
+    path = config.DB_SQLITE_PATH
+    if path == ":memory:":
+        return "file:affiliate_bot?mode=memory&cache=shared"
+    return f"file:{path}"
+
+def _open():
+    """Open a raw sqlite3 connection with the MySQL functions the queries rely on"""
+    raw = sqlite3.connect(_database_uri(), uri=True, check_same_thread=False, timeout=30)
+    raw.create_function("IF", 3, lambda condition, a, b: a if condition else b, deterministic=True)
+    raw.create_function("MOD", 2, lambda a, b: None if a is None or not b else a % b, deterministic=True)
+    raw.create_function("CRC32", 1, lambda value: None if value is None else zlib.crc32(str(value).encode("utf-8")), deterministic=True)
+    return raw
+
+def connect():
+    """
+    Open a connection to the embedded database, creating the schema on first use
+
+    Returns:
+        SQLiteConnection: Connection object
+    """
+    global _keeper
+
+    try:
+        if _keeper is None:
+            with _keeper_lock:
+                if _keeper is None:
+                    keeper = _open()
+                    keeper.executescript(SCHEMA)
+                    keeper.commit()
+                    # Keep one connection open so a shared in-memory database outlives its users
+                    _keeper = keeper
+        return SQLiteConnection(_open())
+    except sqlite3.Error as e:
+        raise Error(msg=str(e))
+
+def column_exists(connection, table, column):
+    """
+    Check whether a column exists in an SQLite table
+
+    Args:
+        connection: SQLiteConnection
+        table: Table name
+        column: Column name
+
+    Returns:
+        bool: True if the column exists
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cursor.fetchall())
+    finally:
+        cursor.close()
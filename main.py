@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from utils.logger import logger
 from utils.helpers import ensure_directories
+from database.migrations import migrate
 from automation.scheduler import run_scheduler
 from routes.auth import auth_router
 from fastapi import FastAPI
@@ -20,6 +21,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from routes.items import router as items_router
 from routes.admin import admin_router
 from routes.images import router as images_router
+from routes.stats import stats_router
 
 
 shutdown_event = threading.Event()
@@ -49,6 +51,7 @@ def run_api_server():
         app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
         app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
         app.include_router(images_router, prefix="/api", tags=["images"])
+        app.include_router(stats_router, prefix="/api/stats", tags=["stats"])
         
         @app.get("/api")
         async def root():
@@ -89,6 +92,9 @@ def main():
     ensure_directories()
     logger.info("Directories verified")
     
+    # Apply pending schema migrations before the services and API use the database
+    migrate()
+    
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
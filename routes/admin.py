@@ -4,8 +4,7 @@ Admin API endpoints for managing offers
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
-import mysql.connector
-from database.db_connect import get_connection
+from database.db_connect import Error, get_connection, run_in_db_executor
 from routes.auth import require_admin
 
 admin_router = APIRouter()
@@ -19,11 +18,75 @@ class OfferUpdateRequest(BaseModel):
     is_valid: Optional[bool] = None
 
 def get_db():
-    """Dependency for database connection"""
+    """
+    Dependency for database connection (returned to the pool after the request)
+    Admin routes always use the primary so they read their own writes
+    """
     connection = get_connection()
     if connection is None:
         raise HTTPException(status_code=500, detail="Database connection failed")
-    return connection
+    try:
+        yield connection
+    finally:
+        connection.close()
+
+def _apply_offer_update(db, update_query, params, offer_id):
+    """
+    Run an offer UPDATE and fetch the updated row (blocking, runs in DB executor)
+    
+    Returns:
+        dict: Updated offer or None if not found
+    """
+    cursor = db.cursor(dictionary=True)
+    try:
+        cursor.execute(update_query, params)
+        db.commit()
+        
+        # Fetch updated offer
+        cursor.execute("""
+            SELECT 
+                o.id,
+                o.item_id,
+                o.distributor_id,
+                o.affiliate_url,
+                o.image_url,
+                o.list_price,
+                o.sale_price,
+                o.discount,
+                o.is_valid,
+                i.title as item_title,
+                d.name as distributor_name
+            FROM offers o
+            LEFT JOIN items i ON o.item_id = i.id
+            LEFT JOIN distributors d ON o.distributor_id = d.id
+            WHERE o.id = %s
+        """, (offer_id,))
+        
+        return cursor.fetchone()
+    finally:
+        cursor.close()
+
+def _hide_offer(db, offer_id):
+    """
+    Soft delete an offer (blocking, runs in DB executor)
+    
+    Returns:
+        bool: True if offer existed and was hidden, False if not found
+    """
+    cursor = db.cursor()
+    try:
+        # Check if offer exists
+        cursor.execute("SELECT id FROM offers WHERE id = %s", (offer_id,))
+        if not cursor.fetchone():
+            return False
+        
+        # Soft delete: mark as hidden instead of actually deleting
+        # This prevents daily collection from re-inserting it
+        cursor.execute("UPDATE offers SET is_hidden = 1 WHERE id = %s", (offer_id,))
+        db.commit()
+        return True
+    finally:
+        cursor.close()
 
 @admin_router.put("/offers/{offer_id}")
 async def update_offer(
@@ -45,8 +108,6 @@ async def update_offer(
         Updated offer data
     """
     try:
-        cursor = db.cursor(dictionary=True)
-        
         # Build update query dynamically based on provided fields
         update_fields = []
         params = []
@@ -85,42 +146,18 @@ async def update_offer(
         update_query = f"UPDATE offers SET {', '.join(update_fields)} WHERE id = %s"
         params.append(offer_id)
         
-        cursor.execute(update_query, params)
-        db.commit()
-        
-        # Fetch updated offer
-        cursor.execute("""
-            SELECT 
-                o.id,
-                o.item_id,
-                o.distributor_id,
-                o.affiliate_url,
-                o.image_url,
-                o.list_price,
-                o.sale_price,
-                o.discount,
-                o.is_valid,
-                i.title as item_title,
-                d.name as distributor_name
-            FROM offers o
-            LEFT JOIN items i ON o.item_id = i.id
-            LEFT JOIN distributors d ON o.distributor_id = d.id
-            WHERE o.id = %s
-        """, (offer_id,))
-        
-        updated_offer = cursor.fetchone()
-        cursor.close()
+        updated_offer = await run_in_db_executor(_apply_offer_update, db, update_query, params, offer_id)
         
         if not updated_offer:
             raise HTTPException(status_code=404, detail="Offer not found")
         
         return updated_offer
         
-    except mysql.connector.Error as e:
-        db.rollback()
+    except Error as e:
+        await run_in_db_executor(db.rollback)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await run_in_db_executor(db.rollback)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @admin_router.delete("/offers/{offer_id}")
@@ -141,26 +178,15 @@ async def delete_offer(
         Success message
     """
     try:
-        cursor = db.cursor()
-        
-        # Check if offer exists
-        cursor.execute("SELECT id FROM offers WHERE id = %s", (offer_id,))
-        if not cursor.fetchone():
-            cursor.close()
+        if not await run_in_db_executor(_hide_offer, db, offer_id):
             raise HTTPException(status_code=404, detail="Offer not found")
         
-        # Soft delete: mark as hidden instead of actually deleting
-        # This prevents daily collection from re-inserting it
-        cursor.execute("UPDATE offers SET is_hidden = 1 WHERE id = %s", (offer_id,))
-        db.commit()
-        cursor.close()
-        
         return {"message": "Offer deleted successfully", "offer_id": offer_id}
         
-    except mysql.connector.Error as e:
-        db.rollback()
+    except Error as e:
+        await run_in_db_executor(db.rollback)
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
-        db.rollback()
+        await run_in_db_executor(db.rollback)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime, timedelta
@@ -11,7 +12,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
-from database.db_connect import get_connection
+from database.db_connect import get_read_connection, run_in_db_executor
 
 auth_router = APIRouter()
 security = HTTPBearer()
@@ -30,17 +31,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
-def get_user_by_username(username: str):
-    """Get user from database by username"""
-    conn = get_connection()
-    if not conn:
-        return None
+def get_user_by_username(conn, username: str):
+    """Get user from database by username, on a connection the caller checked out"""
     cursor = conn.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
-    return user
+    try:
+        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
+        return cursor.fetchone()
+    finally:
+        cursor.close()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -99,9 +97,18 @@ async def require_admin(current_user: dict = Depends(get_current_user)):
 @auth_router.post("/login", response_model=TokenResponse)
 async def login(request: LoginRequest):
     """Login endpoint - returns JWT token"""
-    user = get_user_by_username(request.username)
+    # Checked out before offloading, like get_db: a DB executor thread must never wait
+    # on the pool, whose connections may be held by requests queued behind it
+    conn = await run_in_threadpool(get_read_connection)
+    if not conn:
+        raise HTTPException(status_code=500, detail="Database connection failed")
+    try:
+        user = await run_in_db_executor(get_user_by_username, conn, request.username)
+    finally:
+        conn.close()
     
-    if not user or not verify_password(request.password, user['password_hash']):
+    # bcrypt is deliberately slow, keep it off the event loop
+    if not user or not await run_in_threadpool(verify_password, request.password, user['password_hash']):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
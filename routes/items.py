@@ -1,13 +1,13 @@
 """
 Items API endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-import mysql.connector
-import re
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 import os
-from database.db_connect import get_connection
+from database.db_connect import Error, get_connection, get_read_connection, run_in_db_executor, fetch_all_dict
+from routes.auth import decode_token
 from typing import Generator, Optional, List
 from services.image_cache_service import is_image_cached
+from utils.title_normalizer import normalize_title
 
 router = APIRouter()
 
@@ -37,35 +37,233 @@ def _transform_image_url(offer: dict) -> dict:
     
     return offer
 
-def _normalize_title_for_matching(title: str) -> str:
+def build_offers_list_query(distributor=None, genre=None, sort_by=None):
     """
-    Normalize title for fuzzy matching (same logic as in affiliate_service.py)
-    Removes punctuation and normalizes whitespace
+    Build the /offers_list SELECT (without LIMIT/OFFSET)
+    
+    Returns:
+        tuple: (query string, params list)
+    """
+    # Build query with optional filters
+    query = """
+        SELECT DISTINCT
+            o.id,
+            o.item_id,
+            o.distributor_id,
+            o.affiliate_url,
+            o.image_url,
+            o.list_price,
+            o.sale_price,
+            o.discount,
+            o.is_valid,
+            i.title as item_title,
+            i.igdb_cover_image_id,
+            d.name as distributor_name
+        FROM offers o
+        LEFT JOIN items i ON o.item_id = i.id
+        LEFT JOIN distributors d ON o.distributor_id = d.id
+    """
+    
+    # Add JOIN for genre filtering if needed
+    where_clauses = ["o.is_hidden = 0"]  # Always filter out hidden items
+    params = []
+    
+    if genre and len(genre) > 0:
+        query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
+        placeholders = ','.join(['%s'] * len(genre))
+        where_clauses.append(f"ig.genre_id IN ({placeholders})")
+        params.extend(genre)
+    
+    # Add distributor filter if provided
+    if distributor and len(distributor) > 0:
+        placeholders = ','.join(['%s'] * len(distributor))
+        where_clauses.append(f"d.name IN ({placeholders})")
+        params.extend(distributor)
+    
+    # Add WHERE clause (always includes is_hidden = 0)
+    query += " WHERE " + " AND ".join(where_clauses)
+    # Note: is_hidden = 0 is already in WHERE clause above
+    
+    # Add sorting
+    if sort_by == "discount_desc":
+        query += " ORDER BY o.discount DESC, o.id ASC"
+    elif sort_by == "discount_asc":
+        query += " ORDER BY o.discount ASC, o.id ASC"
+    else:
+        # Deterministic shuffle - mixes distributors and games evenly
+        # Uses modulo hash for consistent ordering per day/session
+        query += " ORDER BY MOD(o.id * 7919, 1000000), o.discount DESC, d.name"
+    
+    return query, params
+
+def build_topsellers_query(genre=None):
+    """
+    Build the /topsellers SELECT (without LIMIT/OFFSET)
+    
+    Returns:
+        tuple: (query string, params list)
+    """
+    # Query: match topsellers with offers
+    query = """
+        SELECT DISTINCT
+            o.id,
+            o.item_id,
+            o.distributor_id,
+            o.affiliate_url,
+            o.image_url,
+            o.list_price,
+            o.sale_price,
+            o.discount,
+            o.is_valid,
+            i.title as item_title,
+            i.igdb_cover_image_id,
+            d.name as distributor_name,
+            ts.id as topseller_rank
+        FROM offers o
+        INNER JOIN items i ON o.item_id = i.id
+        INNER JOIN distributors d ON o.distributor_id = d.id
+        INNER JOIN topsellers ts ON i.title = ts.title
+    """
+    
+    params = []
+    where_clauses = ["o.is_valid = 1", "o.is_hidden = 0"]
+    
+    # Add genre filter if provided
+    if genre and len(genre) > 0:
+        query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
+        placeholders = ','.join(['%s'] * len(genre))
+        where_clauses.append(f"ig.genre_id IN ({placeholders})")
+        params.extend(genre)
+    
+    query += " WHERE " + " AND ".join(where_clauses)
+    # Keep topseller ranking but shuffle distributors within each game group
+    query += " ORDER BY ts.id ASC, MOD(o.id, 10), d.name"
+    
+    return query, params
+
+def build_search_query(normalized_query, query_words, distributor=None, genre=None, sort_by=None):
+    """
+    Build the /search SELECT (without LIMIT/OFFSET)
+    
+    Args:
+        normalized_query: Normalized search string
+        query_words: Words of the normalized query (length >= 2)
+    
+    Returns:
+        tuple: (query string, params list)
+    """
+    # Build query with fuzzy matching
+    query = """
+        SELECT DISTINCT
+            o.id,
+            o.item_id,
+            o.distributor_id,
+            o.affiliate_url,
+            o.image_url,
+            o.list_price,
+            o.sale_price,
+            o.discount,
+            o.is_valid,
+            i.title as item_title,
+            i.igdb_cover_image_id,
+            d.name as distributor_name
+        FROM offers o
+        LEFT JOIN items i ON o.item_id = i.id
+        LEFT JOIN distributors d ON o.distributor_id = d.id
     """
-    # Convert to lowercase
-    normalized = title.lower().strip()
     
-    # Replace common punctuation with spaces (hyphens, colons, semicolons, etc.)
-    normalized = re.sub(r'[-:;–—]', ' ', normalized)
+    where_clauses = ["o.is_hidden = 0"]  # Always filter out hidden items
+    params = []
     
-    # Remove other punctuation (keep apostrophes for names like "O'Brien")
-    normalized = re.sub(r'[^\w\s\']', '', normalized)
+    # Add genre filter if needed
+    if genre and len(genre) > 0:
+        query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
+        placeholders = ','.join(['%s'] * len(genre))
+        where_clauses.append(f"ig.genre_id IN ({placeholders})")
+        params.extend(genre)
     
-    # Collapse multiple spaces to single space
-    normalized = re.sub(r'\s+', ' ', normalized)
+    # Build search condition: match normalized title
+    # Create a pattern that matches the normalized query
+    search_pattern = f"%{normalized_query}%"
     
-    # Trim
-    normalized = normalized.strip()
+    # Also match individual words for better fuzzy matching
+    word_patterns = [f"%{word}%" for word in query_words[:5]]  # Limit to 5 words
     
-    return normalized
+    # Combine patterns: match full query OR individual words
+    # Use normalized title matching in SQL (similar to Python normalization)
+    search_conditions = [
+        "LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s"
+    ]
+    params.append(search_pattern)
+    
+    # Add individual word matches
+    for word_pattern in word_patterns:
+        search_conditions.append(
+            "LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s"
+        )
+        params.append(word_pattern)
+    
+    where_clauses.append(f"({' OR '.join(search_conditions)})")
+    
+    # Add distributor filter if provided
+    if distributor and len(distributor) > 0:
+        placeholders = ','.join(['%s'] * len(distributor))
+        where_clauses.append(f"d.name IN ({placeholders})")
+        params.extend(distributor)
+    
+    # Add WHERE clause
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    
+    # Add sorting
+    if sort_by == "discount_desc":
+        query += " ORDER BY o.discount DESC, o.id ASC"
+    elif sort_by == "discount_asc":
+        query += " ORDER BY o.discount ASC, o.id ASC"
+    else:
+        # Default: prioritize exact matches, then by ID
+        # Use parameterized query for safety
+        query += " ORDER BY "
+        query += f"CASE WHEN LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s THEN 1 "
+        query += f"WHEN LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s THEN 2 "
+        query += "ELSE 3 END, "
+        query += "o.id ASC"
+        # Add the patterns for ORDER BY (exact start match, then contains match)
+        params.append(f"{normalized_query}%")  # Starts with query
+        params.append(search_pattern)  # Contains query
+    
+    return query, params
+
+# Request header that makes admin clients read from the primary (read-your-writes)
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
 
-def get_db() -> Generator:
-    """Dependency for database connection"""
-    connection = get_connection()
+def _wants_primary(request: Request) -> bool:
+    """
+    Check whether the request asks to read from the primary database
+    Honoured only for admins, so public traffic can't bypass the read replica
+    
+    Args:
+        request: Incoming request
+    
+    Returns:
+        bool: True if the read-your-writes header is set with a valid admin token
+    """
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() not in ("1", "true", "yes"):
+        return False
+    
+    authorization = request.headers.get("Authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return False
+    payload = decode_token(authorization[7:])
+    return bool(payload) and payload.get("role") == "admin"
+
+def get_db(request: Request) -> Generator:
+    """Dependency for database connection (read replica unless read-your-writes is requested)"""
+    connection = get_connection() if _wants_primary(request) else get_read_connection()
     try:
         yield connection
     finally:
-        if connection and connection.is_connected():
+        if connection:
             connection.close()
 
 @router.get("/genres")
@@ -80,13 +278,10 @@ async def get_genres(db = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Database connection failed")
     
     try:
-        cursor = db.cursor(dictionary=True)
         query = "SELECT id, name FROM genres ORDER BY name ASC"
-        cursor.execute(query)
-        genres = cursor.fetchall()
-        cursor.close()
+        genres = await run_in_db_executor(fetch_all_dict, db, query)
         return genres
-    except mysql.connector.Error as e:
+    except Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -119,63 +314,10 @@ async def get_offers(
         raise HTTPException(status_code=500, detail="Database connection failed")
     
     try:
-        cursor = db.cursor(dictionary=True)
-        
-        # Build query with optional filters
-        query = """
-            SELECT DISTINCT
-                o.id,
-                o.item_id,
-                o.distributor_id,
-                o.affiliate_url,
-                o.image_url,
-                o.list_price,
-                o.sale_price,
-                o.discount,
-                o.is_valid,
-                i.title as item_title,
-                i.igdb_cover_image_id,
-                d.name as distributor_name
-            FROM offers o
-            LEFT JOIN items i ON o.item_id = i.id
-            LEFT JOIN distributors d ON o.distributor_id = d.id
-        """
-        
-        # Add JOIN for genre filtering if needed
-        where_clauses = ["o.is_hidden = 0"]  # Always filter out hidden items
-        params = []
-        
-        if genre and len(genre) > 0:
-            query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
-            placeholders = ','.join(['%s'] * len(genre))
-            where_clauses.append(f"ig.genre_id IN ({placeholders})")
-            params.extend(genre)
-        
-        # Add distributor filter if provided
-        if distributor and len(distributor) > 0:
-            placeholders = ','.join(['%s'] * len(distributor))
-            where_clauses.append(f"d.name IN ({placeholders})")
-            params.extend(distributor)
-        
-        # Add WHERE clause (always includes is_hidden = 0)
-        query += " WHERE " + " AND ".join(where_clauses)
-        # Note: is_hidden = 0 is already in WHERE clause above
-        
-        # Add sorting
-        if sort_by == "discount_desc":
-            query += " ORDER BY o.discount DESC, o.id ASC"
-        elif sort_by == "discount_asc":
-            query += " ORDER BY o.discount ASC, o.id ASC"
-        else:
-            # Deterministic shuffle - mixes distributors and games evenly
-            # Uses modulo hash for consistent ordering per day/session
-            query += " ORDER BY MOD(o.id * 7919, 1000000), o.discount DESC, d.name"
-        
+        query, params = build_offers_list_query(distributor, genre, sort_by)
         query += " LIMIT %s OFFSET %s"
         
-        cursor.execute(query, params + [limit, offset])
-        offers = cursor.fetchall()
-        cursor.close()
+        offers = await run_in_db_executor(fetch_all_dict, db, query, params + [limit, offset])
         
         # Transform image URLs to use local IGDB images when available
         for offer in offers:
@@ -183,7 +325,7 @@ async def get_offers(
         
         return offers
         
-    except mysql.connector.Error as e:
+    except Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -214,47 +356,10 @@ async def get_topsellers(
         raise HTTPException(status_code=500, detail="Database connection failed")
     
     try:
-        cursor = db.cursor(dictionary=True)
-        
-        # Query: match topsellers with offers
-        query = """
-            SELECT DISTINCT
-                o.id,
-                o.item_id,
-                o.distributor_id,
-                o.affiliate_url,
-                o.image_url,
-                o.list_price,
-                o.sale_price,
-                o.discount,
-                o.is_valid,
-                i.title as item_title,
-                i.igdb_cover_image_id,
-                d.name as distributor_name,
-                ts.id as topseller_rank
-            FROM offers o
-            INNER JOIN items i ON o.item_id = i.id
-            INNER JOIN distributors d ON o.distributor_id = d.id
-            INNER JOIN topsellers ts ON i.title = ts.title
-        """
-        
-        params = []
-        where_clauses = ["o.is_valid = 1", "o.is_hidden = 0"]
-        
-        # Add genre filter if provided
-        if genre and len(genre) > 0:
-            query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
-            placeholders = ','.join(['%s'] * len(genre))
-            where_clauses.append(f"ig.genre_id IN ({placeholders})")
-            params.extend(genre)
-        
-        query += " WHERE " + " AND ".join(where_clauses)
-        # Keep topseller ranking but shuffle distributors within each game group
-        query += " ORDER BY ts.id ASC, MOD(o.id, 10), d.name LIMIT %s OFFSET %s"
+        query, params = build_topsellers_query(genre)
+        query += " LIMIT %s OFFSET %s"
         
-        cursor.execute(query, params + [limit, offset])
-        offers = cursor.fetchall()
-        cursor.close()
+        offers = await run_in_db_executor(fetch_all_dict, db, query, params + [limit, offset])
         
         # Transform image URLs to use local IGDB images when available
         for offer in offers:
@@ -262,7 +367,7 @@ async def get_topsellers(
         
         return offers
         
-    except mysql.connector.Error as e:
+    except Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -304,10 +409,8 @@ async def search_offers(
         return []
     
     try:
-        cursor = db.cursor(dictionary=True)
-        
         # Normalize search query using the same normalization function
-        normalized_query = _normalize_title_for_matching(q.strip())
+        normalized_query = normalize_title(q.strip())
         
         # Split into words for better fuzzy matching
         query_words = [w for w in normalized_query.split() if len(w) >= 2]
@@ -315,91 +418,10 @@ async def search_offers(
         if not query_words:
             return []
         
-        # Build query with fuzzy matching
-        query = """
-            SELECT DISTINCT
-                o.id,
-                o.item_id,
-                o.distributor_id,
-                o.affiliate_url,
-                o.image_url,
-                o.list_price,
-                o.sale_price,
-                o.discount,
-                o.is_valid,
-                i.title as item_title,
-                i.igdb_cover_image_id,
-                d.name as distributor_name
-            FROM offers o
-            LEFT JOIN items i ON o.item_id = i.id
-            LEFT JOIN distributors d ON o.distributor_id = d.id
-        """
-        
-        where_clauses = ["o.is_hidden = 0"]  # Always filter out hidden items
-        params = []
-        
-        # Add genre filter if needed
-        if genre and len(genre) > 0:
-            query += " INNER JOIN item_genres ig ON o.item_id = ig.item_id"
-            placeholders = ','.join(['%s'] * len(genre))
-            where_clauses.append(f"ig.genre_id IN ({placeholders})")
-            params.extend(genre)
-        
-        # Build search condition: match normalized title
-        # Create a pattern that matches the normalized query
-        search_pattern = f"%{normalized_query}%"
-        
-        # Also match individual words for better fuzzy matching
-        word_patterns = [f"%{word}%" for word in query_words[:5]]  # Limit to 5 words
-        
-        # Combine patterns: match full query OR individual words
-        # Use normalized title matching in SQL (similar to Python normalization)
-        search_conditions = [
-            "LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s"
-        ]
-        params.append(search_pattern)
-        
-        # Add individual word matches
-        for word_pattern in word_patterns:
-            search_conditions.append(
-                "LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s"
-            )
-            params.append(word_pattern)
-        
-        where_clauses.append(f"({' OR '.join(search_conditions)})")
-        
-        # Add distributor filter if provided
-        if distributor and len(distributor) > 0:
-            placeholders = ','.join(['%s'] * len(distributor))
-            where_clauses.append(f"d.name IN ({placeholders})")
-            params.extend(distributor)
-        
-        # Add WHERE clause
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-        
-        # Add sorting
-        if sort_by == "discount_desc":
-            query += " ORDER BY o.discount DESC, o.id ASC"
-        elif sort_by == "discount_asc":
-            query += " ORDER BY o.discount ASC, o.id ASC"
-        else:
-            # Default: prioritize exact matches, then by ID
-            # Use parameterized query for safety
-            query += " ORDER BY "
-            query += f"CASE WHEN LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s THEN 1 "
-            query += f"WHEN LOWER(REPLACE(REPLACE(REPLACE(REPLACE(i.title, '-', ' '), ':', ' '), ';', ' '), '–', ' ')) LIKE %s THEN 2 "
-            query += "ELSE 3 END, "
-            query += "o.id ASC"
-            # Add the patterns for ORDER BY (exact start match, then contains match)
-            params.append(f"{normalized_query}%")  # Starts with query
-            params.append(search_pattern)  # Contains query
-        
+        query, params = build_search_query(normalized_query, query_words, distributor, genre, sort_by)
         query += " LIMIT %s OFFSET %s"
         
-        cursor.execute(query, params + [limit, offset])
-        offers = cursor.fetchall()
-        cursor.close()
+        offers = await run_in_db_executor(fetch_all_dict, db, query, params + [limit, offset])
         
         # Transform image URLs to use local IGDB images when available
         for offer in offers:
@@ -407,7 +429,7 @@ async def search_offers(
         
         return offers
         
-    except mysql.connector.Error as e:
+    except Error as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -0,0 +1,54 @@
+"""
+Runtime statistics endpoints (admin only)
+"""
+from fastapi import APIRouter, Depends
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes.auth import require_admin
+from database.db_connect import get_pool_stats, get_query_stats, get_slow_queries, get_statement_cache_stats
+
+stats_router = APIRouter()
+
+@stats_router.get("/db/pool")
+async def get_db_pool_stats(current_user: dict = Depends(require_admin)):
+    """
+    Get database connection pool statistics (admin only)
+    
+    Returns:
+        dict: Pool size, in-use/idle connections and wait time counters for the primary and replica pools
+    """
+    return get_pool_stats()
+
+@stats_router.get("/db/queries")
+async def get_db_query_stats(current_user: dict = Depends(require_admin)):
+    """
+    Get per-statement query timing statistics (admin only)
+    
+    Returns:
+        list: Statement fingerprints with counts, latency percentiles and histograms
+    """
+    return get_query_stats()
+
+@stats_router.get("/db/slow-queries")
+async def get_db_slow_queries(current_user: dict = Depends(require_admin)):
+    """
+    Get the recent slow-query log (admin only)
+    
+    Returns:
+        list: Queries slower than DB_SLOW_QUERY_MS
+    """
+    return get_slow_queries()
+
+@stats_router.get("/db/statements")
+async def get_db_statement_cache_stats(current_user: dict = Depends(require_admin)):
+    """
+    Get prepared statement cache statistics (admin only)
+    
+    Returns:
+        dict: Cache hits, misses, evictions and hit ratio
+    """
+    return get_statement_cache_stats()
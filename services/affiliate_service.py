@@ -6,10 +6,19 @@ import requests
 import os
 import zipfile
 import csv
+import io
+import json
+import hashlib
 import time
+import threading
 import re
+import multiprocessing
 from datetime import datetime
+from urllib.parse import urljoin
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import sys
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -20,66 +29,85 @@ from selenium.webdriver.support import expected_conditions as EC
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
-from database.db_connect import get_connection, execute_query
+from database.db_connect import get_connection, execute_query, execute_chunked_upsert
 from utils.logger import logger
+from utils.price_parser import parse_price, format_price, calculate_discount
+from utils.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from utils.catalog_snapshot import CatalogSnapshotWriter, open_catalog
+from utils.title_normalizer import normalize_title, normalize_many
+from utils.fuzzy_title_index import FuzzyTitleIndex
+from utils.distributors import normalize_distributor_name
+from services.source_adapters import SourceAdapter, OFFER_FIELDS, register_source, get_sources, run_sources, is_cancelled
+
+# Upsert tail for offers - never overwrite offers that were edited by an admin
+OFFER_UPSERT_UPDATE_SQL = """ON DUPLICATE KEY UPDATE 
+   affiliate_url = IF(is_manually_edited = 0, VALUES(affiliate_url), affiliate_url),
+   image_url = IF(is_manually_edited = 0, VALUES(image_url), image_url),
+   list_price = IF(is_manually_edited = 0, VALUES(list_price), list_price),
+   sale_price = IF(is_manually_edited = 0, VALUES(sale_price), sale_price),
+   discount = IF(is_manually_edited = 0, VALUES(discount), discount),
+   is_valid = IF(is_manually_edited = 0, VALUES(is_valid), is_valid),
+   is_hidden = IF(is_manually_edited = 0, VALUES(is_hidden), is_hidden),
+   content_hash = VALUES(content_hash)"""
 
 
 # ============================================================================
 # PUBLIC API FUNCTIONS
 # ============================================================================
 
-def fetch_all_affiliate_products():
+def run_affiliate_sources(catalog_only=False):
     """
-    Fetch all affiliate products (CJ Affiliate + IndieGala) and write to CSV
-    Collects all data first, then writes everything at once
+    Run the registered offer sources (CJ Affiliate, IndieGala, GamersGate, ...)
+    All sources are fetched concurrently; catalogue sources are written to the products
+    CSV and ingested first, sources that depend on them (GamersGate) afterwards
+    
+    Args:
+        catalog_only: Only run catalogue sources (the ones written to PRODUCTS_CSV)
     
     Returns:
-        bool: True if successful, False otherwise
+        dict: Source name -> metrics, or None if a required source failed
     """
-    # Step 1: Fetch CJ Affiliate data files
-    cj_data_files = _fetch_cj_data_files()
-    if cj_data_files is None:
-        logger.error("Failed to fetch CJ products")
-        return False
-    
-    # Step 2: Fetch IndieGala products
-    indiegala_products = _fetch_indiegala_data()
-    if indiegala_products is None:
-        indiegala_products = []
-    
-    # Step 3: Process all data and write to CSV
-    success = _process_csv_files(cj_data_files, indiegala_products)
+    adapters = [adapter for adapter in get_sources() if adapter.catalog or not catalog_only]
+    metrics = run_sources(adapters, _ingest_source_stage)
     
     # Cleanup temporary files
     _cleanup_temp_files()
     
-    return success
+    return metrics
+
+def fetch_all_affiliate_products():
+    """
+    Fetch all affiliate products (CJ Affiliate + IndieGala) and write to CSV
+    Both sources are fetched concurrently, then everything is written at once
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    return run_affiliate_sources(catalog_only=True) is not None
 
 def get_affiliate_products_from_csv():
     """
-    Read and return affiliate products from CSV
+    Read and return affiliate products from the catalogue snapshot of the CSV
     
     Returns:
         list: List of product dictionaries
     """
-    products = []
-    
     try:
-        with open(config.PRODUCTS_CSV, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            products = list(reader)
+        catalog = open_catalog()
+        if catalog is None:
+            return []
+        
+        with catalog:
+            products = list(catalog)
         
-        logger.info(f"Loaded {len(products)} products from CSV")
+        logger.info(f"Loaded {len(products)} products from catalogue snapshot")
         return products
         
-    except FileNotFoundError:
-        logger.error(f"Products CSV not found: {config.PRODUCTS_CSV}")
-        return []
     except Exception as e:
-        logger.error(f"Error reading products CSV: {e}")
+        logger.error(f"Error reading products catalogue: {e}")
         return []
 
-def _fetch_gamersgate_page(session, page=1, platform="pc", timestamp=None):
+def _fetch_gamersgate_page(session, page=1, platform="pc", timestamp=None, rate_limiter=None):
     """
     Fetch a single page of GamersGate offers from their API using session
     
@@ -88,6 +116,7 @@ def _fetch_gamersgate_page(session, page=1, platform="pc", timestamp=None):
         page: Page number (default: 1)
         platform: Platform filter (default: "pc")
         timestamp: Session timestamp for consistency
+        rate_limiter: AdaptiveRateLimiter pacing requests (optional); throttled pages are retried
     
     Returns:
         dict: JSON response data or None on failure
@@ -113,14 +142,115 @@ def _fetch_gamersgate_page(session, page=1, platform="pc", timestamp=None):
         "Referer": "https://www.gamersgate.com/offers/",
     }
     
-    try:
-        response = session.get(url, params=params, headers=headers, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        return data
-    except Exception as e:
-        logger.warning(f"Error fetching GamersGate page {page}: {str(e)[:100]}")
-        return None
+    attempts = config.GAMERSGATE_MAX_RETRIES if rate_limiter else 1
+    for attempt in range(1, attempts + 1):
+        try:
+            if rate_limiter:
+                rate_limiter.acquire()
+            response = session.get(url, params=params, headers=headers, timeout=30)
+            
+            # Rate limited or server overloaded: slow everyone down and retry
+            if response.status_code == 429 or response.status_code >= 500:
+                if rate_limiter:
+                    rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                if attempt < attempts:
+                    continue
+            
+            response.raise_for_status()
+            data = response.json()
+            if rate_limiter:
+                rate_limiter.on_success()
+            return data
+        except Exception as e:
+            logger.warning(f"Error fetching GamersGate page {page}: {str(e)[:100]}")
+            return None
+    
+    return None
+
+def _fetch_all_gamersgate_pages(session, platform="pc", timestamp=None, concurrency=None, rate_limiter=None, cancelled=None):
+    """
+    Fetch GamersGate catalogue pages concurrently with an adaptive rate limit
+    Pages are requested ahead (at most concurrency in flight) but evaluated strictly
+    in page order, so failure counting and duplicate-page detection end pagination
+    exactly where sequential fetching would
+    
+    Args:
+        session: requests.Session object shared by all requests (same proxy IP)
+        platform: Platform filter (default: "pc")
+        timestamp: Shared session timestamp for a consistent catalogue snapshot
+        concurrency: Pages fetched in parallel (default: config.GAMERSGATE_CONCURRENCY)
+        rate_limiter: AdaptiveRateLimiter to use (default: one from the GAMERSGATE_RATE settings)
+        cancelled: threading.Event that stops pagination when set (optional)
+    
+    Returns:
+        tuple: (list of parsed offers, number of pages processed)
+    """
+    concurrency = concurrency or config.GAMERSGATE_CONCURRENCY
+    if rate_limiter is None:
+        rate_limiter = AdaptiveRateLimiter(
+            rate=config.GAMERSGATE_RATE,
+            min_rate=0.2,
+            max_rate=config.GAMERSGATE_MAX_RATE
+        )
+    
+    all_gamersgate_offers = []
+    previous_page_names = None
+    consecutive_failures = 0
+    max_consecutive_failures = 3
+    
+    pending = {}
+    next_page = 1
+    page = 1
+    start = time.monotonic()
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="GamersGate") as executor:
+        while not is_cancelled(cancelled):
+            # Keep the window of in-flight pages full
+            while len(pending) < concurrency:
+                pending[next_page] = executor.submit(
+                    _fetch_gamersgate_page, session, next_page, platform, timestamp, rate_limiter
+                )
+                next_page += 1
+            
+            data = pending.pop(page).result()
+            if not data:
+                consecutive_failures += 1
+                if consecutive_failures >= max_consecutive_failures:
+                    logger.warning(f"GamersGate: Stopped after {max_consecutive_failures} failed page requests")
+                    break
+                page += 1
+                continue
+            
+            catalog = data.get("catalog", [])
+            if not catalog:
+                break
+            
+            parsed_items = [_parse_gamersgate_item(i) for i in catalog]
+            current_names = [item.get("name") for item in parsed_items]
+            
+            # Check for duplicate (compare first 5 items to be less strict)
+            if previous_page_names is not None:
+                # Compare first 5 items instead of all items for more robust detection
+                current_sample = current_names[:5] if len(current_names) >= 5 else current_names
+                previous_sample = previous_page_names[:5] if len(previous_page_names) >= 5 else previous_page_names
+                
+                if current_sample == previous_sample:
+                    break
+            
+            all_gamersgate_offers.extend(parsed_items)
+            previous_page_names = current_names
+            consecutive_failures = 0  # Reset on success
+            page += 1
+        
+        # Pages requested past the end are not needed
+        for future in pending.values():
+            future.cancel()
+    
+    limiter_stats = rate_limiter.stats()
+    logger.info(f"GamersGate: {page - 1} pages in {time.monotonic() - start:.1f}s "
+                f"({limiter_stats['requests']} requests, {limiter_stats['throttled']} throttled, "
+                f"final rate {limiter_stats['rate']}/s)")
+    return all_gamersgate_offers, page - 1
 
 def _parse_gamersgate_item(item):
     """
@@ -132,19 +262,9 @@ def _parse_gamersgate_item(item):
     Returns:
         dict: Parsed item with name, discount, prices, availability
     """
-    import html
-    
-    # Clean prices (remove HTML entities and currency symbols)
-    baseprice = item.get("baseprice", "")
-    if baseprice:
-        baseprice = html.unescape(baseprice)
-        # Remove common currency symbols (€, $, £, ¥, etc.) and HTML entities
-        baseprice = baseprice.replace("&nbsp;", " ").replace("€", "").replace("$", "").replace("£", "").replace("¥", "").strip()
-    
-    raw_price = item.get("raw_price", "").strip()
-    if raw_price:
-        # Remove currency symbols from raw_price too
-        raw_price = raw_price.replace("€", "").replace("$", "").replace("£", "").replace("¥", "").strip()
+    # Prices as plain decimal strings ("" if missing), parsed by the shared price parser
+    baseprice = format_price(parse_price(item.get("baseprice", "")))
+    raw_price = format_price(parse_price(item.get("raw_price", "")))
     
     parsed = {
         "name": item.get("name", "").strip(),
@@ -156,14 +276,17 @@ def _parse_gamersgate_item(item):
     
     return parsed
 
-def insert_gamersgate_offers():
+def _fetch_gamersgate_offers(rate_limiter=None, cancelled=None):
     """
-    Fetch GamersGate offers from API, match with affiliate products, and insert into database.
+    Fetch the GamersGate catalogue from the API
     Uses requests.Session() to maintain consistent proxy IP across all requests.
-    Only inserts offers for games that exist in affiliate products CSV.
+    
+    Args:
+        rate_limiter: AdaptiveRateLimiter shared by the page requests (optional)
+        cancelled: threading.Event that stops the fetch when set (optional)
     
     Returns:
-        bool: True if successful, False otherwise
+        list: Parsed GamersGate offers, or None if failed or cancelled
     """
     try:
         logger.info("Fetching GamersGate offers from API...")
@@ -182,6 +305,10 @@ def insert_gamersgate_offers():
         session = requests.Session()
         if proxies:
             session.proxies.update(proxies)
+        # One pooled connection per concurrent page request
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=config.GAMERSGATE_CONCURRENCY)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
         
         # Verify proxy IP before starting
         if proxies:
@@ -194,164 +321,141 @@ def insert_gamersgate_offers():
                 logger.warning(f"Could not verify proxy IP: {e}")
         
         # Fetch all GamersGate offers
-        all_gamersgate_offers = []
-        platform = "pc"
-        page = 1
-        previous_page_names = None
         # Use shared timestamp for consistent pagination (like browsers do)
         session_timestamp = int(time.time() * 1000)
-        
-        consecutive_failures = 0
-        max_consecutive_failures = 3
-        
-        while True:
-            # Use shared timestamp and session for all pages to ensure consistent catalog snapshot
-            data = _fetch_gamersgate_page(
-                session=session,
-                page=page,
-                platform=platform,
-                timestamp=session_timestamp
-            )
-            if not data:
-                consecutive_failures += 1
-                if consecutive_failures >= max_consecutive_failures:
-                    logger.warning(f"GamersGate: Stopped after {max_consecutive_failures} failed page requests")
-                    break
-                page += 1
-                time.sleep(1)
-                continue
-            
-            catalog = data.get("catalog", [])
-            if not catalog:
-                break
-            
-            parsed_items = [_parse_gamersgate_item(i) for i in catalog]
-            current_names = [item.get("name") for item in parsed_items]
-            
-            # Check for duplicate (compare first 5 items to be less strict)
-            if previous_page_names is not None:
-                # Compare first 5 items instead of all items for more robust detection
-                current_sample = current_names[:5] if len(current_names) >= 5 else current_names
-                previous_sample = previous_page_names[:5] if len(previous_page_names) >= 5 else previous_page_names
-                
-                if current_sample == previous_sample:
-                    break
-            
-            all_gamersgate_offers.extend(parsed_items)
-            previous_page_names = current_names
-            consecutive_failures = 0  # Reset on success
-            page += 1
-            time.sleep(1.5)
+        all_gamersgate_offers, pages = _fetch_all_gamersgate_pages(
+            session=session,
+            platform="pc",
+            timestamp=session_timestamp,
+            rate_limiter=rate_limiter,
+            cancelled=cancelled
+        )
         
         # Close session
         session.close()
         
-        logger.info(f"Collected {len(all_gamersgate_offers)} GamersGate offers from {page-1} pages")
-        
-        # Get affiliate products from CSV
-        affiliate_products = get_affiliate_products_from_csv()
-        if not affiliate_products:
-            logger.error("No affiliate products found in CSV")
-            return False
-        
-        # Create mapping: normalized affiliate title -> affiliate product data
-        affiliate_map = {}
-        for product in affiliate_products:
-            title = product.get("TITLE", "").strip()
-            program_name = product.get("PROGRAM_NAME", "").strip()
-            if title and program_name == "GamersGate.com":
-                normalized_title = _normalize_title_for_matching(title)
-                # Store first match (or could store list if duplicates)
-                if normalized_title not in affiliate_map:
-                    affiliate_map[normalized_title] = product
-        
-        logger.info(f"Found {len(affiliate_map)} GamersGate affiliate products in CSV")
-        
-        # Match GamersGate offers with affiliate products
-        matched_offers = []
-        for gg_offer in all_gamersgate_offers:
-            gg_title = gg_offer.get("name", "").strip()
-            if not gg_title:
-                continue
-            
-            # Skip if not available
-            if not gg_offer.get("is_available", False):
-                continue
-            
-            # Skip if no sale price
-            if not gg_offer.get("raw_price", "").strip():
-                continue
-            
-            normalized_gg_title = _normalize_title_for_matching(gg_title)
-            affiliate_product = affiliate_map.get(normalized_gg_title)
-            
-            if affiliate_product:
-                # Get prices
-                sale_price = gg_offer.get("raw_price", "").strip()
-                baseprice = gg_offer.get("baseprice", "").strip()
-                discount_percent = gg_offer.get("discount_percent", 0)
-                
-                # If no baseprice but we have discount_percent, calculate it
-                if not baseprice and discount_percent > 0 and sale_price:
-                    try:
-                        sale_float = float(sale_price.replace("$", "").replace(",", "").strip())
-                        # discount_percent = (baseprice - sale_price) / baseprice * 100
-                        # So: baseprice = sale_price / (1 - discount_percent/100)
-                        baseprice = str(round(sale_float / (1 - discount_percent / 100), 2))
-                    except:
-                        pass
-                
-                # Only add if we have both prices
-                if baseprice and sale_price:
-                    matched_offers.append({
-                        "TITLE": gg_title,  # Use GamersGate title
-                        "PROGRAM_NAME": "GamersGate.com",
-                        "LINK": affiliate_product.get("LINK", "").strip(),
-                        "IMAGE_LINK": affiliate_product.get("IMAGE_LINK", "").strip(),
-                        "PRICE": baseprice,  # List price (calculated if needed)
-                        "SALE_PRICE": sale_price,  # Sale price
-                        "DISCOUNT": str(discount_percent)
-                    })
-        
-        logger.info(f"Matched {len(matched_offers)} GamersGate offers with affiliate products")
-        
-        if not matched_offers:
-            logger.warning("No matched GamersGate offers to insert")
-            return True
-        
-        # Insert matched offers into database
-        db_connection = get_connection()
-        if not db_connection:
-            logger.error("Failed to connect to database")
-            return False
+        if is_cancelled(cancelled):
+            logger.warning(f"GamersGate: fetch cancelled after {pages} pages")
+            return None
         
-        try:
-            _insert_offers_to_database(db_connection, matched_offers)
-            logger.info(f"Successfully processed GamersGate offers")
-            return True
-        except Exception as e:
-            logger.error(f"Error inserting GamersGate offers: {e}")
-            return False
-        finally:
-            if db_connection and db_connection.is_connected():
-                db_connection.close()
+        logger.info(f"Collected {len(all_gamersgate_offers)} GamersGate offers from {pages} pages")
+        return all_gamersgate_offers
         
     except Exception as e:
-        logger.error(f"Error in insert_gamersgate_offers: {e}")
-        return False
+        logger.error(f"Error fetching GamersGate offers: {e}")
+        return None
+
+def _match_gamersgate_offers(all_gamersgate_offers):
+    """
+    Match GamersGate API offers with the GamersGate affiliate products in the catalogue
+    
+    Args:
+        all_gamersgate_offers: Parsed GamersGate offers
+    
+    Yields:
+        dict: Offer record with the API prices and the affiliate link/image
+    """
+    # Get GamersGate affiliate products from the catalogue's program index
+    catalog = open_catalog()
+    if catalog is None:
+        logger.error("No affiliate products found in CSV")
+        return
+    with catalog:
+        affiliate_products = catalog.by_program("GamersGate.com")
+    
+    # Create mapping: normalized affiliate title -> affiliate product data
+    affiliate_map = {}
+    for product in affiliate_products:
+        title = product.get("TITLE", "").strip()
+        if title:
+            normalized_title = normalize_title(title)
+            # Store first match (or could store list if duplicates)
+            if normalized_title not in affiliate_map:
+                affiliate_map[normalized_title] = product
+    
+    logger.info(f"Found {len(affiliate_map)} GamersGate affiliate products in CSV")
+    
+    # Match GamersGate offers with affiliate products
+    matched = 0
+    for gg_offer in all_gamersgate_offers:
+        gg_title = gg_offer.get("name", "").strip()
+        if not gg_title:
+            continue
+        
+        # Skip if not available
+        if not gg_offer.get("is_available", False):
+            continue
+        
+        # Skip if no sale price
+        if not gg_offer.get("raw_price", "").strip():
+            continue
+        
+        normalized_gg_title = normalize_title(gg_title)
+        affiliate_product = affiliate_map.get(normalized_gg_title)
+        
+        if affiliate_product:
+            # Get prices
+            sale_price = gg_offer.get("raw_price", "").strip()
+            baseprice = gg_offer.get("baseprice", "").strip()
+            discount_percent = gg_offer.get("discount_percent", 0)
+            
+            # If no baseprice but we have discount_percent, calculate it
+            if not baseprice and discount_percent > 0 and sale_price:
+                sale_float = parse_price(sale_price)
+                if sale_float is not None and discount_percent < 100:
+                    # discount_percent = (baseprice - sale_price) / baseprice * 100
+                    # So: baseprice = sale_price / (1 - discount_percent/100)
+                    baseprice = str(round(sale_float / (1 - discount_percent / 100), 2))
+            
+            # Only add if we have both prices
+            if baseprice and sale_price:
+                matched += 1
+                yield {
+                    "TITLE": gg_title,  # Use GamersGate title
+                    "PROGRAM_NAME": "GamersGate.com",
+                    "LINK": affiliate_product.get("LINK", "").strip(),
+                    "IMAGE_LINK": affiliate_product.get("IMAGE_LINK", "").strip(),
+                    "PRICE": baseprice,  # List price (calculated if needed)
+                    "SALE_PRICE": sale_price,  # Sale price
+                    "DISCOUNT": str(discount_percent)
+                }
+    
+    logger.info(f"Matched {matched} GamersGate offers with affiliate products")
+
+def insert_gamersgate_offers():
+    """
+    Fetch GamersGate offers from API, match with affiliate products, and insert into database.
+    Only inserts offers for games that exist in affiliate products CSV.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    metrics = run_sources(get_sources(["GamersGate"]), _ingest_source_stage)
+    return bool(metrics) and metrics["GamersGate"]["status"] == "ok"
 
 
 # ============================================================================
 # CJ AFFILIATE FUNCTIONS
 # ============================================================================
 
-def _fetch_cj_data_files():
+# Bounds how many CJ feeds download at the same time
+_cj_download_slots = threading.BoundedSemaphore(config.CJ_FEED_CONCURRENCY)
+
+def _fetch_cj_data_files(feed=None, cancelled=None):
     """
-    Fetch CJ Affiliate products ZIP, extract, and return list of CSV files
+    Download one CJ Affiliate products ZIP and return the CSV/TXT members inside it
+    The ZIP is streamed to disk and never extracted. A feed that has not changed
+    since the last download (HTTP 304) is reused from its CJ_FEED_DIR subdirectory
+    
+    Args:
+        feed: Feed settings from config.CJ_FEEDS (default: the first feed)
+        cancelled: threading.Event that stops the download when set (optional)
     
     Returns:
-        list: List of extracted CSV/TXT file paths, or None if failed
+        list: List of (zip_path, member_name) tuples, or None if failed
     """
+    feed = feed or config.CJ_FEEDS[0]
+    
     # CJ HTTP credentials
     url_base = "https://datatransfer.cj.com"
     username = config.CJ_HTTP_USERNAME
@@ -362,84 +466,540 @@ def _fetch_cj_data_files():
         return None
     
     today_str = datetime.now().strftime("%Y%m%d")
-    file_path = f"/datatransfer/files/7609708/outgoing/productcatalog/306393/product_feedex-shopping-{today_str}.zip"
-    # file_path = f"/datatransfer/files/7609708/outgoing/productcatalog/306393/product_feedex-shopping-20251121.zip"
+    file_path = feed["path"].format(date=today_str)
     url = url_base + file_path
+    feed_dir = os.path.join(config.CJ_FEED_DIR, feed["name"])
     
     # Create directories
     os.makedirs(config.TEMP_DIR, exist_ok=True)
     os.makedirs(config.CSV_DIR, exist_ok=True)
+    os.makedirs(feed_dir, exist_ok=True)
     
     try:
-        # Download file
-        response = requests.get(url, auth=(username, password))
-        
-        if response.status_code != 200:
-            logger.error(f"Failed to download CJ products. Status: {response.status_code}")
+        out_file = os.path.join(feed_dir, os.path.basename(file_path))
+        # Wait for a download slot, giving up if the fetch is cancelled meanwhile
+        while not _cj_download_slots.acquire(timeout=1):
+            if is_cancelled(cancelled):
+                return None
+        try:
+            result = _download_to_file(url, out_file, auth=(username, password),
+                                       state_file=os.path.join(feed_dir, "download_state.json"), cancelled=cancelled)
+        finally:
+            _cj_download_slots.release()
+        if result is None:
             return None
+        if result == "downloaded":
+            _remove_old_feeds(out_file)
         
-        # Save ZIP file
-        out_file = os.path.join(config.TEMP_DIR, os.path.basename(file_path))
-        with open(out_file, "wb") as f:
-            f.write(response.content)
-        
-        # Extract ZIP file
-        data_files = _extract_zip_file(out_file)
+        # List data files inside the ZIP (read in place later)
+        data_files = _list_zip_data_files(out_file)
         if not data_files:
             return None
         
-        logger.info(f"CJ Affiliate: Fetched {len(data_files)} data files")
+        logger.info(f"CJ Affiliate ({feed['name']}): Fetched {len(data_files)} data files")
         return data_files
         
     except Exception as e:
-        logger.error(f"Error fetching CJ products: {e}")
+        logger.error(f"Error fetching CJ products ({feed['name']}): {e}")
         return None
 
-def _extract_zip_file(zip_path):
+def _download_to_file(url, out_file, auth=None, state_file=None, cancelled=None):
     """
-    Extract ZIP file and return list of CSV/TXT files
+    Stream a download to disk in chunks (bounded memory)
+    Sends If-None-Match/If-Modified-Since with the validators of the feed's last complete
+    download, even if its URL changed (CJ paths contain the date), and resumes an
+    interrupted .part file of the same URL with a Range/If-Range request
+    On 304 the previous download is moved to out_file
+    
+    Args:
+        url: URL to download
+        out_file: Destination file path
+        auth: Optional (username, password) tuple for HTTP basic auth
+        state_file: JSON file holding the validators of this feed (default: config.CJ_FEED_STATE_JSON)
+        cancelled: threading.Event that stops the download when set (the .part file is kept for resuming)
+    
+    Returns:
+        str: "downloaded" or "not_modified", or None if failed
+    """
+    part_file = out_file + ".part"
+    state = _load_feed_state(state_file)
+    start = time.monotonic()
+    
+    # Last complete download of this feed (state saved before "file" was tracked only matches its own URL)
+    previous_file = state.get("file") or (out_file if state.get("url") == url else None)
+    if previous_file and not os.path.exists(previous_file):
+        previous_file = None
+    
+    for attempt in range(1, config.CJ_DOWNLOAD_RETRIES + 1):
+        headers = {}
+        
+        # Conditional request against the copy we already have
+        if previous_file:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        
+        # Resume a partial download of the same URL (If-Range restarts it if the file changed)
+        partial = state.get("partial") or {}
+        resume_from = 0
+        if partial.get("url") == url and os.path.exists(part_file):
+            validator = partial.get("etag") or partial.get("last_modified")
+            if validator:
+                resume_from = os.path.getsize(part_file)
+                headers["Range"] = f"bytes={resume_from}-"
+                headers["If-Range"] = validator
+        
+        try:
+            with requests.get(url, auth=auth, headers=headers, stream=True, timeout=config.CJ_DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 304:
+                    if previous_file != out_file:
+                        os.replace(previous_file, out_file)
+                        state["file"] = out_file
+                        _save_feed_state(state, state_file)
+                    logger.info(f"CJ feed not modified since last download ({os.path.basename(out_file)})")
+                    return "not_modified"
+                
+                if response.status_code == 416:
+                    # Stale partial file, start over
+                    os.remove(part_file)
+                    state["partial"] = None
+                    continue
+                
+                if response.status_code == 206:
+                    logger.info(f"Resuming CJ feed download at {resume_from / 1024 / 1024:.1f} MB")
+                    mode = "ab"
+                elif response.status_code == 200:
+                    resume_from = 0
+                    mode = "wb"
+                    partial = {
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified")
+                    }
+                    state["partial"] = partial
+                    _save_feed_state(state, state_file)
+                else:
+                    logger.error(f"Failed to download CJ products. Status: {response.status_code}")
+                    return None
+                
+                with open(part_file, mode) as f:
+                    for chunk in response.iter_content(chunk_size=config.CJ_DOWNLOAD_CHUNK_SIZE):
+                        if is_cancelled(cancelled):
+                            logger.warning(f"CJ feed download cancelled ({os.path.basename(out_file)})")
+                            return None
+                        if chunk:
+                            f.write(chunk)
+                            
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            logger.warning(f"CJ feed download interrupted (attempt {attempt}/{config.CJ_DOWNLOAD_RETRIES}): {e}")
+            if attempt < config.CJ_DOWNLOAD_RETRIES:
+                time.sleep(2 ** attempt)
+            continue
+        
+        os.replace(part_file, out_file)
+        state.update({
+            "url": url,
+            "file": out_file,
+            "etag": partial.get("etag"),
+            "last_modified": partial.get("last_modified"),
+            "partial": None
+        })
+        _save_feed_state(state, state_file)
+        
+        size_mb = os.path.getsize(out_file) / 1024 / 1024
+        elapsed = time.monotonic() - start
+        logger.info(f"Downloaded {size_mb:.1f} MB in {elapsed:.1f}s ({os.path.basename(out_file)})")
+        return "downloaded"
+    
+    logger.error(f"Failed to download CJ products after {config.CJ_DOWNLOAD_RETRIES} attempts")
+    return None
+
+def _remove_old_feeds(current_file):
+    """Delete previously downloaded feed ZIPs in current_file's directory except current_file"""
+    feed_dir = os.path.dirname(current_file)
+    for fname in os.listdir(feed_dir):
+        fpath = os.path.join(feed_dir, fname)
+        if fname.endswith(".zip") and fpath != current_file:
+            try:
+                os.remove(fpath)
+            except OSError:
+                pass
+
+def _load_feed_state(state_file=None):
+    """
+    Load CJ feed download/processing state (validators and last processed hash)
+    
+    Args:
+        state_file: State JSON path (default: config.CJ_FEED_STATE_JSON)
+    
+    Returns:
+        dict: Feed state, empty if none saved yet
+    """
+    try:
+        with open(state_file or config.CJ_FEED_STATE_JSON, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_feed_state(state, state_file=None):
+    """Atomically write CJ feed state"""
+    state_file = state_file or config.CJ_FEED_STATE_JSON
+    os.makedirs(os.path.dirname(state_file), exist_ok=True)
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+def _cj_files_fingerprint(cj_data_files):
+    """
+    Hash the content of the CJ data files
+    ZIP members are identified by name, uncompressed size and CRC-32 from the ZIP
+    directory, so a re-packed archive with identical data hashes the same
+    
+    Args:
+        cj_data_files: List of (zip_path, member_name) tuples or file paths
+    
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    
+    for data_file in cj_data_files:
+        if isinstance(data_file, tuple):
+            zip_path, member = data_file
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                info = zip_ref.getinfo(member)
+            digest.update(f"{member}:{info.file_size}:{info.CRC}\n".encode("utf-8"))
+        else:
+            with open(data_file, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+    
+    return digest.hexdigest()
+
+def _list_zip_data_files(zip_path):
+    """
+    List CSV/TXT members of a ZIP file without extracting it
     
     Args:
         zip_path: Path to ZIP file
     
     Returns:
-        list: List of extracted CSV/TXT file paths
+        list: List of (zip_path, member_name) tuples
     """
     try:
         with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(config.TEMP_DIR)
+            members = [
+                info.filename for info in zip_ref.infolist()
+                if not info.is_dir() and info.filename.lower().endswith((".csv", ".txt"))
+            ]
     except zipfile.BadZipFile:
         logger.error("The downloaded file is not a valid zip archive")
         return []
     
-    # Find all CSV/TXT files
-    data_files = []
-    for fname in os.listdir(config.TEMP_DIR):
-        if fname.lower().endswith((".csv", ".txt")):
-            fpath = os.path.join(config.TEMP_DIR, fname)
-            if os.path.isfile(fpath):
-                data_files.append(fpath)
-    
-    if not data_files:
-        logger.error("No CSV or TXT files found in extracted archive")
+    if not members:
+        logger.error("No CSV or TXT files found in archive")
         return []
     
-    return data_files
+    return [(zip_path, member) for member in members]
+
+def _open_data_file(data_file):
+    """
+    Open a CJ data file as a text stream
+    
+    Args:
+        data_file: (zip_path, member_name) tuple for an archive member, or a plain file path
+    
+    Returns:
+        file: Text stream (use as a context manager)
+    """
+    if isinstance(data_file, tuple):
+        zip_path, member = data_file
+        zip_ref = zipfile.ZipFile(zip_path, 'r')
+        try:
+            stream = zip_ref.open(member, 'r')
+        except Exception:
+            zip_ref.close()
+            raise
+        # ZipExtFile keeps the archive's file handle open until the stream is closed
+        zip_ref.close()
+        return io.TextIOWrapper(stream, encoding="utf-8", newline='')
+    
+    return open(data_file, newline='', encoding="utf-8")
 
 
 # ============================================================================
 # INDIEGALA SCRAPING FUNCTIONS
 # ============================================================================
 
-def _fetch_indiegala_data():
+INDIEGALA_SALE_URL = "https://www.indiegala.com/store/games/on-sale"
+INDIEGALA_AFFILIATE_REF = "?ref=mzvkywq"
+
+def _fetch_indiegala_data(rate_limiter=None, cancelled=None):
     """
-    Scrape IndieGala products and return list of products
-    Deduplicates products by title to prevent duplicates
+    Fetch IndieGala on-sale products
+    Uses the browserless HTTP fetcher, with Selenium as fallback if it fails
+    or finds nothing (e.g. the listing becomes client-side rendered)
+    
+    Args:
+        rate_limiter: AdaptiveRateLimiter for the HTTP page requests (optional)
+        cancelled: threading.Event that stops the fetch when set (optional)
     
     Returns:
         list: List of product dictionaries, or None if failed
     """
-    url = "https://www.indiegala.com/store/games/on-sale"
+    start = time.monotonic()
+    if config.INDIEGALA_FETCH_MODE != "selenium":
+        products = _fetch_indiegala_http(rate_limiter, cancelled)
+        if products:
+            logger.info(f"IndieGala: Fetched {len(products)} products over HTTP in {time.monotonic() - start:.1f}s")
+            return products
+        if is_cancelled(cancelled):
+            return None
+        logger.warning("IndieGala HTTP fetch failed or returned no products, falling back to Selenium")
+    
+    products = _fetch_indiegala_selenium(cancelled)
+    if products is not None:
+        logger.info(f"IndieGala: Selenium fetch took {time.monotonic() - start:.1f}s")
+    return products
+
+def _fetch_indiegala_http(rate_limiter=None, cancelled=None):
+    """
+    Fetch IndieGala on-sale listing pages over HTTP and parse the cards with BeautifulSoup
+    Page 1 gives the page count, the remaining pages are fetched concurrently
+    
+    Args:
+        rate_limiter: AdaptiveRateLimiter for the page requests (optional)
+        cancelled: threading.Event that stops the fetch when set (optional)
+    
+    Returns:
+        list: List of product dictionaries (deduplicated by title), or None if failed
+    """
+    session = requests.Session()
+    if config.ROTATING_PROXY:
+        session.proxies.update({'http': config.ROTATING_PROXY, 'https': config.ROTATING_PROXY})
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=config.INDIEGALA_CONCURRENCY)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        "Accept": "text/html,application/xhtml+xml",
+    })
+    
+    try:
+        first_page = _fetch_indiegala_page(session, 1, rate_limiter)
+        if first_page is None:
+            return None
+        
+        soup = BeautifulSoup(first_page, "html.parser")
+        pages = [_parse_indiegala_cards(soup)]
+        last_page = _parse_indiegala_last_page(soup)
+        
+        with ThreadPoolExecutor(max_workers=config.INDIEGALA_CONCURRENCY, thread_name_prefix="IndieGala") as executor:
+            if last_page:
+                # Known page count: fetch all remaining pages concurrently
+                results = _fetch_indiegala_pages(executor, session, range(2, last_page + 1), rate_limiter, cancelled)
+                if results is None:
+                    return None
+                pages.extend(results)
+            else:
+                # Unknown page count: fetch windows of pages until one comes back empty
+                page = 2
+                while page <= config.INDIEGALA_MAX_PAGES:
+                    window = range(page, min(page + config.INDIEGALA_CONCURRENCY, config.INDIEGALA_MAX_PAGES + 1))
+                    results = _fetch_indiegala_pages(executor, session, window, rate_limiter, cancelled)
+                    if results is None:
+                        return None
+                    pages.extend(results)
+                    if any(not cards for cards in results):
+                        break
+                    page += len(window)
+        
+        # Deduplicate by title in page order
+        game_products = []
+        seen_titles = set()
+        duplicate_count = 0
+        for cards in pages:
+            for product in cards:
+                if product["TITLE"] in seen_titles:
+                    duplicate_count += 1
+                    continue
+                seen_titles.add(product["TITLE"])
+                game_products.append(product)
+        
+        logger.info(f"IndieGala: Parsed {len(pages)} pages, {len(game_products)} products ({duplicate_count} duplicates)")
+        return game_products
+        
+    except Exception as e:
+        logger.error(f"Error fetching IndieGala over HTTP: {e}")
+        return None
+    finally:
+        session.close()
+
+def _fetch_indiegala_page(session, page, rate_limiter=None):
+    """
+    Fetch one IndieGala listing page
+    
+    Args:
+        session: requests.Session
+        page: Page number (1 = base URL)
+        rate_limiter: AdaptiveRateLimiter (optional), slowed down on 429/5xx responses
+    
+    Returns:
+        str: Page HTML, or None on failure
+    """
+    url = INDIEGALA_SALE_URL if page == 1 else f"{INDIEGALA_SALE_URL}/{page}"
+    try:
+        if rate_limiter:
+            rate_limiter.acquire()
+        response = session.get(url, timeout=20)
+        if rate_limiter:
+            if response.status_code == 429 or response.status_code >= 500:
+                rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+            else:
+                rate_limiter.on_success()
+        response.raise_for_status()
+        return response.text
+    except Exception as e:
+        logger.warning(f"Error fetching IndieGala page {page}: {str(e)[:100]}")
+        return None
+
+def _fetch_indiegala_pages(executor, session, page_numbers, rate_limiter=None, cancelled=None):
+    """
+    Fetch and parse listing pages concurrently, retrying failed pages once
+    A listing with missing pages is rejected: the catalogue ingest would mark
+    every offer on them as removed
+    
+    Args:
+        executor: ThreadPoolExecutor for the page requests
+        session: requests.Session
+        page_numbers: Page numbers to fetch
+        rate_limiter: AdaptiveRateLimiter (optional)
+        cancelled: threading.Event that stops the remaining page requests when set (optional)
+    
+    Returns:
+        list: Parsed cards per page in page order, or None if a page failed twice or the fetch was cancelled
+    """
+    page_numbers = list(page_numbers)
+    results = list(executor.map(lambda n: _parse_indiegala_page(session, n, rate_limiter, cancelled), page_numbers))
+    if is_cancelled(cancelled):
+        return None
+    for i, page in enumerate(page_numbers):
+        if results[i] is None:
+            results[i] = _parse_indiegala_page(session, page, rate_limiter, cancelled)
+            if results[i] is None:
+                logger.error(f"IndieGala page {page} failed twice - discarding the partial HTTP listing")
+                return None
+    return results
+
+def _parse_indiegala_page(session, page, rate_limiter=None, cancelled=None):
+    """Fetch and parse one listing page (None if the fetch failed or was cancelled)"""
+    if is_cancelled(cancelled):
+        return None
+    html_text = _fetch_indiegala_page(session, page, rate_limiter)
+    if html_text is None:
+        return None
+    return _parse_indiegala_cards(BeautifulSoup(html_text, "html.parser"))
+
+def _parse_indiegala_last_page(soup):
+    """
+    Read the highest page number from the listing pagination links
+    
+    Returns:
+        int: Last page number, or None if no pagination links were found
+    """
+    numbers = []
+    for link in soup.select(f"a[href*='/store/games/on-sale/'], a[onclick*='/store/games/on-sale/']"):
+        target = link.get("href") or link.get("onclick") or ""
+        match = re.search(r"/store/games/on-sale/(\d+)", target)
+        if match:
+            numbers.append(int(match.group(1)))
+    return min(max(numbers), config.INDIEGALA_MAX_PAGES) if numbers else None
+
+def _parse_indiegala_cards(soup):
+    """
+    Parse all game cards of a listing page
+    
+    Args:
+        soup: BeautifulSoup of the listing page
+    
+    Returns:
+        list: Product dictionaries in page order
+    """
+    products = []
+    for game_card in soup.select(".relative.main-list-results-item"):
+        try:
+            title_el = game_card.select_one("h3.bg-gradient-red")
+            link_el = game_card.select_one("figure.relative a")
+            if title_el is None or link_el is None or not link_el.get("href"):
+                continue
+            
+            discount_el = game_card.select_one("div.main-list-results-item-discount")
+            price_el = game_card.select_one("div.main-list-results-item-price-new")
+            image_el = game_card.select_one("figure.relative img.async-img-load.display-none")
+            old_price_el = game_card.select_one("div.main-list-results-item-price-old")
+            
+            products.append(_build_indiegala_product(
+                game_title=title_el.get_text(" ", strip=True),
+                game_discount=discount_el.get_text(strip=True) if discount_el else "",
+                game_price=price_el.get_text(" ", strip=True) if price_el else "",
+                game_link=urljoin(INDIEGALA_SALE_URL, link_el["href"]),
+                game_image=(image_el.get("src") or image_el.get("data-src") or "") if image_el else "",
+                original_price=old_price_el.get_text(" ", strip=True) if old_price_el else ""
+            ))
+        except Exception as e:
+            logger.debug(f"Error parsing game card: {e}")
+    return products
+
+def _build_indiegala_product(game_title, game_discount, game_price, game_link, game_image, original_price):
+    """
+    Build an IndieGala product row from the text of one game card
+    
+    Args:
+        game_title: Card title
+        game_discount: Discount text, e.g. "-75%"
+        game_price: Current price text
+        game_link: Absolute product URL
+        game_image: Image URL (may be empty)
+        original_price: Old price text (may be empty)
+    
+    Returns:
+        dict: Product dictionary in feed format
+    """
+    game_discount = game_discount.replace("%", "").replace("-", "").strip()
+    original_price = original_price.replace(" ", "")
+    
+    # Parse discount percentage
+    try:
+        discount_percent = int(game_discount) if game_discount else 0
+    except ValueError:
+        discount_percent = 0
+    
+    return {
+        "PROGRAM_NAME": "IndieGala",
+        "ID": f"IG-{game_title.replace(' ', '-').replace(':', '')[:50]}",  # Generate simple ID
+        "TITLE": game_title,
+        "LINK": game_link + INDIEGALA_AFFILIATE_REF,
+        "IMAGE_LINK": game_image,
+        "AVAILABILITY": "in stock",
+        "PRICE": original_price if original_price else game_price.replace(" ", ""),
+        "SALE_PRICE": game_price.replace(" ", ""),
+        "DISCOUNT": str(discount_percent) if discount_percent > 0 else ""
+    }
+
+def _fetch_indiegala_selenium(cancelled=None):
+    """
+    Scrape IndieGala products with headless Chrome (fallback fetcher)
+    Deduplicates products by title to prevent duplicates
+    
+    Args:
+        cancelled: threading.Event that stops pagination and quits Chrome when set (optional)
+    
+    Returns:
+        list: List of product dictionaries, or None if failed or cancelled
+    """
+    url = INDIEGALA_SALE_URL
     
     chrome_options = Options()
     prefs = {
@@ -482,6 +1042,9 @@ def _fetch_indiegala_data():
         max_failures = 3
         
         while True:
+            if is_cancelled(cancelled):
+                logger.warning(f"IndieGala: Selenium fetch cancelled at page {next_nr - 1}")
+                return None
             game_cards = driver.find_elements(By.CSS_SELECTOR, ".relative.main-list-results-item")
             
             if not game_cards:
@@ -498,10 +1061,9 @@ def _fetch_indiegala_data():
                         continue
                     seen_titles.add(game_title)
                     
-                    game_discount = game_card.find_element(By.CSS_SELECTOR, "div.main-list-results-item-discount").text.replace("%", "").replace("-", "")
+                    game_discount = game_card.find_element(By.CSS_SELECTOR, "div.main-list-results-item-discount").text
                     game_price = game_card.find_element(By.CSS_SELECTOR, "div.main-list-results-item-price-new").text
                     game_link = game_card.find_element(By.CSS_SELECTOR, "figure.relative a").get_attribute("href")
-                    game_affiliate_link = game_link + '?ref=mzvkywq'
                     
                     # Try to get image, but don't fail if not available
                     try:
@@ -513,27 +1075,11 @@ def _fetch_indiegala_data():
                     original_price = ""
                     try:
                         original_price_elem = game_card.find_element(By.CSS_SELECTOR, "div.main-list-results-item-price-old")
-                        original_price = original_price_elem.text.replace(" ", "")
+                        original_price = original_price_elem.text
                     except:
                         pass
                     
-                    # Parse discount percentage
-                    try:
-                        discount_percent = int(game_discount) if game_discount else 0
-                    except:
-                        discount_percent = 0
-                    
-                    product = {
-                        "PROGRAM_NAME": "IndieGala",
-                        "ID": f"IG-{game_title.replace(' ', '-').replace(':', '')[:50]}",  # Generate simple ID
-                        "TITLE": game_title,
-                        "LINK": game_affiliate_link,
-                        "IMAGE_LINK": game_image,
-                        "AVAILABILITY": "in stock",
-                        "PRICE": original_price if original_price else game_price.replace(" ", ""),
-                        "SALE_PRICE": game_price.replace(" ", ""),
-                        "DISCOUNT": str(discount_percent) if discount_percent > 0 else ""
-                    }
+                    product = _build_indiegala_product(game_title, game_discount, game_price, game_link, game_image, original_price)
                     game_products.append(product)
                 except Exception as e:
                     logger.debug(f"Error parsing game card: {e}")
@@ -595,142 +1141,537 @@ def _fetch_indiegala_data():
     return game_products
 
 
-# ============================================================================
-# CSV PROCESSING & DATABASE INSERTION FUNCTIONS
-# ============================================================================
+# ============================================================================
+# CSV PROCESSING & DATABASE INSERTION FUNCTIONS
+# ============================================================================
+
+def _ingest_source_stage(streams):
+    """
+    Ingest one stage of source record streams (run_sources ingest callback)
+    Catalogue sources are written to PRODUCTS_CSV and ingested together, with offers no
+    longer in the catalogue marked invalid. Other sources go through the same upsert path
+    
+    Args:
+        streams: List of (adapter, payload, record iterator) tuples
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    catalog_streams = [stream for stream in streams if stream[0].catalog]
+    offer_streams = [stream for stream in streams if not stream[0].catalog]
+    
+    success = True
+    if catalog_streams:
+        success = _ingest_catalog_streams(catalog_streams)
+    if offer_streams:
+        success = _ingest_offer_streams(offer_streams) and success
+    return success
+
+def _ingest_catalog_streams(streams):
+    """
+    Write catalogue streams to CSV and the database, unless the input is identical to
+    the last processed run (all sources report the same fingerprints)
+    
+    Args:
+        streams: List of (adapter, payload, record iterator) tuples
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    fingerprints = [adapter.fingerprint(payload) for adapter, payload, _ in streams]
+    feed_hash = None
+    if all(fingerprints):
+        digest = hashlib.sha256()
+        for (adapter, _, _), fingerprint in zip(streams, fingerprints):
+            digest.update(f"{adapter.name}:{fingerprint}\n".encode("utf-8"))
+        feed_hash = digest.hexdigest()
+    
+    state = _load_feed_state()
+    if feed_hash and feed_hash == state.get("processed_hash") and os.path.exists(config.PRODUCTS_CSV):
+        logger.info("Affiliate feeds unchanged since last processed run - skipping processing")
+        for _, _, records in streams:
+            records.close()
+        return True
+    
+    # Offers of catalogue sources that failed or didn't run are kept valid: their stores
+    # are only in scope for removal because another feed carries them too
+    source_programs = state.get("source_programs") or {}
+    ingested = {adapter.name for adapter, _, _ in streams}
+    keep_program_names = set()
+    mark_removed = True
+    for adapter in get_sources():
+        if adapter.catalog and adapter.name not in ingested:
+            if adapter.name not in source_programs:
+                logger.warning(f"{adapter.name}: stores unknown (never ingested) - not marking removed offers this run")
+                mark_removed = False
+            keep_program_names.update(source_programs.get(adapter.name, []))
+    
+    programs = _write_catalog([(adapter.name, records) for adapter, _, records in streams],
+                              keep_program_names, mark_removed=mark_removed)
+    if programs is None:
+        return False
+    
+    source_programs.update(programs)
+    state["source_programs"] = source_programs
+    if feed_hash:
+        state["processed_hash"] = feed_hash
+    _save_feed_state(state)
+    return True
 
-def _process_csv_files(cj_data_files, indiegala_products=None):
+def _ingest_offer_streams(streams):
     """
-    Process CSV files and IndieGala products, combine into single organized CSV
-    Also inserts affiliate product data into database
+    Insert non-catalogue source records through the shared offer upsert path
     
     Args:
-        cj_data_files: List of CSV file paths from CJ Affiliate
-        indiegala_products: List of IndieGala product dictionaries (optional)
+        streams: List of (adapter, payload, record iterator) tuples
     
     Returns:
         bool: True if successful, False otherwise
     """
-    fields = ["PROGRAM_NAME", "ID", "TITLE", "LINK", "IMAGE_LINK", "AVAILABILITY", "PRICE", "SALE_PRICE", "DISCOUNT"]
+    db_connection = get_connection()
+    if not db_connection:
+        logger.error("Failed to connect to database")
+        return False
+    
+    try:
+        rows = (record for _, _, records in streams for record in records)
+        _insert_offers_to_database(db_connection, rows)
+        return True
+    except Exception as e:
+        logger.error(f"Error inserting {', '.join(adapter.name for adapter, _, _ in streams)} offers: {e}")
+        return False
+    finally:
+        db_connection.close()
+
+def _write_catalog(streams, keep_program_names=None, mark_removed=True):
+    """
+    Combine catalogue record streams into the single organized products CSV
+    Also inserts affiliate product data into database
+    Rows stream through clean -> CSV write -> lookup -> insert in bounded batches,
+    the full feed is never held in memory
+    
+    Args:
+        streams: List of (source name, iterator of cleaned offer records)
+        keep_program_names: PROGRAM_NAMEs whose missing offers are not marked removed
+        mark_removed: Mark offers no longer in the catalogue as invalid
     
-    if indiegala_products is None:
-        indiegala_products = []
+    Returns:
+        dict: Source name -> sorted PROGRAM_NAMEs it delivered, or None if failed
+    """
+    db_connection = get_connection()
+    if not db_connection:
+        logger.error("Failed to connect to database")
+        for _, records in streams:
+            records.close()
+        return None
     
+    snapshot = None
     try:
-        db_connection = get_connection()
-        all_rows_data = []  # Store all row data for batch processing
+        counts = {name: 0 for name, _ in streams}
+        programs = {name: set() for name, _ in streams}
+        snapshot = CatalogSnapshotWriter(OFFER_FIELDS)
         
         with open(config.PRODUCTS_CSV, "w", newline='', encoding="utf-8") as outfile:
-            writer = csv.DictWriter(outfile, fieldnames=fields, quoting=csv.QUOTE_MINIMAL)
+            writer = csv.DictWriter(outfile, fieldnames=OFFER_FIELDS, quoting=csv.QUOTE_MINIMAL, extrasaction="ignore")
             writer.writeheader()
             
-            total_rows = 0
-            
-            # Process CJ Affiliate CSV files
-            for data_file in cj_data_files:
-                try:
-                    with open(data_file, newline='', encoding="utf-8") as infile:
-                        reader = csv.DictReader(infile)
-                        for row in reader:
-                            # Clean row data
-                            out_row = {
-                                field: row.get(field, "")
-                                    .replace("\n", " ")
-                                    .replace("\r", " ")
-                                    .replace("\t", " ")
-                                    .strip()
-                                for field in fields
-                            }
-
-                            # CJ Affiliate products don't have discount, set to empty
-                            if "DISCOUNT" not in out_row or not out_row["DISCOUNT"]:
-                                out_row["DISCOUNT"] = ""
-                            
-                            writer.writerow(out_row)
-                            total_rows += 1
-                            
-                            # Store row data for database insertion
-                            all_rows_data.append(out_row)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing {data_file}: {e}")
+            def _written_rows():
+                for name, records in streams:
+                    for out_row in records:
+                        writer.writerow(out_row)
+                        snapshot.add(out_row)
+                        counts[name] += 1
+                        programs[name].add((out_row.get("PROGRAM_NAME") or "").strip())
+                        yield out_row
             
-            # Process IndieGala products
-            if indiegala_products:
-                for product in indiegala_products:
-                    # Clean product data
-                    out_row = {
-                        field: str(product.get(field, ""))
-                            .replace("\n", " ")
-                            .replace("\r", " ")
-                            .replace("\t", " ")
-                            .strip()
-                        for field in fields
-                    }
-                    writer.writerow(out_row)
-                    total_rows += 1
-                    
-                    # Store row data for database insertion
-                    all_rows_data.append(out_row)
+            _insert_offers_to_database(db_connection, _written_rows(), mark_removed=mark_removed,
+                                       keep_program_names=keep_program_names)
         
-        logger.info(f"Processed {total_rows} products ({total_rows - len(indiegala_products)} CJ, {len(indiegala_products)} IndieGala)")
+        # Committed after the CSV is closed so the snapshot is never older than it
+        snapshot.commit()
         
-        # Now process database inserts
-        if not all_rows_data:
-            logger.warning("No row data collected - skipping database inserts")
-        else:
-            _insert_offers_to_database(db_connection, all_rows_data)
+        total_rows = sum(counts.values())
+        logger.info(f"Processed {total_rows} products ({', '.join(f'{count} {name}' for name, count in counts.items())})")
+        if not total_rows:
+            logger.warning("No row data collected - nothing inserted")
         
-        db_connection.close()
-        return True
+        return {name: sorted(program for program in names if program) for name, names in programs.items()}
         
     except Exception as e:
         logger.error(f"Error creating combined CSV: {e}")
-        if 'db_connection' in locals():
-            db_connection.close()
-        return False
+        if snapshot:
+            snapshot.discard()
+        return None
+    finally:
+        db_connection.close()
+
+# Characters replaced by a space when cleaning feed fields
+_CLEAN_FIELD_TABLE = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+def _clean_feed_chunk(header, rows, fields):
+    """
+    Clean a chunk of raw CSV records
+    
+    Args:
+        header: Column names of the data file
+        rows: List of raw records (lists of strings)
+        fields: Output field names
+    
+    Returns:
+        list: Cleaned row dictionaries in input order
+    """
+    positions = [(field, header.index(field) if field in header else None) for field in fields]
+    cleaned = []
+    for row in rows:
+        out_row = {}
+        for field, position in positions:
+            value = row[position] if position is not None and position < len(row) else ""
+            out_row[field] = value.translate(_CLEAN_FIELD_TABLE).strip()
+        cleaned.append(out_row)
+    return cleaned
+
+def _iter_feed_chunks(data_file, chunk_rows):
+    """
+    Read a data file as (header, chunk of raw records) pairs
+    Chunks are record-aligned: quoted fields may contain newlines, so byte offsets can't be split blindly
+    
+    Args:
+        data_file: (zip_path, member_name) tuple or file path
+        chunk_rows: Records per chunk
+    
+    Yields:
+        tuple: (header list, list of raw records)
+    """
+    with _open_data_file(data_file) as infile:
+        reader = csv.reader(infile)
+        header = next(reader, None)
+        if header is None:
+            return
+        
+        chunk = []
+        for row in reader:
+            if not row:
+                continue
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                yield header, chunk
+                chunk = []
+        if chunk:
+            yield header, chunk
+
+def _clean_data_file(data_file, fields):
+    """
+    Open, parse and clean one whole data file (runs in a worker process)
+    Records go back as tuples: far cheaper to pickle than one dict per row
+    
+    Args:
+        data_file: (zip_path, member_name) tuple or file path
+        fields: Output field names
+    
+    Returns:
+        list: Cleaned records as tuples in fields order
+    """
+    cleaned = []
+    for header, chunk in _iter_feed_chunks(data_file, config.CSV_CLEAN_CHUNK_ROWS):
+        positions = [header.index(field) if field in header else None for field in fields]
+        for row in chunk:
+            cleaned.append(tuple(
+                row[position].translate(_CLEAN_FIELD_TABLE).strip() if position is not None and position < len(row) else ""
+                for position in positions
+            ))
+    return cleaned
+
+def _iter_cleaned_rows(cj_data_files, fields, workers=None, chunk_rows=None):
+    """
+    Clean all CJ data files, one whole file per worker process
+    Workers parse their file themselves, so the parent only turns returned records into
+    rows. Output order is deterministic (file order, then row order) regardless of worker count
+    
+    Args:
+        cj_data_files: List of (zip_path, member_name) tuples or file paths
+        fields: Output field names
+        workers: Number of processes (default: config.CSV_CLEAN_WORKERS, 1 = inline)
+        chunk_rows: Records per chunk when cleaning inline (default: config.CSV_CLEAN_CHUNK_ROWS)
+    
+    Yields:
+        dict: Cleaned row dictionary
+    """
+    workers = workers or config.CSV_CLEAN_WORKERS
+    chunk_rows = chunk_rows or config.CSV_CLEAN_CHUNK_ROWS
+    
+    if workers <= 1:
+        for data_file in cj_data_files:
+            try:
+                for header, chunk in _iter_feed_chunks(data_file, chunk_rows):
+                    yield from _clean_feed_chunk(header, chunk, fields)
+            except Exception as e:
+                logger.error(f"Error processing {data_file}: {e}")
+        return
+    
+    # One file in flight per worker bounds memory to that many cleaned files
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=min(workers, len(cj_data_files)) or 1, mp_context=_cleaning_context()) as executor:
+        for data_file in cj_data_files:
+            pending.append((data_file, executor.submit(_clean_data_file, data_file, fields)))
+            if len(pending) > workers:
+                yield from _collect_cleaned_file(pending.popleft(), fields)
+        
+        while pending:
+            yield from _collect_cleaned_file(pending.popleft(), fields)
+
+def _cleaning_context():
+    """
+    Start method for the cleaning processes
+    Never fork: the parent runs the API server, DB executor and source fetch threads,
+    and a forked child could inherit a lock another thread held at fork time
+    
+    Returns:
+        multiprocessing context ("forkserver" where available, otherwise "spawn")
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+def _collect_cleaned_file(pending_file, fields):
+    """Wait for a submitted data file and yield its cleaned rows (none on failure)"""
+    data_file, future = pending_file
+    try:
+        records = future.result()
+    except Exception as e:
+        logger.error(f"Error processing {data_file}: {e}")
+        return
+    for record in records:
+        yield dict(zip(fields, record))
 
-def _insert_offers_to_database(db_connection, all_rows_data):
+def _insert_offers_to_database(db_connection, rows, mark_removed=False, batch_size=None, keep_program_names=None):
     """
-    Insert affiliate offers into database using batch processing
+    Insert affiliate offers into database in bounded batches
+    rows is consumed once (may be a generator): each batch is looked up, prepared,
+    compared with the stored content hashes and written before the next one is read.
+    Only new offers and offers whose content changed since the last run are written
     
     Args:
         db_connection: Database connection object
-        all_rows_data: List of row dictionaries from CSV
+        rows: Iterable of row dictionaries from CSV
+        mark_removed: Mark offers of the feed's distributors that are no longer in the feed as invalid
+        batch_size: Rows per batch (default: config.OFFER_BATCH_ROWS)
+        keep_program_names: PROGRAM_NAMEs excluded from mark_removed (stores of sources that failed)
     """
-    # Collect unique titles and program names for batch lookup
-    unique_titles = set()
-    unique_program_names = set()
+    batch_size = batch_size or config.OFFER_BATCH_ROWS
     
-    for row_data in all_rows_data:
-        title = row_data.get("TITLE", "").strip()
-        program_name = row_data.get("PROGRAM_NAME", "").strip()
-        if title:
-            unique_titles.add(title)
-        if program_name:
-            unique_program_names.add(program_name)
+    stats = _new_offer_stats()
+    delta = {'new': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+    missing_titles = {}
+    distributor_id_map = {}
+    existing = {}  # (item_id, distributor_id) -> stored offer state
+    seen_keys = set()
+    
+    for batch in _iter_batches(rows, batch_size):
+        unique_titles = set()
+        new_program_names = set()
+        for row_data in batch:
+            title = row_data.get("TITLE", "").strip()
+            program_name = row_data.get("PROGRAM_NAME", "").strip()
+            if title:
+                unique_titles.add(title)
+            if program_name and program_name not in distributor_id_map:
+                new_program_names.add(program_name)
+        
+        # Item ids per batch, distributor ids and their stored offers once per distributor
+        item_id_map = _batch_lookup_item_ids(db_connection, unique_titles)
+        if new_program_names:
+            known_ids = set(distributor_id_map.values())
+            found = _batch_lookup_distributor_ids(db_connection, new_program_names)
+            distributor_id_map.update(found)
+            # Remember misses so they aren't looked up again
+            for program_name in new_program_names - set(found):
+                distributor_id_map[program_name] = None
+            new_ids = set(found.values()) - known_ids
+            if new_ids:
+                existing.update(_load_offer_state(db_connection, new_ids))
+        
+        # Process rows and prepare query values (missing titles collected in the same pass)
+        query_values = _prepare_offer_inserts(batch, item_id_map, distributor_id_map, stats=stats, missing_titles=missing_titles)
+        
+        # Compare content hashes with the stored offers and write only the delta
+        query_values = _compute_offer_delta(query_values, existing, seen_keys, delta)
+        if query_values:
+            if config.OFFER_INGEST_MODE == "staging":
+                _execute_staging_merge(db_connection, query_values, stats)
+            else:
+                _execute_batch_insert(db_connection, query_values, stats)
+    
+    removed_ids = []
+    if mark_removed:
+        kept_distributor_ids = set()
+        if keep_program_names:
+            kept_distributor_ids = set(_batch_lookup_distributor_ids(db_connection, set(keep_program_names)).values())
+            logger.info(f"Not marking removed offers of {', '.join(sorted(keep_program_names))} (source failed or not run)")
+        removed_ids = [
+            state[0]
+            for key, state in existing.items()
+            if key not in seen_keys and state[2] and not state[4] and key[1] not in kept_distributor_ids
+        ]
+    delta['removed'] = len(removed_ids)
+    stats.update(delta)
+    
+    _log_offer_stats(stats)
+    logger.info(f"Offer delta: {delta['new']} new, {delta['changed']} changed, "
+                f"{delta['unchanged']} unchanged, {delta['removed']} removed")
+    if not delta['new'] and not delta['changed']:
+        logger.info("No new or changed offers to write to database")
+    
+    if removed_ids:
+        _mark_removed_offers(db_connection, removed_ids)
+    
+    # Write missing game titles to file (only if there are missing items)
+    if missing_titles:
+        _write_missing_titles_to_file(missing_titles)
+
+def _iter_batches(rows, batch_size):
+    """
+    Group an iterable into lists of at most batch_size items
+    
+    Yields:
+        list: Next batch
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _offer_content_hash(values):
+    """
+    Fingerprint of the offer columns written by the upsert
+    
+    Args:
+        values: Offer value tuple from _prepare_offer_inserts
+    
+    Returns:
+        str: 32-character hex digest
+    """
+    payload = "\x1f".join("" if value is None else str(value) for value in values[2:])
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+def _load_offer_state(db_connection, distributor_ids):
+    """
+    Load stored offer state of the given distributors for delta comparison
+    
+    Args:
+        db_connection: Database connection object
+        distributor_ids: Set of distributor ids
+    
+    Returns:
+        dict: (item_id, distributor_id) -> (offer_id, content_hash, is_valid, is_hidden, is_manually_edited)
+    """
+    placeholders = ", ".join(["%s"] * len(distributor_ids))
+    rows = execute_query(
+        f"""SELECT id, item_id, distributor_id, content_hash, is_valid, is_hidden, is_manually_edited
+            FROM offers WHERE distributor_id IN ({placeholders})""",
+        tuple(distributor_ids),
+        fetch=True,
+        connection=db_connection
+    )
+    if rows is None:
+        logger.warning("Could not load stored offer hashes - writing all offers")
+        return {}
+    
+    return {
+        (item_id, distributor_id): (offer_id, content_hash, is_valid, is_hidden, is_manually_edited)
+        for offer_id, item_id, distributor_id, content_hash, is_valid, is_hidden, is_manually_edited in rows
+    }
+
+def _compute_offer_delta(query_values, existing, seen_keys, delta):
+    """
+    Keep only new and changed offers using the stored content hashes
+    An offer is unchanged only if upserting it again would not modify the row.
+    existing is updated with every written offer, so a later duplicate in the
+    feed is compared against what this run wrote (same result as sequential upserts)
     
-    # Batch lookup all item_ids and distributor_ids
-    item_id_map = _batch_lookup_item_ids(db_connection, unique_titles)
-    distributor_id_map = _batch_lookup_distributor_ids(db_connection, unique_program_names)
+    Args:
+        query_values: List of offer value tuples from _prepare_offer_inserts
+        existing: Stored offer state from _load_offer_state (updated in place)
+        seen_keys: Set of (item_id, distributor_id) keys seen in the feed (updated in place)
+        delta: Dictionary of new/changed/unchanged counters (updated in place)
+    
+    Returns:
+        list: Value tuples to write, with content_hash appended
+    """
+    # Later duplicates of an (item, distributor) pair within the batch win
+    latest = {}
+    for values in query_values:
+        latest[(values[0], values[1])] = values
+    
+    to_write = []
+    for key, values in latest.items():
+        content_hash = _offer_content_hash(values)
+        stored = existing.get(key)
+        # Offers repeated in a later batch are counted once
+        counter = delta if key not in seen_keys else {}
+        seen_keys.add(key)
+        
+        if stored is None:
+            counter['new'] = counter.get('new', 0) + 1
+            existing[key] = (None, content_hash, values[7], 0, 0)
+        else:
+            offer_id, stored_hash, is_valid, is_hidden, is_manually_edited = stored
+            # The upsert also resets is_valid/is_hidden on offers that weren't edited by an admin
+            if stored_hash == content_hash and (is_manually_edited or (is_valid == values[7] and not is_hidden)):
+                counter['unchanged'] = counter.get('unchanged', 0) + 1
+                continue
+            counter['changed'] = counter.get('changed', 0) + 1
+            if is_manually_edited:
+                existing[key] = (offer_id, content_hash, is_valid, is_hidden, is_manually_edited)
+            else:
+                existing[key] = (offer_id, content_hash, values[7], 0, 0)
+        
+        to_write.append(values + (content_hash,))
     
-    # Process rows and prepare query values
-    query_values, stats = _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map)
+    return to_write
+
+def _mark_removed_offers(db_connection, offer_ids, chunk_size=1000):
+    """
+    Mark offers that disappeared from the feed as invalid (batched by id)
     
-    # Batch insert into database
-    if query_values:
-        _execute_batch_insert(db_connection, query_values, stats)
-    else:
-        logger.warning("No valid products to insert into database")
+    Args:
+        db_connection: Database connection object
+        offer_ids: List of offer ids
+        chunk_size: Number of ids per UPDATE statement
+    """
+    updated = 0
+    for i in range(0, len(offer_ids), chunk_size):
+        chunk = offer_ids[i:i + chunk_size]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rowcount = execute_query(
+            f"UPDATE offers SET is_valid = 0 WHERE is_manually_edited = 0 AND id IN ({placeholders})",
+            tuple(chunk),
+            connection=db_connection
+        )
+        if rowcount is None:
+            db_connection.rollback()
+            logger.error("Error marking removed offers as invalid")
+            return
+        updated += rowcount
+    
+    db_connection.commit()
+    logger.info(f"Marked {updated} offers no longer in the feed as invalid")
 
-def _batch_lookup_item_ids(db_connection, unique_titles):
+def _batch_lookup_item_ids(db_connection, unique_titles, chunk_size=1000):
     """
     Batch lookup item_ids for all unique titles (fuzzy matching with normalization)
     Handles punctuation differences like hyphens, colons, etc.
+    Queries the indexed items.normalized_title column with chunked IN (...) lookups,
+    so cost scales with the number of feed titles, not the size of the catalogue.
+    Titles with no exact match fall back to the fuzzy title index (edition variants)
     
     Args:
         db_connection: Database connection object
         unique_titles: Set of unique titles
+        chunk_size: Number of normalized titles per IN (...) query
     
     Returns:
         dict: Mapping of title -> item_id
@@ -743,25 +1684,41 @@ def _batch_lookup_item_ids(db_connection, unique_titles):
     
     try:
         # Create normalized mapping: normalized CSV title -> original CSV titles
-        for csv_title in unique_titles:
-            normalized = _normalize_title_for_matching(csv_title)
+        unique_titles = list(unique_titles)
+        for csv_title, normalized in zip(unique_titles, normalize_many(unique_titles)):
             if normalized not in normalized_title_map:
                 normalized_title_map[normalized] = []
             normalized_title_map[normalized].append(csv_title)
         
-        # Fetch all items from database and normalize them for matching
+        # Look up only the normalized titles present in the feed
+        db_normalized_map = {}
+        normalized_titles = list(normalized_title_map.keys())
         cursor = db_connection.cursor(buffered=True)
-        cursor.execute("SELECT id, title FROM items")
-        db_items = cursor.fetchall()
-        cursor.close()
+        try:
+            for i in range(0, len(normalized_titles), chunk_size):
+                chunk = normalized_titles[i:i + chunk_size]
+                format_strings = ','.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f"SELECT id, normalized_title FROM items WHERE normalized_title IN ({format_strings}) ORDER BY id",
+                    tuple(chunk)
+                )
+                for item_id, normalized_db_title in cursor.fetchall():
+                    # If multiple DB items have same normalized title, use first one
+                    if normalized_db_title not in db_normalized_map:
+                        db_normalized_map[normalized_db_title] = item_id
+        finally:
+            cursor.close()
         
-        # Create normalized database title -> item_id mapping
-        db_normalized_map = {}
-        for item_id, db_title in db_items:
-            normalized_db_title = _normalize_title_for_matching(db_title)
-            # If multiple DB items have same normalized title, use first one
-            if normalized_db_title not in db_normalized_map:
-                db_normalized_map[normalized_db_title] = item_id
+        # Titles with no exact match go through the fuzzy index (edition suffixes, near-misses)
+        unmatched = [normalized for normalized in normalized_titles if normalized not in db_normalized_map]
+        if unmatched and config.FUZZY_TITLE_MATCHING:
+            fuzzy_index = _get_fuzzy_title_index(db_connection)
+            if fuzzy_index is not None:
+                fuzzy_matches = fuzzy_index.match_many(unmatched)
+                for normalized_csv, (item_id, _) in fuzzy_matches.items():
+                    db_normalized_map[normalized_csv] = item_id
+                if fuzzy_matches:
+                    logger.info(f"Fuzzy matched {len(fuzzy_matches)} of {len(unmatched)} titles with no exact match")
         
         # Match normalized CSV titles with normalized DB titles
         for normalized_csv, csv_titles in normalized_title_map.items():
@@ -777,6 +1734,45 @@ def _batch_lookup_item_ids(db_connection, unique_titles):
     
     return item_id_map
 
+# Fuzzy index over items, rebuilt only when the items table changes
+_fuzzy_index_cache = {"key": None, "index": None}
+
+def _get_fuzzy_title_index(db_connection):
+    """
+    Get the fuzzy title index over items.normalized_title
+    Built once from a single scan of items and reused across batches and runs while
+    the item count, max id and normalized-title revision (count and checksum of
+    normalized_title, so backfills and retitles rebuild it) are unchanged
+    
+    Args:
+        db_connection: Database connection object
+    
+    Returns:
+        FuzzyTitleIndex: Index, or None if it could not be built
+    """
+    try:
+        cursor = db_connection.cursor(buffered=True)
+        try:
+            cursor.execute("SELECT COUNT(*), MAX(id), COUNT(normalized_title), SUM(CRC32(normalized_title)) FROM items")
+            cache_key = tuple(cursor.fetchone())
+            if _fuzzy_index_cache["key"] == cache_key:
+                return _fuzzy_index_cache["index"]
+            
+            start = time.monotonic()
+            cursor.execute("SELECT id, normalized_title FROM items WHERE normalized_title IS NOT NULL ORDER BY id")
+            index = FuzzyTitleIndex(cursor.fetchall(), threshold=config.FUZZY_TITLE_THRESHOLD)
+        finally:
+            cursor.close()
+        
+        _fuzzy_index_cache["key"] = cache_key
+        _fuzzy_index_cache["index"] = index
+        logger.info(f"Built fuzzy title index over {len(index)} titles in {time.monotonic() - start:.2f}s")
+        return index
+        
+    except Exception as e:
+        logger.error(f"Error building fuzzy title index: {e}")
+        return None
+
 def _batch_lookup_distributor_ids(db_connection, unique_program_names):
     """
     Batch lookup distributor_ids for all unique program names
@@ -797,7 +1793,7 @@ def _batch_lookup_distributor_ids(db_connection, unique_program_names):
         # Normalize all program names and create mapping
         normalized_to_original = {}
         for prog_name in unique_program_names:
-            normalized = _normalize_distributor_name(prog_name)
+            normalized = normalize_distributor_name(prog_name)
             if normalized not in normalized_to_original:
                 normalized_to_original[normalized] = []
             normalized_to_original[normalized].append(prog_name)
@@ -824,36 +1820,65 @@ def _batch_lookup_distributor_ids(db_connection, unique_program_names):
     
     return distributor_id_map
 
-def _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map):
+def _new_offer_stats():
+    """
+    Create empty offer preparation statistics
+    
+    Returns:
+        dict: Zeroed counters and per-distributor stats
+    """
+    return {
+        'total': 0,
+        'valid': 0,
+        'skipped': 0,
+        'missing_item': 0,
+        'missing_distributor': 0,
+        'missing_sale_price': 0,
+        'price_conversion_failed': 0,
+        'missing_essential': 0,
+        'distributor_stats': {}
+    }
+
+def _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map, stats=None, missing_titles=None):
     """
-    Prepare offer insert values from row data
+    Prepare offer insert values from row data (single pass)
     
     Args:
-        all_rows_data: List of row dictionaries
+        all_rows_data: List of row dictionaries (one batch)
         item_id_map: Mapping of title -> item_id
         distributor_id_map: Mapping of program_name -> distributor_id
+        stats: Statistics dictionary to accumulate into (optional, see _new_offer_stats)
+        missing_titles: Dictionary collecting titles not found in items (optional, see _write_missing_titles_to_file)
     
     Returns:
-        tuple: (query_values list, stats dict)
+        list: Offer value tuples
     """
+    if stats is None:
+        stats = _new_offer_stats()
+    if missing_titles is None:
+        missing_titles = {}
+    
     query_values = []
-    skipped_count = 0
-    missing_item_count = 0
-    missing_distributor_count = 0
-    missing_sale_price_count = 0
-    price_conversion_failed_count = 0
-    missing_essential_data_count = 0
     
     # Track stats per distributor for debugging
-    distributor_stats = {}
+    distributor_stats = stats['distributor_stats']
     
     for row_data in all_rows_data:
+        stats['total'] += 1
         title = row_data.get("TITLE", "").strip()
         program_name = row_data.get("PROGRAM_NAME", "").strip()
         affiliate_url = row_data.get("LINK", "").strip()
         image_url = row_data.get("IMAGE_LINK", "").strip()
         list_price = row_data.get("PRICE", "").strip()
         sale_price = row_data.get("SALE_PRICE", "").strip()
+        
+        item_id = item_id_map.get(title)
+        
+        # Missing game titles report
+        if title and program_name and sale_price and not item_id:
+            info = missing_titles.setdefault(title, {'distributors': set(), 'count': 0})
+            info['distributors'].add(program_name)
+            info['count'] += 1
 
         # Initialize distributor stats if not exists
         if program_name and program_name not in distributor_stats:
@@ -868,60 +1893,52 @@ def _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map):
 
         # Skip if essential data is missing
         if not title or not program_name or not affiliate_url:
-            skipped_count += 1
-            missing_essential_data_count += 1
+            stats['skipped'] += 1
+            stats['missing_essential'] += 1
             if program_name:
                 distributor_stats[program_name]['missing_essential'] += 1
             continue
         
         # Fast dictionary lookup (no query!)
-        item_id = item_id_map.get(title)
         if not item_id:
-            missing_item_count += 1
+            stats['missing_item'] += 1
             distributor_stats[program_name]['missing_item'] += 1
             continue
         
         distributor_id = distributor_id_map.get(program_name)
         if not distributor_id:
-            missing_distributor_count += 1
+            stats['missing_distributor'] += 1
             distributor_stats[program_name]['missing_distributor'] += 1
             continue
         
         # Skip if no sale_price (required)
         if not sale_price or not sale_price.strip():
-            missing_sale_price_count += 1
-            skipped_count += 1
+            stats['missing_sale_price'] += 1
+            stats['skipped'] += 1
             distributor_stats[program_name]['missing_sale_price'] += 1
             continue
         
         # Convert prices to float for database
-        try:
-            # Clean price strings: remove currency symbols ($, €, £, ¥), commas, and currency codes (USD, EUR, GBP, etc.)
-            list_price_clean = str(list_price).replace("$", "").replace("€", "").replace("£", "").replace("¥", "").replace(",", "").upper().replace("USD", "").replace("EUR", "").replace("GBP", "").strip() if list_price else ""
-            sale_price_clean = str(sale_price).replace("$", "").replace("€", "").replace("£", "").replace("¥", "").replace(",", "").upper().replace("USD", "").replace("EUR", "").replace("GBP", "").strip() if sale_price else ""
-            
-            list_price_float = float(list_price_clean) if list_price_clean else None
-            sale_price_float = float(sale_price_clean) if sale_price_clean else None
-        except Exception:
-            list_price_float = None
-            sale_price_float = None
-            price_conversion_failed_count += 1
-            skipped_count += 1
+        list_price_float = parse_price(list_price)
+        sale_price_float = parse_price(sale_price)
+        if list_price_float is None and list_price:
+            stats['price_conversion_failed'] += 1
+            stats['skipped'] += 1
             distributor_stats[program_name]['price_conversion_failed'] += 1
             continue
         
         # Skip if sale_price conversion failed or is None
         if sale_price_float is None:
-            skipped_count += 1
+            stats['skipped'] += 1
             distributor_stats[program_name]['price_conversion_failed'] += 1
             continue
         
-        # Calculate discount (round to whole number) - use cleaned prices!
-        discount = _calculate_discount(list_price_clean, sale_price_clean)
+        # Calculate discount (round to whole number)
+        discount = calculate_discount(list_price_float, sale_price_float)
         
         # Skip if discount is less than 20% (minimum requirement for all distributors)
         if discount < 20:
-            skipped_count += 1
+            stats['skipped'] += 1
             distributor_stats[program_name]['discount_too_low'] += 1
             continue
         
@@ -939,21 +1956,14 @@ def _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map):
             discount,
             is_valid
         ))
+        stats['valid'] += 1
         distributor_stats[program_name]['valid'] += 1
     
-    stats = {
-        'total': len(all_rows_data),
-        'valid': len(query_values),
-        'skipped': skipped_count,
-        'missing_item': missing_item_count,
-        'missing_distributor': missing_distributor_count,
-        'missing_sale_price': missing_sale_price_count,
-        'price_conversion_failed': price_conversion_failed_count,
-        'missing_essential': missing_essential_data_count,
-        'distributor_stats': distributor_stats
-    }
-    
-    # Log detailed stats for GamersGate, GOG, and YUPLAY to debug insertion issues
+    return query_values
+
+def _log_offer_stats(stats):
+    """Log detailed stats for GamersGate, GOG, and YUPLAY to debug insertion issues"""
+    distributor_stats = stats['distributor_stats']
     for dist_name in ['GamersGate.com', 'GOG.COM INT', 'YUPLAY']:
         if dist_name in distributor_stats:
             stats_data = distributor_stats[dist_name]
@@ -963,164 +1973,232 @@ def _prepare_offer_inserts(all_rows_data, item_id_map, distributor_id_map):
                       f"price_conversion_failed={stats_data['price_conversion_failed']}, "
                       f"discount_too_low={stats_data['discount_too_low']}, "
                       f"missing_essential={stats_data['missing_essential']}")
-    
-    # Write missing game titles to file (only if there are missing items)
-    if missing_item_count > 0:
-        missing_items = []
-        for row_data in all_rows_data:
-            title = row_data.get("TITLE", "").strip()
-            program_name = row_data.get("PROGRAM_NAME", "").strip()
-            sale_price = row_data.get("SALE_PRICE", "").strip()
-            
-            if title and program_name and sale_price:
-                item_id = item_id_map.get(title)
-                if not item_id:
-                    missing_items.append({'title': title, 'program': program_name})
-        
-        if missing_items:
-            _write_missing_titles_to_file(missing_items)
-    
-    return query_values, stats
 
 def _execute_batch_insert(db_connection, query_values, stats):
     """
-    Execute batch insert of offers into database
+    Execute chunked batch insert of offers into database
+    Each chunk is a single multi-row upsert with its own commit, so row locks
+    on offers are held only for one chunk at a time
     
     Args:
         db_connection: Database connection object
-        query_values: List of tuples for executemany
+        query_values: Iterable of offer value tuples
         stats: Dictionary with statistics
     """
     try:
-        cursor = db_connection.cursor(buffered=True)
-        cursor.executemany(
+        result = execute_chunked_upsert(
+            "INSERT INTO offers (item_id, distributor_id, affiliate_url, image_url, list_price, sale_price, discount, is_valid, content_hash) VALUES",
+            "(%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            query_values,
+            update_sql=OFFER_UPSERT_UPDATE_SQL,
+            connection=db_connection,
+            label="offers"
+        )
+        if result:
+            inserted, failed = result
+            logger.info(f"Inserted {inserted} offers into database ({failed} failed)")
+    except Exception as e:
+        logger.error(f"Error inserting affiliate products into database: {e}")
+        db_connection.rollback()
+
+def _execute_staging_merge(db_connection, query_values, stats):
+    """
+    Bulk load offers into a temporary staging table, then merge into offers
+    with a single set-based INSERT ... SELECT ... ON DUPLICATE KEY UPDATE
+    Uses LOAD DATA LOCAL INFILE when enabled, otherwise chunked multi-row inserts
+    
+    Args:
+        db_connection: Database connection object
+        query_values: List of offer value tuples
+        stats: Dictionary with statistics
+    """
+    start_time = time.time()
+    staging_file = None
+    cursor = db_connection.cursor()
+    
+    try:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS offers_staging")
+        cursor.execute(
+            """CREATE TEMPORARY TABLE offers_staging (
+                   item_id INT NOT NULL,
+                   distributor_id INT NOT NULL,
+                   affiliate_url TEXT,
+                   image_url TEXT,
+                   list_price DECIMAL(10,2) NULL,
+                   sale_price DECIMAL(10,2) NULL,
+                   discount INT,
+                   is_valid TINYINT,
+                   content_hash CHAR(32)
+               )"""
+        )
+        
+        # Step 1: Load rows into staging table
+        loaded = False
+        if config.DB_ALLOW_LOCAL_INFILE:
+            try:
+                staging_file = _write_staging_file(query_values)
+                cursor.execute(
+                    f"""LOAD DATA LOCAL INFILE '{staging_file.replace(os.sep, '/')}'
+                        INTO TABLE offers_staging
+                        CHARACTER SET utf8mb4
+                        FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                        LINES TERMINATED BY '\\n'
+                        (item_id, distributor_id, affiliate_url, image_url, list_price, sale_price, discount, is_valid, content_hash)"""
+                )
+                loaded = True
+            except Exception as e:
+                logger.warning(f"LOAD DATA LOCAL INFILE failed, falling back to multi-row inserts: {e}")
+                cursor.execute("TRUNCATE TABLE offers_staging")
+        
+        if not loaded:
+            execute_chunked_upsert(
+                "INSERT INTO offers_staging (item_id, distributor_id, affiliate_url, image_url, list_price, sale_price, discount, is_valid, content_hash) VALUES",
+                "(%s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                query_values,
+                connection=db_connection,
+                label="staged offers"
+            )
+        
+        load_time = time.time() - start_time
+        
+        # Step 2: Set-based merge into offers (columns qualified, staging shares their names)
+        cursor.execute(
             """INSERT INTO offers 
-               (item_id, distributor_id, affiliate_url, image_url, list_price, sale_price, discount, is_valid) 
-               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+               (item_id, distributor_id, affiliate_url, image_url, list_price, sale_price, discount, is_valid, content_hash)
+               SELECT s.item_id, s.distributor_id, s.affiliate_url, s.image_url, s.list_price, s.sale_price, s.discount, s.is_valid, s.content_hash
+               FROM offers_staging s
                ON DUPLICATE KEY UPDATE 
-               affiliate_url = IF(is_manually_edited = 0, VALUES(affiliate_url), affiliate_url),
-               image_url = IF(is_manually_edited = 0, VALUES(image_url), image_url),
-               list_price = IF(is_manually_edited = 0, VALUES(list_price), list_price),
-               sale_price = IF(is_manually_edited = 0, VALUES(sale_price), sale_price),
-               discount = IF(is_manually_edited = 0, VALUES(discount), discount),
-               is_valid = IF(is_manually_edited = 0, VALUES(is_valid), is_valid),
-               is_hidden = IF(is_manually_edited = 0, VALUES(is_hidden), is_hidden)""",
-            query_values
+               affiliate_url = IF(offers.is_manually_edited = 0, VALUES(affiliate_url), offers.affiliate_url),
+               image_url = IF(offers.is_manually_edited = 0, VALUES(image_url), offers.image_url),
+               list_price = IF(offers.is_manually_edited = 0, VALUES(list_price), offers.list_price),
+               sale_price = IF(offers.is_manually_edited = 0, VALUES(sale_price), offers.sale_price),
+               discount = IF(offers.is_manually_edited = 0, VALUES(discount), offers.discount),
+               is_valid = IF(offers.is_manually_edited = 0, VALUES(is_valid), offers.is_valid),
+               is_hidden = IF(offers.is_manually_edited = 0, VALUES(is_hidden), offers.is_hidden),
+               content_hash = VALUES(content_hash)"""
         )
         db_connection.commit()
-        cursor.close()
-        logger.info(f"Inserted {len(query_values)} offers into database")
+        
+        total_time = time.time() - start_time
+        logger.info(f"Merged {len(query_values)} offers via staging table "
+                    f"(load {load_time:.2f}s, merge {total_time - load_time:.2f}s, "
+                    f"{'LOAD DATA' if loaded else 'multi-row inserts'})")
     except Exception as e:
-        logger.error(f"Error inserting affiliate products into database: {e}")
+        logger.error(f"Error merging offers from staging table: {e}")
         db_connection.rollback()
+    finally:
+        try:
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS offers_staging")
+        except Exception:
+            pass
+        cursor.close()
+        if staging_file and os.path.exists(staging_file):
+            os.remove(staging_file)
 
-
-# ============================================================================
-# HELPER/UTILITY FUNCTIONS
-# ============================================================================
-
-def _normalize_title_for_matching(title):
+def _write_staging_file(query_values):
     """
-    Normalize title for fuzzy matching by removing punctuation and normalizing whitespace
-    Handles variations like:
-    - "Cronos: The New Dawn - Deluxe Edition" vs "Cronos: The New Dawn Deluxe Edition"
-    - Different hyphen styles, colons, etc.
+    Write offer value tuples to a tab-separated file for LOAD DATA
     
     Args:
-        title: Title string to normalize
+        query_values: List of offer value tuples
     
     Returns:
-        str: Normalized title for matching
+        str: Path to the written file
     """
-    # Convert to lowercase
-    normalized = title.lower().strip()
+    os.makedirs(config.TEMP_DIR, exist_ok=True)
+    staging_file = os.path.join(config.TEMP_DIR, "offers_staging.tsv")
     
-    # Replace common punctuation with spaces (hyphens, colons, semicolons, etc.)
-    normalized = re.sub(r'[-:;–—]', ' ', normalized)
+    def _tsv_value(value):
+        if value is None:
+            return "\\N"
+        return str(value).replace("\\", "\\\\").replace("\t", " ").replace("\n", " ").replace("\r", " ")
     
-    # Remove other punctuation (keep apostrophes for names like "O'Brien")
-    normalized = re.sub(r'[^\w\s\']', '', normalized)
+    with open(staging_file, "w", encoding="utf-8", newline="") as f:
+        for row in query_values:
+            f.write("\t".join(_tsv_value(value) for value in row))
+            f.write("\n")
     
-    # Collapse multiple spaces to single space
-    normalized = re.sub(r'\s+', ' ', normalized)
+    return staging_file
+
+
+# ============================================================================
+# OFFER SOURCE ADAPTERS
+# ============================================================================
+
+class CJFeedSource(SourceAdapter):
+    """One CJ Affiliate product feed (ZIP download, data files cleaned across a process pool)"""
+    timeout = config.CJ_FETCH_TIMEOUT
+    catalog = True
     
-    # Trim
-    normalized = normalized.strip()
+    def __init__(self, feed):
+        self.feed = feed
+        self.name = f"CJ:{feed['name']}"
+        self.required = feed.get("required", False)
     
-    return normalized
-
-def _normalize_distributor_name(program_name):
-    """
-    Normalize PROGRAM_NAME from CSV to match database distributor names
-    Examples:
-    - "GamersGate.com" → "GamersGate"
-    - "YUPLAY" → "Yuplay" (or "YUPLAY" depending on DB)
-    - "GOG.COM" → "GOG"
-    - "IndieGala" → "IndieGala" (same)
-    """
-    program_name = program_name.strip()
+    def fetch(self, rate_limiter=None, cancelled=None):
+        return _fetch_cj_data_files(self.feed, cancelled)
     
-    # Mapping from CSV PROGRAM_NAME to database name
-    name_mapping = {
-        "GamersGate.com": "GamersGate",
-        "GOG.COM INT": "GOG",
-        "YUPLAY": "YUPLAY",  # Database has YUPLAY in all caps
-        "IndieGala": "IndieGala",
-    }
+    def records(self, payload):
+        return _iter_cleaned_rows(payload, OFFER_FIELDS)
     
-    # Return mapped name if exists, otherwise return original
-    return name_mapping.get(program_name, program_name)
+    def fingerprint(self, payload):
+        return _cj_files_fingerprint(payload)
+
+class IndieGalaSource(SourceAdapter):
+    """IndieGala on-sale listing (HTTP, Selenium fallback)"""
+    name = "IndieGala"
+    timeout = config.INDIEGALA_FETCH_TIMEOUT
+    rate = config.INDIEGALA_RATE
+    max_rate = config.INDIEGALA_MAX_RATE
+    catalog = True
+    
+    def fetch(self, rate_limiter=None, cancelled=None):
+        return _fetch_indiegala_data(rate_limiter, cancelled)
+    
+    def records(self, payload):
+        for product in payload:
+            yield {
+                field: str(product.get(field, "")).translate(_CLEAN_FIELD_TABLE).strip()
+                for field in OFFER_FIELDS
+            }
+    
+    def fingerprint(self, payload):
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class GamersGateSource(SourceAdapter):
+    """GamersGate catalogue API prices, matched to the GamersGate affiliate links in the catalogue"""
+    name = "GamersGate"
+    timeout = config.GAMERSGATE_FETCH_TIMEOUT
+    rate = config.GAMERSGATE_RATE
+    max_rate = config.GAMERSGATE_MAX_RATE
+    depends_on = tuple(f"CJ:{feed['name']}" for feed in config.CJ_FEEDS)  # Needs the GamersGate affiliate links
+    
+    def fetch(self, rate_limiter=None, cancelled=None):
+        return _fetch_gamersgate_offers(rate_limiter, cancelled)
+    
+    def records(self, payload):
+        return _match_gamersgate_offers(payload)
+
+for cj_feed in config.CJ_FEEDS:
+    register_source(CJFeedSource(cj_feed))
+register_source(IndieGalaSource())
+register_source(GamersGateSource())
 
-def _calculate_discount(list_price_str, sale_price_str):
-    """
-    Calculate discount percentage from list_price and sale_price
-    Returns rounded whole number percentage, or 0 if calculation fails
-    """
-    try:
-        # Clean price strings
-        list_price_str = str(list_price_str).replace("$", "").replace(",", "").replace(" ", "").strip()
-        sale_price_str = str(sale_price_str).replace("$", "").replace(",", "").replace(" ", "").strip()
-        
-        if not list_price_str or not sale_price_str:
-            return 0
-        
-        list_price = float(list_price_str)
-        sale_price = float(sale_price_str)
-        
-        if list_price <= 0:
-            return 0
-        
-        discount = ((list_price - sale_price) / list_price) * 100
-        return round(discount)
-    except Exception as e:
-        logger.debug(f"Error calculating discount: {e}")
-        return 0
 
-def _write_missing_titles_to_file(missing_items):
+# ============================================================================
+# HELPER/UTILITY FUNCTIONS
+# ============================================================================
+
+def _write_missing_titles_to_file(missing_titles):
     """
     Write missing game titles to CSV file for easy import
     
     Args:
-        missing_items: List of dictionaries with 'title' and 'program' keys
+        missing_titles: Dictionary of title -> {'distributors': set of program names, 'count': occurrences}
     """
     try:
-        # Deduplicate titles and collect distributors
-        title_info = {}
-        for item in missing_items:
-            title = item['title']
-            program = item['program']
-            
-            if title not in title_info:
-                title_info[title] = {
-                    'distributors': set(),
-                    'count': 0
-                }
-            
-            title_info[title]['distributors'].add(program)
-            title_info[title]['count'] += 1
-        
         # Sort by count (descending) to prioritize titles that appear more often
-        sorted_titles = sorted(title_info.items(), key=lambda x: x[1]['count'], reverse=True)
+        sorted_titles = sorted(missing_titles.items(), key=lambda x: x[1]['count'], reverse=True)
         
         # Write to CSV
         os.makedirs(config.CSV_DIR, exist_ok=True)
@@ -1132,7 +2210,7 @@ def _write_missing_titles_to_file(missing_items):
                 distributors_str = ', '.join(sorted(info['distributors']))
                 writer.writerow([title, distributors_str, info['count']])
         
-        unique_titles_count = len(title_info)
+        unique_titles_count = len(missing_titles)
         
         logger.info(f"Missing titles file created: {unique_titles_count} unique titles")
         
@@ -1141,6 +2219,8 @@ def _write_missing_titles_to_file(missing_items):
 
 def _cleanup_temp_files():
     """Clean up temporary files in product_files directory"""
+    if not os.path.isdir(config.TEMP_DIR):
+        return
     for fname in os.listdir(config.TEMP_DIR):
         fpath = os.path.join(config.TEMP_DIR, fname)
         if os.path.isfile(fpath) and not fname.startswith("."):
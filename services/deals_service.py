@@ -2,16 +2,15 @@
 Deals matching service
 Matches affiliate products with Steam top sellers
 """
-import csv
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import config
 from utils.logger import logger
 from database.db_connect import get_connection
+from utils.catalog_snapshot import open_catalog
 
 def find_matching_deals():
     """
@@ -23,53 +22,51 @@ def find_matching_deals():
     logger.info("Finding deals by matching affiliate products with Steam top sellers")
     
     try:
-        # Read product file
-        with open(config.PRODUCTS_CSV, encoding="utf-8") as pf:
-            product_reader = csv.reader(pf)
-            product_list = list(product_reader)
-            # Skip header row if present
-            if product_list and product_list[0][0] == "PROGRAM_NAME":
-                product_list = product_list[1:]
+        # Open the indexed product catalogue
+        catalog = open_catalog()
+        if catalog is None:
+            return []
         
         # Read Steam top sellers from database
         connection = get_connection()
         if not connection:
             logger.error("Failed to get database connection")
+            catalog.close()
             return []
         
-        cursor = connection.cursor()
-        cursor.execute("SELECT title FROM topsellers ORDER BY id ASC")
-        steam_rows = cursor.fetchall()
-        cursor.close()
-        connection.close()
-        
-        # Convert to list format for compatibility
-        steam_list = [[row[0]] for row in steam_rows]
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT title FROM topsellers ORDER BY id ASC")
+            steam_rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
         
         deals = []
         
-        # Match products with Steam top sellers
+        # Match products with Steam top sellers via the title index
         # CSV columns: PROGRAM_NAME, ID, TITLE, LINK, IMAGE_LINK, AVAILABILITY, PRICE, SALE_PRICE, DISCOUNT
-        for s_row in steam_list:
-            target_title = s_row[0]
-            for p_row in product_list:
-                if len(p_row) >= 6 and target_title == p_row[2] and (p_row[5] == "in stock" or p_row[5] == "in_stock"):
-                    game_obj = {
-                        "source": p_row[0],
-                        "title": p_row[2],
-                        "link": p_row[3],
-                        "image_link": p_row[4],
-                    }
-                    # Add discount if available (IndieGala products have it)
-                    if len(p_row) >= 9 and p_row[8]:
-                        game_obj["DISCOUNT"] = p_row[8]
-                    # Add price fields for validation
-                    if len(p_row) >= 8:
-                        if p_row[7]:  # SALE_PRICE
-                            game_obj["SALE_PRICE"] = p_row[7]
-                        if p_row[6]:  # PRICE
-                            game_obj["PRICE"] = p_row[6]
-                    deals.append(game_obj)
+        with catalog:
+            for (target_title,) in steam_rows:
+                if not target_title:
+                    continue
+                for product in catalog.by_title(target_title):
+                    if target_title == product["TITLE"] and product["AVAILABILITY"] in ("in stock", "in_stock"):
+                        game_obj = {
+                            "source": product["PROGRAM_NAME"],
+                            "title": product["TITLE"],
+                            "link": product["LINK"],
+                            "image_link": product["IMAGE_LINK"],
+                        }
+                        # Add discount if available (IndieGala products have it)
+                        if product.get("DISCOUNT"):
+                            game_obj["DISCOUNT"] = product["DISCOUNT"]
+                        # Add price fields for validation
+                        if product.get("SALE_PRICE"):
+                            game_obj["SALE_PRICE"] = product["SALE_PRICE"]
+                        if product.get("PRICE"):
+                            game_obj["PRICE"] = product["PRICE"]
+                        deals.append(game_obj)
         
         logger.info(f"Found {len(deals)} matching deals")
         return deals
@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.db_connect import get_connection, execute_query, execute_many
 from utils.logger import logger
+from utils.title_normalizer import normalize_title
 from services.image_cache_service import download_igdb_image, is_image_cached
 
 
@@ -55,39 +56,44 @@ def fetch_all_genres():
     all_genres = []
 
     connection = get_connection()
+    if not connection:
+        logger.error("Failed to get database connection")
+        return None
 
-    while True:
-        query = (
-            "fields id,name;"
-            f"limit {limit};"
-            f"offset {offset};"
-        )
-        response = post('https://api.igdb.com/v4/genres', headers=headers, data=query)
+    try:
+        while True:
+            query = (
+                "fields id,name;"
+                f"limit {limit};"
+                f"offset {offset};"
+            )
+            response = post('https://api.igdb.com/v4/genres', headers=headers, data=query)
 
-        if response.status_code != 200:
-            print(f"Error {response.status_code}: {response.text}")
-            break
+            if response.status_code != 200:
+                print(f"Error {response.status_code}: {response.text}")
+                break
 
-        genres_batch = response.json()
+            genres_batch = response.json()
 
-        if not genres_batch:
-            break
+            if not genres_batch:
+                break
 
-        for genre in genres_batch:
-            execute_query("INSERT INTO genres (id, name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE name = VALUES(name)", (genre['id'], genre['name'],), fetch=False, connection=connection)
+            for genre in genres_batch:
+                execute_query("INSERT INTO genres (id, name) VALUES (%s, %s) ON DUPLICATE KEY UPDATE name = VALUES(name)", (genre['id'], genre['name'],), fetch=False, connection=connection)
             
-        # Commit after each batch
-        connection.commit()
-        batch_count += 1
+            # Commit after each batch
+            connection.commit()
+            batch_count += 1
 
-        offset += limit
+            offset += limit
 
-        if len(genres_batch) < limit:
-            break
+            if len(genres_batch) < limit:
+                break
 
-        time.sleep(0.3)
+            time.sleep(0.3)
+    finally:
+        connection.close()
 
-    connection.close()
     logger.info("Finished fetch_all_genres()")
     return None
 
@@ -116,153 +122,210 @@ def fetch_all_igdb_games():
     batch_count = 0
     
     connection = get_connection()
-    genres_result = execute_query("SELECT id, name FROM genres", fetch=True, connection=connection)
-    valid_genre_ids = set(row[0] for row in genres_result) if genres_result else set()
+    if not connection:
+        logger.error("Failed to get database connection")
+        return all_games
+
+    try:
+        genres_result = execute_query("SELECT id, name FROM genres", fetch=True, connection=connection)
+        valid_genre_ids = set(row[0] for row in genres_result) if genres_result else set()
     
-    while True:
-
-        query = (
-            "fields name,genres,external_games,platforms,cover.image_id;"
-            f"where game_type = 0 & release_dates.platform = 6;"
-            f"limit {limit};"
-            f"offset {offset};"
-        )
+        while True:
+
+            query = (
+                "fields name,genres,external_games,platforms,cover.image_id;"
+                f"where game_type = 0 & release_dates.platform = 6;"
+                f"limit {limit};"
+                f"offset {offset};"
+            )
         
-        try:
-            response = post('https://api.igdb.com/v4/games', headers=headers, data=query)
+            try:
+                response = post('https://api.igdb.com/v4/games', headers=headers, data=query)
             
-            if response.status_code != 200:
-                print(f"Error {response.status_code}: {response.text}")
-                if response.status_code == 429:  # Rate limit
-                    time.sleep(1)
-                    continue
-                break
+                if response.status_code != 200:
+                    print(f"Error {response.status_code}: {response.text}")
+                    if response.status_code == 429:  # Rate limit
+                        time.sleep(1)
+                        continue
+                    break
             
-            games_batch = response.json()
-            #Write to database
+                games_batch = response.json()
+                #Write to database
             
-            # If no games returned, we've reached the end
-            if not games_batch:
-                break
+                # If no games returned, we've reached the end
+                if not games_batch:
+                    break
+
+                # Fetch all item_ids that already have genres assigned (once per batch)
+                items_with_genres_result = execute_query("SELECT DISTINCT item_id FROM item_genres", fetch=True, connection=connection)
+                items_with_genres = set(row[0] for row in items_with_genres_result) if items_with_genres_result else set()
 
-            # Fetch all item_ids that already have genres assigned (once per batch)
-            items_with_genres_result = execute_query("SELECT DISTINCT item_id FROM item_genres", fetch=True, connection=connection)
-            items_with_genres = set(row[0] for row in items_with_genres_result) if items_with_genres_result else set()
-
-            # Prepare batch data for items
-            items_to_insert = []
-            igdb_ids_to_query = []
-
-            for game in games_batch:
-                # Extract cover image_id if available
-                cover_image_id = None
-                if 'cover' in game and game['cover']:
-                    if isinstance(game['cover'], dict) and 'image_id' in game['cover']:
-                        cover_image_id = game['cover']['image_id']
-                    elif isinstance(game['cover'], str):
-                        cover_image_id = game['cover']
+                # Prepare batch data for items
+                items_to_insert = []
+                igdb_ids_to_query = []
+
+                for game in games_batch:
+                    # Extract cover image_id if available
+                    cover_image_id = None
+                    if 'cover' in game and game['cover']:
+                        if isinstance(game['cover'], dict) and 'image_id' in game['cover']:
+                            cover_image_id = game['cover']['image_id']
+                        elif isinstance(game['cover'], str):
+                            cover_image_id = game['cover']
                 
-                items_to_insert.append((game['name'], "base game", game["id"], cover_image_id))
-                igdb_ids_to_query.append(game["id"])
+                    items_to_insert.append((game['name'], normalize_title(game['name']), "base game", game["id"], cover_image_id))
+                    igdb_ids_to_query.append(game["id"])
 
-            # Batch insert all items at once
-            try:
-                execute_many(
-                    "INSERT INTO items (title, item_type, igdb_id, igdb_cover_image_id) VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE title = VALUES(title), igdb_cover_image_id = CASE WHEN VALUES(igdb_cover_image_id) IS NOT NULL AND VALUES(igdb_cover_image_id) != '' AND VALUES(igdb_cover_image_id) != '0' THEN CAST(VALUES(igdb_cover_image_id) AS CHAR(100)) ELSE igdb_cover_image_id END",
-                    items_to_insert,
-                    connection=connection,
-                    buffered=True
-                )
+                # Batch insert all items at once
+                try:
+                    execute_many(
+                        "INSERT INTO items (title, normalized_title, item_type, igdb_id, igdb_cover_image_id) VALUES (%s, %s, %s, %s, %s) ON DUPLICATE KEY UPDATE title = VALUES(title), normalized_title = VALUES(normalized_title), igdb_cover_image_id = CASE WHEN VALUES(igdb_cover_image_id) IS NOT NULL AND VALUES(igdb_cover_image_id) != '' AND VALUES(igdb_cover_image_id) != '0' THEN CAST(VALUES(igdb_cover_image_id) AS CHAR(100)) ELSE igdb_cover_image_id END",
+                        items_to_insert,
+                        connection=connection,
+                        buffered=True
+                    )
                 
-                print(f"Batch inserted {len(items_to_insert)} games")
+                    print(f"Batch inserted {len(items_to_insert)} games")
                 
-                # Batch query to get all item_ids for this batch
-                format_strings = ','.join(['%s'] * len(igdb_ids_to_query))
-                items_results = execute_query(
-                    f"SELECT * FROM items WHERE igdb_id IN ({format_strings})",
-                    tuple(igdb_ids_to_query),
-                    fetch=True,
-                    connection=connection,
-                    buffered=True
-                )
+                    # Batch query to get all item_ids for this batch
+                    format_strings = ','.join(['%s'] * len(igdb_ids_to_query))
+                    items_results = execute_query(
+                        f"SELECT id, igdb_id FROM items WHERE igdb_id IN ({format_strings})",
+                        tuple(igdb_ids_to_query),
+                        fetch=True,
+                        connection=connection,
+                        buffered=True
+                    )
                 
-                # Create mapping: igdb_id -> item_id (primary key is first column, igdb_id is 4th column)
-                # Adjust indices based on your actual table schema
-                igdb_to_item_map = {}
-                for row in items_results:
-                    item_id = row[0]  # First column is primary key
-                    igdb_id = row[3] if len(row) > 3 else row[2]  # Adjust based on schema
-                    igdb_to_item_map[igdb_id] = item_id
+                    # Create mapping: igdb_id -> item_id
+                    igdb_to_item_map = {}
+                    for item_id, igdb_id in items_results:
+                        igdb_to_item_map[igdb_id] = item_id
                 
-                # Prepare genre inserts
-                genre_inserts = []
+                    # Prepare genre inserts
+                    genre_inserts = []
                 
-                for game in games_batch:
-                    igdb_id = game["id"]
-                    item_id = igdb_to_item_map.get(igdb_id)
+                    for game in games_batch:
+                        igdb_id = game["id"]
+                        item_id = igdb_to_item_map.get(igdb_id)
                     
-                    if not item_id:
-                        print(f"Warning: Could not find item_id for game {game.get('name', 'unknown')}")
-                        continue
+                        if not item_id:
+                            print(f"Warning: Could not find item_id for game {game.get('name', 'unknown')}")
+                            continue
                     
-                    # Check if genres already assigned
-                    if item_id not in items_with_genres:
-                        game_genres = game.get("genres", [])
-                        if game_genres:
-                            for genre_id in game_genres:
-                                # Only add if genre exists in valid_genre_ids
-                                if genre_id in valid_genre_ids:
-                                    genre_inserts.append((item_id, genre_id))
-                                else:
-                                    print(f"Warning: Genre ID {genre_id} not found in database for game {game.get('name', 'unknown')}")
+                        # Check if genres already assigned
+                        if item_id not in items_with_genres:
+                            game_genres = game.get("genres", [])
+                            if game_genres:
+                                for genre_id in game_genres:
+                                    # Only add if genre exists in valid_genre_ids
+                                    if genre_id in valid_genre_ids:
+                                        genre_inserts.append((item_id, genre_id))
+                                    else:
+                                        print(f"Warning: Genre ID {genre_id} not found in database for game {game.get('name', 'unknown')}")
                         
-                        # Mark as processed
-                        items_with_genres.add(item_id)
+                            # Mark as processed
+                            items_with_genres.add(item_id)
                 
-                # Batch insert all genres at once
-                if genre_inserts:
-                    execute_many(
-                        "INSERT INTO item_genres (item_id, genre_id) VALUES (%s, %s) ON DUPLICATE KEY UPDATE item_id = item_id",
-                        genre_inserts,
-                        connection=connection,
-                        buffered=True
-                    )
-                    print(f"Batch inserted {len(genre_inserts)} genre relationships")
+                    # Batch insert all genres at once
+                    if genre_inserts:
+                        execute_many(
+                            "INSERT INTO item_genres (item_id, genre_id) VALUES (%s, %s) ON DUPLICATE KEY UPDATE item_id = item_id",
+                            genre_inserts,
+                            connection=connection,
+                            buffered=True
+                        )
+                        print(f"Batch inserted {len(genre_inserts)} genre relationships")
                 
-                # Single commit for entire batch
-                connection.commit()
-                print(f"Committed batch {batch_count + 1}")
+                    # Single commit for entire batch
+                    connection.commit()
+                    print(f"Committed batch {batch_count + 1}")
                 
-            except Exception as e:
-                print(f"ERROR processing batch: {e}")
-                logger.error(f"ERROR processing batch: {e}")
-                import traceback
-                traceback.print_exc()
-                connection.rollback()
-
-            all_games.extend(games_batch)
-            batch_count += 1
+                except Exception as e:
+                    print(f"ERROR processing batch: {e}")
+                    logger.error(f"ERROR processing batch: {e}")
+                    import traceback
+                    traceback.print_exc()
+                    connection.rollback()
+
+                all_games.extend(games_batch)
+                batch_count += 1
             
-            print(f"Batch {batch_count}: Total games collected: {len(all_games)}")
-            print("-" * 60)
+                print(f"Batch {batch_count}: Total games collected: {len(all_games)}")
+                print("-" * 60)
                         
-            time.sleep(0.3)  
+                time.sleep(0.3)  
             
-            # Safety check - if we get less than limit, we're done
-            if len(games_batch) < limit:
-                break
+                # Safety check - if we get less than limit, we're done
+                if len(games_batch) < limit:
+                    break
             
-            offset += limit
+                offset += limit
                 
-        except Exception as e:
-            print(f"Error fetching batch at offset {offset}: {e}")
-            print(f"Response text: {response.text if 'response' in locals() else 'No response'}")
-            break
+            except Exception as e:
+                print(f"Error fetching batch at offset {offset}: {e}")
+                print(f"Response text: {response.text if 'response' in locals() else 'No response'}")
+                break
     
-    connection.close()
+        # Fill normalized titles for items inserted by other means (e.g. manual imports)
+        backfill_normalized_titles(connection)
+    finally:
+        connection.close()
+
     logger.info(f"Finished fetch_all_igdb_games(). Total games fetched: {len(all_games)}")
     return all_games
 
+def backfill_normalized_titles(connection=None, batch_size=5000):
+    """
+    Compute normalized_title for items that don't have it yet
+    
+    Args:
+        connection: Database connection (optional, opens one if not given)
+        batch_size: Number of items updated per commit
+    
+    Returns:
+        int: Number of items updated
+    """
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+        if not connection:
+            logger.error("Failed to get database connection")
+            return 0
+    
+    updated = 0
+    last_id = 0
+    
+    try:
+        while True:
+            rows = execute_query(
+                "SELECT id, title FROM items WHERE normalized_title IS NULL AND id > %s ORDER BY id LIMIT %s",
+                (last_id, batch_size),
+                fetch=True,
+                connection=connection,
+                buffered=True
+            )
+            if not rows:
+                break
+            
+            execute_many(
+                "UPDATE items SET normalized_title = %s WHERE id = %s",
+                [(normalize_title(title or ""), item_id) for item_id, title in rows],
+                connection=connection
+            )
+            connection.commit()
+            
+            updated += len(rows)
+            last_id = rows[-1][0]
+        
+        if updated:
+            logger.info(f"Backfilled normalized_title for {updated} items")
+    finally:
+        if own_connection:
+            connection.close()
+    
+    return updated
+
 def download_igdb_images_for_items():
     """
     Download IGDB cover images for all items that have igdb_cover_image_id but images not yet downloaded.
@@ -379,6 +442,8 @@ if __name__ == "__main__":
         download_igdb_images_for_items()
     elif len(sys.argv) > 1 and sys.argv[1] == "complete":
         fetch_games_and_download_images()
+    elif len(sys.argv) > 1 and sys.argv[1] == "backfill-normalized-titles":
+        backfill_normalized_titles()
     else:
         # Run normal data collection
         fetch_all_genres()
@@ -0,0 +1,313 @@
+"""
+Offer source adapters
+A source adapter fetches one store's data and streams normalized offer records
+(OFFER_FIELDS dictionaries). Adapters register themselves, run_sources() fetches
+all of them concurrently and hands their record streams to one ingest function
+"""
+from abc import ABC, abstractmethod
+import threading
+import time
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import logger
+from utils.rate_limiter import AdaptiveRateLimiter
+from utils.distributors import register_distributor_name
+
+# Fields of a normalized offer record (same columns as PRODUCTS_CSV)
+OFFER_FIELDS = ["PROGRAM_NAME", "ID", "TITLE", "LINK", "IMAGE_LINK", "AVAILABILITY", "PRICE", "SALE_PRICE", "DISCOUNT"]
+
+class SourceAdapter(ABC):
+    """
+    Base class for offer sources
+    Subclasses set name and implement fetch() (network/browser work, run concurrently
+    with the other sources) and records() (stream of offer records from the fetched payload)
+    """
+    name = None
+    timeout = None  # Seconds allowed for fetch() (None = no limit)
+    rate = None  # Initial requests/sec of the source's rate limiter (None = no limiter)
+    max_rate = None
+    required = False  # A failure aborts the whole run
+    catalog = False  # Records belong to the products catalogue (PRODUCTS_CSV, removal tracking)
+    depends_on = ()  # Sources whose records must be ingested before this one's (skipped if all fail)
+    distributor_names = {}  # PROGRAM_NAME -> distributors.name for stores the source introduces
+
+    @abstractmethod
+    def fetch(self, rate_limiter=None, cancelled=None):
+        """
+        Fetch the source data
+        A fetch that outlives its deadline is abandoned by the runner, so long fetches
+        should check cancelled between requests/pages and stop early
+
+        Args:
+            rate_limiter: AdaptiveRateLimiter for the source's requests (None if rate is unset)
+            cancelled: threading.Event set when the deadline passed or the run was aborted
+
+        Returns:
+            Payload passed to records(), or None if the fetch failed or was cancelled
+        """
+
+    @abstractmethod
+    def records(self, payload):
+        """
+        Stream normalized offer records
+
+        Args:
+            payload: Value returned by fetch()
+
+        Yields:
+            dict: Offer record keyed by OFFER_FIELDS
+        """
+
+    def fingerprint(self, payload):
+        """
+        Content fingerprint of the payload, used to skip unchanged catalogue input
+
+        Returns:
+            str: Hex digest, or None if the source can't tell
+        """
+        return None
+
+def is_cancelled(cancelled):
+    """
+    Check a fetch cancellation event
+
+    Args:
+        cancelled: threading.Event passed to fetch(), or None
+
+    Returns:
+        bool: True if the fetch should stop
+    """
+    return cancelled is not None and cancelled.is_set()
+
+# Registered adapters in registration order
+_sources = {}
+
+# Abandoned fetches that may still be running: source name -> (future, cancel event)
+_orphaned_fetches = {}
+
+def register_source(adapter):
+    """
+    Register a source adapter (replaces one with the same name)
+
+    Args:
+        adapter: SourceAdapter instance
+
+    Returns:
+        SourceAdapter: The adapter
+    """
+    _sources[adapter.name] = adapter
+    for program_name, distributor_name in adapter.distributor_names.items():
+        register_distributor_name(program_name, distributor_name)
+    return adapter
+
+def get_sources(names=None):
+    """
+    Get registered adapters
+
+    Args:
+        names: Source names to select (None = all, in registration order)
+
+    Returns:
+        list: SourceAdapter instances
+    """
+    if names is None:
+        return list(_sources.values())
+    return [_sources[name] for name in names if name in _sources]
+
+def run_sources(adapters, ingest):
+    """
+    Run source adapters: fetch all concurrently, then ingest their records stage by stage
+    Each fetch has its own deadline and rate limiter. A source that fails or times out is
+    dropped without holding up the others, unless it is required. A source is skipped
+    when all of its dependencies in this run failed; dependencies that are not part of
+    the run are assumed to be ingested already
+
+    Args:
+        adapters: List of SourceAdapter instances
+        ingest: Callable(streams) -> bool, called once per stage with a list of
+            (adapter, payload, record iterator) tuples
+
+    Returns:
+        dict: Source name -> metrics, or None if a required source failed
+    """
+    metrics = {adapter.name: _new_source_metrics() for adapter in adapters}
+    payloads = _fetch_all(adapters, metrics)
+    if any(adapter.required and payloads.get(adapter.name) is None for adapter in adapters):
+        for adapter in adapters:
+            if adapter.name not in payloads:
+                metrics[adapter.name]["status"] = "cancelled"
+        _log_source_metrics(metrics)
+        return None
+
+    names = {adapter.name for adapter in adapters}
+    # Failed fetches count as done so their dependents are skipped, not blocked
+    done = {adapter.name for adapter in adapters if payloads.get(adapter.name) is None}
+    remaining = [adapter for adapter in adapters if payloads.get(adapter.name) is not None]
+    success = True
+
+    while remaining:
+        # A stage holds every source whose in-run dependencies have been ingested
+        stage = [a for a in remaining if all(dep in done or dep not in names for dep in a.depends_on)]
+        blocked = [a for a in remaining if a not in stage]
+        for adapter in list(stage):
+            run_deps = [dep for dep in adapter.depends_on if dep in names]
+            if run_deps and all(metrics[dep]["status"] != "ok" for dep in run_deps):
+                metrics[adapter.name]["status"] = "skipped"
+                logger.warning(f"{adapter.name}: skipped, depends on failed source(s) {', '.join(run_deps)}")
+                stage.remove(adapter)
+                done.add(adapter.name)
+        if not stage and not blocked:
+            break
+        if not stage:
+            for adapter in blocked:
+                metrics[adapter.name]["status"] = "skipped"
+            logger.error(f"Circular source dependencies: {', '.join(a.name for a in blocked)}")
+            break
+
+        streams = [
+            (adapter, payloads[adapter.name], _metered(adapter.records(payloads[adapter.name]), metrics[adapter.name]))
+            for adapter in stage
+        ]
+        stage_start = time.monotonic()
+        try:
+            ok = ingest(streams)
+        except Exception as e:
+            logger.error(f"Error ingesting {', '.join(a.name for a in stage)}: {e}")
+            ok = False
+        stage_elapsed = time.monotonic() - stage_start
+
+        for adapter in stage:
+            metrics[adapter.name]["ingest_seconds"] = round(stage_elapsed, 2)
+            if not ok:
+                metrics[adapter.name]["status"] = "failed"
+                success = success and not adapter.required
+            done.add(adapter.name)
+        remaining = blocked
+
+    _log_source_metrics(metrics)
+    return metrics if success else None
+
+def _fetch_all(adapters, metrics):
+    """
+    Run every adapter's fetch() in its own thread with per-source deadlines
+    A timed-out fetch is signalled to stop and its result is ignored; until it
+    returns it is tracked as orphaned and reported by the next run
+
+    Returns:
+        dict: Source name -> payload (None if failed/timed out)
+    """
+    payloads = {}
+    if not adapters:
+        return payloads
+
+    _log_orphaned_fetches()
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix="source-fetch")
+    cancel_events = {adapter.name: threading.Event() for adapter in adapters}
+    futures = {}
+    try:
+        for adapter in adapters:
+            limiter = None
+            if adapter.rate:
+                limiter = AdaptiveRateLimiter(rate=adapter.rate, min_rate=min(0.2, adapter.rate),
+                                              max_rate=adapter.max_rate or adapter.rate)
+            metrics[adapter.name]["limiter"] = limiter
+            futures[adapter.name] = executor.submit(
+                _timed_fetch, adapter, limiter, cancel_events[adapter.name], metrics[adapter.name]
+            )
+
+        # Required sources first, so their failure returns at once
+        for adapter in sorted(adapters, key=lambda a: not a.required):
+            source_metrics = metrics[adapter.name]
+            remaining = None
+            if adapter.timeout is not None:
+                remaining = max(0.0, start + adapter.timeout - time.monotonic())
+            try:
+                payloads[adapter.name] = futures[adapter.name].result(timeout=remaining)
+                if payloads[adapter.name] is None:
+                    source_metrics["status"] = "failed"
+            except TimeoutError:
+                logger.error(f"{adapter.name}: fetch timed out after {adapter.timeout}s - continuing without it")
+                payloads[adapter.name] = None
+                source_metrics["status"] = "timeout"
+            except Exception as e:
+                logger.error(f"{adapter.name}: fetch failed: {e}")
+                payloads[adapter.name] = None
+                source_metrics["status"] = "failed"
+
+            if adapter.required and payloads[adapter.name] is None:
+                break
+    finally:
+        # Stop whatever is still running (timed out, or not awaited after a required failure)
+        for name, future in futures.items():
+            if not future.done():
+                cancel_events[name].set()
+                _orphaned_fetches[name] = (future, cancel_events[name])
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Sources fetched in {time.monotonic() - start:.1f}s")
+    return payloads
+
+def _log_orphaned_fetches():
+    """Forget finished orphaned fetches and warn about the ones still running"""
+    for name, (future, _) in list(_orphaned_fetches.items()):
+        if future.done():
+            del _orphaned_fetches[name]
+        else:
+            logger.warning(f"{name}: fetch abandoned by a previous run is still running")
+
+def _timed_fetch(adapter, rate_limiter, cancelled, source_metrics):
+    """Run one adapter's fetch() and record its wall time"""
+    start = time.monotonic()
+    try:
+        return adapter.fetch(rate_limiter, cancelled)
+    finally:
+        source_metrics["fetch_seconds"] = round(time.monotonic() - start, 2)
+        logger.info(f"{adapter.name}: fetch finished in {source_metrics['fetch_seconds']:.1f}s")
+
+def _metered(records, source_metrics):
+    """
+    Pass records through, counting them and the time spent producing them
+
+    Yields:
+        dict: Next record
+    """
+    iterator = iter(records)
+    produce_seconds = 0.0
+    try:
+        while True:
+            start = time.monotonic()
+            try:
+                record = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                produce_seconds += time.monotonic() - start
+            source_metrics["records"] += 1
+            yield record
+    finally:
+        source_metrics["produce_seconds"] = round(produce_seconds, 2)
+
+def _new_source_metrics():
+    return {"status": "ok", "fetch_seconds": 0.0, "produce_seconds": 0.0, "ingest_seconds": 0.0, "records": 0, "limiter": None}
+
+def _log_source_metrics(metrics):
+    """Log one line per source and replace limiter objects with their stats"""
+    for name, source_metrics in metrics.items():
+        limiter = source_metrics.pop("limiter", None)
+        source_metrics["rate_limiter"] = limiter.stats() if limiter else None
+
+        busy = source_metrics["fetch_seconds"] + source_metrics["produce_seconds"]
+        throughput = source_metrics["records"] / busy if busy else 0.0
+        line = (f"Source {name}: {source_metrics['status']}, {source_metrics['records']} records, "
+                f"fetch {source_metrics['fetch_seconds']:.1f}s, produce {source_metrics['produce_seconds']:.1f}s, "
+                f"ingest {source_metrics['ingest_seconds']:.1f}s, {throughput:.0f} records/s")
+        if limiter:
+            stats = source_metrics["rate_limiter"]
+            line += f", {stats['requests']} requests ({stats['throttled']} throttled, final rate {stats['rate']}/s)"
+        logger.info(line)
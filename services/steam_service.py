@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
 from utils.logger import logger
+from utils.price_parser import parse_price
 from database.db_connect import get_connection, execute_many
 
 def fetch_steam_topsellers():
@@ -158,22 +159,7 @@ def _parse_price(price_str):
     Returns:
         float: Parsed price value, or 0.00 if price is Free/N/A/invalid
     """
-    if not price_str or price_str in ["Free", "N/A", "?", ""]:
-        return 0.00
-    
-    try:
-        # Remove currency symbols, commas, and whitespace
-        cleaned = str(price_str).replace("$", "").replace("€", "").replace("£", "").replace(",", "").strip()
-        
-        # Try to extract numeric value (handle cases like "$29.99" or "29.99")
-        import re
-        match = re.search(r'(\d+\.?\d*)', cleaned)
-        if match:
-            return float(match.group(1))
-        
-        return 0.00
-    except Exception:
-        return 0.00
+    return parse_price(price_str, default=0.00)
 
 def _save_to_database(games):
     """
@@ -324,11 +310,13 @@ def get_steam_prices():
             logger.error("Failed to get database connection")
             return []
         
-        cursor = connection.cursor()
-        cursor.execute("SELECT title, price FROM topsellers ORDER BY id ASC")
-        rows = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT title, price FROM topsellers ORDER BY id ASC")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
         
         # Convert to list format: [[title, price], [title, price], ...]
         games = [[row[0], row[1]] for row in rows]
@@ -14,6 +14,7 @@ import config
 from database.db_connect import get_connection, execute_query
 from utils.logger import logger
 from utils.helpers import add_posted_game
+from utils.distributors import normalize_distributor_name
 
 def post_deal_to_twitter(deal):
     """
@@ -73,7 +74,7 @@ def post_deal_to_twitter(deal):
             else:
                 try:
                     # Normalize distributor name to match database
-                    normalized_distributor = _normalize_distributor_name(deal_source)
+                    normalized_distributor = normalize_distributor_name(deal_source)
                     
                     # Find the relevant offer_id based on offer details (title, affiliate_url, image_url, distributor)
                     offer_row = execute_query(
@@ -107,8 +108,7 @@ def post_deal_to_twitter(deal):
                 except Exception as e:
                     logger.error(f"Error recording posted game in database: {e}")
                 finally:
-                    if connection and connection.is_connected():
-                        connection.close()
+                    connection.close()
                 
             logger.info(f"Tweet posted successfully for {deal_title}")
             logger.info(f"Tweet ID: {response.data.get('id') if hasattr(response, 'data') else 'N/A'}")
@@ -219,28 +219,3 @@ def _format_source_name(source):
         return "GamersGate"
     else:
         return source
-
-def _normalize_distributor_name(program_name):
-    """
-    Normalize PROGRAM_NAME from deal source to match database distributor names
-    Same logic as affiliate_service.py
-    
-    Args:
-        program_name: Original program/source name
-    
-    Returns:
-        str: Normalized distributor name for database lookup
-    """
-    program_name = program_name.strip()
-    
-    # Mapping from deal source to database distributor name
-    name_mapping = {
-        "GamersGate.com": "GamersGate",
-        "GOG.COM INT": "GOG",
-        "YUPLAY": "Yuplay",
-        "IndieGala": "IndieGala",
-    }
-    
-    # Return mapped name if exists, otherwise return original
-    return name_mapping.get(program_name, program_name)
-
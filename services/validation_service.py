@@ -11,11 +11,11 @@ from selenium.common.exceptions import TimeoutException
 import json
 import csv
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import os
 import sys
-import re
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,6 +23,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import config
 from utils.logger import logger
 from utils.helpers import load_posted_games, save_json_file
+from utils.price_parser import parse_price
+from utils.title_normalizer import normalize_title
 
 def validate_deals_batch(deals):
     """
@@ -64,6 +66,12 @@ def validate_deals_batch(deals):
                     pass  # Silently skip failed deals
         
     finally:
+        pool_stats = browser_pool.stats()
+        logger.info(f"Browser pool: {pool_stats['checkouts']} checkouts, {pool_stats['timeouts']} timeouts, "
+                    f"avg wait {pool_stats['avg_wait_ms']}ms (max {pool_stats['max_wait_ms']}ms), "
+                    f"utilisation {pool_stats['utilisation']:.0%} with {pool_stats['pool_size']} browsers "
+                    f"for {config.VALIDATION_WORKERS} workers")
+        
         # Close all browsers when done
         browser_pool.close_all()
     
@@ -98,15 +106,10 @@ def _validate_deal_worker(deal, posted_games_list, steam_games, browser_pool):
         if deal["title"] in posted_games_list:
             return None
         
-        # Get driver from pool (with retry)
-        max_retries = 10
-        for _ in range(max_retries):
-            driver = browser_pool.get_driver()
-            if driver:
-                break
-            time.sleep(0.1)
-        
+        # Get driver from pool (waits in line for a free browser)
+        driver = browser_pool.get_driver()
         if not driver:
+            logger.warning(f"No browser available for {deal['title']} - deal not validated")
             return None
         
         # Validate the deal
@@ -166,7 +169,7 @@ def _validate_gog_deal(deal, driver, steam_games):
         discount_text = driver.execute_script("return arguments[0].textContent;", discount_span).strip().replace('%', '').replace('-', '')
         discount = int(discount_text)
         discounted_price_text = driver.execute_script("return arguments[0].textContent;", discounted_price_span).strip()
-        discounted_price = float(discounted_price_text)
+        discounted_price = parse_price(discounted_price_text)
         
         if discount and discounted_price and _compare_prices(deal["title"], discounted_price, steam_games):
             deal["discount"] = discount
@@ -206,8 +209,7 @@ def _validate_gamersgate_deal(deal, driver, steam_games):
         
         discounted_price_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".catalog-item--price span")))
         discounted_price_text = driver.execute_script("return arguments[0].textContent;", discounted_price_element).strip()
-        price_numeric_text = discounted_price_text.replace('$', '').replace(',', '').strip()
-        discounted_price = float(price_numeric_text)
+        discounted_price = parse_price(discounted_price_text)
         
         image_src = driver.find_element(By.CSS_SELECTOR, "div.catalog-item--image img").get_attribute("src")
         
@@ -237,8 +239,8 @@ def _validate_yuplay_deal(deal, driver, steam_games):
             if discount_span:
                 discount = driver.execute_script("return arguments[0].textContent;", discount_span[0]).strip()
                 discount_int = int(discount)
-                price = driver.execute_script("return arguments[0].textContent;", discounted_price_element).replace('$', '').replace(',', '').strip()
-                price_float = float(price)
+                price = driver.execute_script("return arguments[0].textContent;", discounted_price_element)
+                price_float = parse_price(price)
                 
                 if discount_int > 0 and price_float and _compare_prices(deal["title"], price_float, steam_games):
                     deal["discount"] = discount_int
@@ -259,18 +261,10 @@ def _validate_indiegala_deal(deal, steam_games):
 
         # Prefer "salePrice", fallback to "PRICE"
         if "SALE_PRICE" in deal:
-            try:
-                price_str = str(deal["SALE_PRICE"]).replace("$", "").replace(",", "").replace(" ", "").strip()
-                discounted_price = float(price_str) if price_str else 0
-            except Exception:
-                discounted_price = 0
+            discounted_price = parse_price(deal["SALE_PRICE"], default=0)
 
         if discounted_price == 0 and "PRICE" in deal:
-            try:
-                price_str = str(deal["PRICE"]).replace("$", "").replace(",", "").replace(" ", "").strip()
-                discounted_price = float(price_str) if price_str else 0
-            except Exception:
-                discounted_price = 0
+            discounted_price = parse_price(deal["PRICE"], default=0)
 
         # Extract discount if present (check both uppercase DISCOUNT from CSV and lowercase discount)
         if "DISCOUNT" in deal and deal["DISCOUNT"]:
@@ -326,34 +320,6 @@ def _handle_gamersgate_age_verification(driver):
     except TimeoutException:
         pass
 
-def _normalize_title_for_matching(title):
-    """
-    Normalize title for fuzzy matching by removing punctuation and normalizing whitespace
-    Same logic as affiliate_service.py for consistency
-    
-    Args:
-        title: Title string to normalize
-    
-    Returns:
-        str: Normalized title for matching
-    """
-    # Convert to lowercase
-    normalized = title.lower().strip()
-    
-    # Replace common punctuation with spaces (hyphens, colons, semicolons, etc.)
-    normalized = re.sub(r'[-:;–—]', ' ', normalized)
-    
-    # Remove other punctuation (keep apostrophes for names like "O'Brien")
-    normalized = re.sub(r'[^\w\s\']', '', normalized)
-    
-    # Collapse multiple spaces to single space
-    normalized = re.sub(r'\s+', ' ', normalized)
-    
-    # Trim
-    normalized = normalized.strip()
-    
-    return normalized
-
 def _compare_prices(title, price, steam_games):
     """
     Compare deal price with Steam price
@@ -367,8 +333,8 @@ def _compare_prices(title, price, steam_games):
     Returns:
         bool: True if deal is cheaper than Steam, False otherwise
     """
-    # Normalize title for matching (same as affiliate_service)
-    normalized_title = _normalize_title_for_matching(title)
+    # Normalize title for matching (same keys as items.normalized_title)
+    normalized_title = normalize_title(title)
     
     for s_row in steam_games:
         if len(s_row) >= 2:
@@ -376,7 +342,7 @@ def _compare_prices(title, price, steam_games):
             steam_price = s_row[1]  # decimal(10,2) or None
             
             # Normalize Steam title for matching
-            normalized_steam = _normalize_title_for_matching(steam_title)
+            normalized_steam = normalize_title(steam_title)
             
             # If titles match, compare prices
             if normalized_title == normalized_steam:
@@ -402,11 +368,13 @@ def _load_steam_prices():
         if not connection:
             return []
         
-        cursor = connection.cursor()
-        cursor.execute("SELECT title, price FROM topsellers ORDER BY id ASC")
-        rows = cursor.fetchall()
-        cursor.close()
-        connection.close()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT title, price FROM topsellers ORDER BY id ASC")
+            rows = cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
         
         # Convert to list format: [[title, price], [title, price], ...]
         # price is decimal(10,2) or None for free games
@@ -509,11 +477,27 @@ def create_chrome_driver():
     return driver
 
 class BrowserPool:
-    """Pool of persistent browsers for reuse"""
-    def __init__(self, pool_size=3):
+    """
+    Pool of persistent browsers for reuse
+    get_driver() blocks until a browser is free; waiting threads are served in
+    arrival order (FIFO), so no validation worker is starved under contention
+    """
+    def __init__(self, pool_size=3, timeout=None):
         self.drivers = []
         self.available_drivers = []
-        self.lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.waiters = deque()
+        self.timeout = config.BROWSER_CHECKOUT_TIMEOUT if timeout is None else timeout
+        self.closed = False
+        
+        # Counters exposed through stats()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.busy_time = 0.0
+        self.checked_out = {}  # id(driver) -> checkout time
+        self.created_at = time.monotonic()
         
         # Create pool of browsers
         for i in range(pool_size):
@@ -521,23 +505,88 @@ class BrowserPool:
             self.drivers.append(driver)
             self.available_drivers.append(driver)
     
-    def get_driver(self):
-        """Get an available driver from the pool"""
-        with self.lock:
-            if self.available_drivers:
-                return self.available_drivers.pop()
-            else:
-                return None
+    def get_driver(self, timeout=None):
+        """
+        Check out a driver, waiting in line up to timeout seconds
+        
+        Args:
+            timeout: Seconds to wait (default: config.BROWSER_CHECKOUT_TIMEOUT)
+        
+        Returns:
+            WebDriver: Driver (give it back with return_driver), or None on timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        ticket = object()
+        
+        with self.condition:
+            self.waiters.append(ticket)
+            try:
+                # Only the longest-waiting thread may take a free driver
+                while not self.closed and not (self.available_drivers and self.waiters[0] is ticket):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        logger.warning(f"Timed out after {timeout}s waiting for a browser")
+                        return None
+                    self.condition.wait(remaining)
+                
+                if self.closed:
+                    return None
+                
+                driver = self.available_drivers.pop()
+                now = time.monotonic()
+                wait_time = now - start
+                self.checkouts += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+                self.checked_out[id(driver)] = now
+                return driver
+            finally:
+                self.waiters.remove(ticket)
+                # The next thread in line may be able to proceed now
+                self.condition.notify_all()
     
     def return_driver(self, driver):
         """Return driver to the pool for reuse"""
-        with self.lock:
+        with self.condition:
             if driver in self.drivers:
+                checked_out = self.checked_out.pop(id(driver), None)
+                if checked_out is not None:
+                    self.busy_time += time.monotonic() - checked_out
                 self.available_drivers.append(driver)
+                self.condition.notify_all()
+    
+    def stats(self):
+        """
+        Get pool usage statistics
+        
+        Returns:
+            dict: Pool size, in-use/idle/waiting counts, wait time counters and
+                utilisation (share of browser time spent checked out since creation)
+        """
+        with self.condition:
+            now = time.monotonic()
+            busy_time = self.busy_time + sum(now - t for t in self.checked_out.values())
+            capacity = len(self.drivers) * (now - self.created_at)
+            return {
+                "pool_size": len(self.drivers),
+                "in_use": len(self.checked_out),
+                "idle": len(self.available_drivers),
+                "waiting": len(self.waiters),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_time / self.checkouts * 1000, 1) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_time * 1000, 1),
+                "utilisation": round(busy_time / capacity, 3) if capacity else 0.0
+            }
     
     def close_all(self):
-        """Close all drivers in the pool"""
-        with self.lock:
+        """Close all drivers in the pool (waiting threads get None)"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
             for driver in self.drivers:
                 try:
                     driver.quit()
@@ -0,0 +1,97 @@
+"""
+IndieGala listing parser tests against saved listing pages (tests/fixtures)
+Run with: python -m unittest discover tests
+"""
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from services import affiliate_service
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+def _soup(name):
+    return BeautifulSoup(_load_fixture(name), "html.parser")
+
+class ParseIndieGalaCardsTest(unittest.TestCase):
+    def setUp(self):
+        self.products = affiliate_service._parse_indiegala_cards(_soup("indiegala_on_sale_page1.html"))
+
+    def test_skips_cards_without_product_link(self):
+        self.assertEqual(
+            [product["TITLE"] for product in self.products],
+            ["Hollow Knight", "Baldur's Gate 3: Deluxe Edition", "Stardew Valley"]
+        )
+
+    def test_builds_feed_row(self):
+        self.assertEqual(self.products[0], {
+            "PROGRAM_NAME": "IndieGala",
+            "ID": "IG-Hollow-Knight",
+            "TITLE": "Hollow Knight",
+            "LINK": "https://www.indiegala.com/store/game/hollow-knight/367520" + affiliate_service.INDIEGALA_AFFILIATE_REF,
+            "IMAGE_LINK": "https://www.indiegalacdn.com/imgs/devs/hollow-knight.jpg",
+            "AVAILABILITY": "in stock",
+            "PRICE": "14.99€",
+            "SALE_PRICE": "7.49€",
+            "DISCOUNT": "50",
+        })
+
+    def test_lazy_loaded_image_and_nested_title(self):
+        product = self.products[1]
+        self.assertEqual(product["IMAGE_LINK"], "https://www.indiegalacdn.com/imgs/devs/bg3-deluxe.jpg")
+        self.assertEqual(product["ID"], "IG-Baldur's-Gate-3-Deluxe-Edition")
+        self.assertEqual(product["DISCOUNT"], "10")
+
+    def test_card_without_discount_or_old_price(self):
+        product = self.products[2]
+        self.assertEqual(product["LINK"], "https://www.indiegala.com/store/game/stardew-valley/413150" + affiliate_service.INDIEGALA_AFFILIATE_REF)
+        self.assertEqual(product["IMAGE_LINK"], "")
+        self.assertEqual(product["PRICE"], "13.99€")
+        self.assertEqual(product["SALE_PRICE"], "13.99€")
+        self.assertEqual(product["DISCOUNT"], "")
+
+class ParseIndieGalaLastPageTest(unittest.TestCase):
+    def test_reads_highest_page_from_href_and_onclick_links(self):
+        self.assertEqual(affiliate_service._parse_indiegala_last_page(_soup("indiegala_on_sale_page1.html")), 12)
+
+    def test_no_pagination(self):
+        self.assertIsNone(affiliate_service._parse_indiegala_last_page(_soup("indiegala_on_sale_last_page.html")))
+
+    def test_capped_at_max_pages(self):
+        with mock.patch.object(affiliate_service.config, "INDIEGALA_MAX_PAGES", 5):
+            self.assertEqual(affiliate_service._parse_indiegala_last_page(_soup("indiegala_on_sale_page1.html")), 5)
+
+class FetchIndieGalaHttpTest(unittest.TestCase):
+    def _fetch(self, failing_pages=()):
+        def fake_fetch_page(session, page, rate_limiter=None):
+            if page in failing_pages:
+                return None
+            return _load_fixture("indiegala_on_sale_page1.html" if page == 1 else "indiegala_on_sale_last_page.html")
+
+        with mock.patch.object(affiliate_service, "_fetch_indiegala_page", side_effect=fake_fetch_page) as fetch_page:
+            return affiliate_service._fetch_indiegala_http(), fetch_page
+
+    def test_all_pages_fetched(self):
+        products, fetch_page = self._fetch()
+        self.assertEqual(fetch_page.call_count, 12)
+        self.assertEqual([product["TITLE"] for product in products][-1], "Celeste")
+        self.assertEqual(len(products), 4)
+
+    def test_failed_page_rejects_listing(self):
+        products, fetch_page = self._fetch(failing_pages={7})
+        self.assertIsNone(products)
+        # Failed page is retried once before giving up
+        self.assertEqual([call.args[1] for call in fetch_page.call_args_list].count(7), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,315 @@
+"""
+Indexed binary snapshot of the products catalogue (PRODUCTS_CSV)
+Written next to the CSV while it is produced and opened with mmap, so consumers get
+keyed lookups by PROGRAM_NAME and normalized title without re-parsing the CSV
+
+File layout (little-endian):
+    header          magic, version, row count, section offsets
+    fields          JSON list of column names
+    row data        one UTF-8 record per row, fields joined by \\x1f
+    row offsets     uint64 per row (+1 end offset) into row data
+    program index   sorted keys -> posting lists of row numbers
+    title index     same, keyed by normalize_title(TITLE)
+"""
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.logger import logger
+from utils.title_normalizer import normalize_title
+
+SNAPSHOT_MAGIC = b"CATSNAP\x00"
+SNAPSHOT_VERSION = 1
+
+# magic, version, row count, fields / row data / row offsets / program index / title index offsets
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_U64 = struct.Struct("<Q")
+_FIELD_SEP = "\x1f"
+
+class CatalogSnapshotWriter:
+    """
+    Streams catalogue rows into a new snapshot file
+    Row data is written as it arrives, only row offsets and the index postings are kept
+    in memory. The snapshot replaces the previous one atomically on commit()
+    """
+    def __init__(self, fields, path=None):
+        self.fields = list(fields)
+        self.path = path or config.PRODUCTS_SNAPSHOT
+        self.tmp_path = self.path + ".tmp"
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.file = open(self.tmp_path, "wb")
+        self.file.write(b"\x00" * _HEADER.size)
+        self.fields_offset = self.file.tell()
+        self.file.write(json.dumps(self.fields).encode("utf-8"))
+        self.data_offset = self.file.tell()
+
+        self.row_offsets = [0]
+        self.program_index = {}
+        self.title_index = {}
+
+    def add(self, row):
+        """
+        Append one catalogue row
+
+        Args:
+            row: Dictionary keyed by the snapshot fields
+        """
+        row_number = len(self.row_offsets) - 1
+        values = [str(row.get(field) or "").replace(_FIELD_SEP, " ") for field in self.fields]
+        record = _FIELD_SEP.join(values).encode("utf-8")
+        self.file.write(record)
+        self.row_offsets.append(self.row_offsets[-1] + len(record))
+
+        program_name = (row.get("PROGRAM_NAME") or "").strip()
+        self.program_index.setdefault(program_name, []).append(row_number)
+
+        title = (row.get("TITLE") or "").strip()
+        if title:
+            self.title_index.setdefault(normalize_title(title), []).append(row_number)
+
+    def commit(self):
+        """Write offsets, indexes and header, then move the snapshot into place"""
+        self._pad()
+        offsets_offset = self.file.tell()
+        self.file.write(struct.pack(f"<{len(self.row_offsets)}Q", *self.row_offsets))
+        program_offset = self._write_index(self.program_index)
+        title_offset = self._write_index(self.title_index)
+
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.row_offsets) - 1,
+            self.fields_offset, self.data_offset, offsets_offset, program_offset, title_offset
+        ))
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        logger.info(f"Wrote catalogue snapshot with {len(self.row_offsets) - 1} rows "
+                    f"({len(self.program_index)} programs, {len(self.title_index)} titles)")
+
+    def discard(self):
+        """Drop a partially written snapshot"""
+        if not self.file.closed:
+            self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def _pad(self):
+        """Align the next section to 8 bytes"""
+        remainder = self.file.tell() % 8
+        if remainder:
+            self.file.write(b"\x00" * (8 - remainder))
+
+    def _write_index(self, index):
+        """
+        Write one index section
+        [key count][key offsets (n+1)][posting offsets (n+1)][postings][key bytes]
+
+        Returns:
+            int: File offset of the section
+        """
+        self._pad()
+        section_offset = self.file.tell()
+        keys = sorted((key.encode("utf-8"), postings) for key, postings in index.items())
+
+        key_offsets = [0]
+        posting_offsets = [0]
+        for key, postings in keys:
+            key_offsets.append(key_offsets[-1] + len(key))
+            posting_offsets.append(posting_offsets[-1] + len(postings))
+
+        self.file.write(_U64.pack(len(keys)))
+        self.file.write(struct.pack(f"<{len(key_offsets)}Q", *key_offsets))
+        self.file.write(struct.pack(f"<{len(posting_offsets)}Q", *posting_offsets))
+        for _, postings in keys:
+            self.file.write(struct.pack(f"<{len(postings)}I", *postings))
+        self.file.write(b"".join(key for key, _ in keys))
+        return section_offset
+
+class _SnapshotIndex:
+    """Read-only view of one index section (binary search over sorted keys)"""
+    def __init__(self, mm, offset):
+        self.mm = mm
+        self.count = _U64.unpack_from(mm, offset)[0]
+        self.key_offsets = offset + 8
+        self.posting_offsets = self.key_offsets + (self.count + 1) * 8
+        total_postings = _U64.unpack_from(mm, self.posting_offsets + self.count * 8)[0]
+        self.postings = self.posting_offsets + (self.count + 1) * 8
+        self.keys = self.postings + total_postings * 4
+
+    def _key(self, i):
+        start, end = struct.unpack_from("<2Q", self.mm, self.key_offsets + i * 8)
+        return self.mm[self.keys + start:self.keys + end]
+
+    def get(self, key):
+        """
+        Look up row numbers for a key
+
+        Returns:
+            list: Row numbers in catalogue order (empty if the key is absent)
+        """
+        target = key.encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low == self.count or self._key(low) != target:
+            return []
+
+        start, end = struct.unpack_from("<2Q", self.mm, self.posting_offsets + low * 8)
+        return list(struct.unpack_from(f"<{end - start}I", self.mm, self.postings + start * 4))
+
+    def keys_list(self):
+        """All keys in sorted order"""
+        return [self._key(i).decode("utf-8") for i in range(self.count)]
+
+class CatalogSnapshot:
+    """
+    Memory-mapped catalogue snapshot
+    Rows are decoded on access, so keyed lookups only touch the rows they return
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            (magic, version, self.row_count, fields_offset, self.data_offset,
+             self.offsets_offset, program_offset, title_offset) = _HEADER.unpack_from(self.mm, 0)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError(f"Not a catalogue snapshot (version {version}): {path}")
+
+            self.fields = json.loads(self.mm[fields_offset:self.data_offset].decode("utf-8"))
+            self.program_index = _SnapshotIndex(self.mm, program_offset)
+            self.title_index = _SnapshotIndex(self.mm, title_offset)
+        except Exception:
+            self.mm.close()
+            raise
+
+    def __len__(self):
+        return self.row_count
+
+    def __iter__(self):
+        for i in range(self.row_count):
+            yield self.row(i)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Unmap the snapshot file"""
+        self.mm.close()
+
+    def row(self, row_number):
+        """
+        Decode one row
+
+        Args:
+            row_number: Row position in the catalogue
+
+        Returns:
+            dict: Row keyed by field name
+        """
+        start, end = struct.unpack_from("<2Q", self.mm, self.offsets_offset + row_number * 8)
+        values = self.mm[self.data_offset + start:self.data_offset + end].decode("utf-8").split(_FIELD_SEP)
+        return dict(zip(self.fields, values))
+
+    def by_program(self, program_name):
+        """
+        Get all rows of one affiliate program
+
+        Args:
+            program_name: PROGRAM_NAME value, e.g. "GamersGate.com"
+
+        Returns:
+            list: Row dictionaries in catalogue order
+        """
+        return [self.row(i) for i in self.program_index.get(program_name.strip())]
+
+    def by_title(self, title):
+        """
+        Get all rows whose title normalizes to the same key as title
+
+        Args:
+            title: Title (normalized with normalize_title before lookup)
+
+        Returns:
+            list: Row dictionaries in catalogue order
+        """
+        return [self.row(i) for i in self.title_index.get(normalize_title(title))]
+
+    def programs(self):
+        """
+        Get the distinct program names
+
+        Returns:
+            list: Sorted PROGRAM_NAME values
+        """
+        return self.program_index.keys_list()
+
+def build_snapshot_from_csv(csv_path=None, path=None):
+    """
+    Build a snapshot from an existing products CSV
+
+    Args:
+        csv_path: Products CSV (defaults to config.PRODUCTS_CSV)
+        path: Snapshot path (defaults to config.PRODUCTS_SNAPSHOT)
+
+    Returns:
+        bool: True if the snapshot was written
+    """
+    csv_path = csv_path or config.PRODUCTS_CSV
+    writer = None
+    try:
+        with open(csv_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            writer = CatalogSnapshotWriter(reader.fieldnames or [], path)
+            for row in reader:
+                writer.add(row)
+        writer.commit()
+        return True
+    except Exception as e:
+        logger.error(f"Error building catalogue snapshot from {csv_path}: {e}")
+        if writer:
+            writer.discard()
+        return False
+
+def open_catalog(csv_path=None, path=None):
+    """
+    Open the catalogue snapshot, rebuilding it first if it is missing or older than the CSV
+
+    Args:
+        csv_path: Products CSV (defaults to config.PRODUCTS_CSV)
+        path: Snapshot path (defaults to config.PRODUCTS_SNAPSHOT)
+
+    Returns:
+        CatalogSnapshot: Open snapshot (close it when done), or None if unavailable
+    """
+    csv_path = csv_path or config.PRODUCTS_CSV
+    path = path or config.PRODUCTS_SNAPSHOT
+
+    if not os.path.exists(csv_path):
+        logger.error(f"Products CSV not found: {csv_path}")
+        return None
+
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(csv_path):
+        logger.info("Catalogue snapshot missing or stale - rebuilding from CSV")
+        if not build_snapshot_from_csv(csv_path, path):
+            return None
+
+    try:
+        return CatalogSnapshot(path)
+    except Exception as e:
+        logger.error(f"Error opening catalogue snapshot: {e}")
+        return None
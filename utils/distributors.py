@@ -0,0 +1,39 @@
+"""
+Distributor name mapping shared by ingestion and posting
+Feeds identify stores by PROGRAM_NAME, the database by distributors.name
+"""
+
+# PROGRAM_NAME (feed/deal source) -> distributors.name
+DISTRIBUTOR_NAMES = {
+    "GamersGate.com": "GamersGate",
+    "GOG.COM INT": "GOG",
+    "YUPLAY": "YUPLAY",  # Database has YUPLAY in all caps
+    "IndieGala": "IndieGala",
+}
+
+def register_distributor_name(program_name, distributor_name):
+    """
+    Add a PROGRAM_NAME mapping (used by source adapters for new stores)
+
+    Args:
+        program_name: Name used in the feed/deal source
+        distributor_name: Name in the distributors table
+    """
+    DISTRIBUTOR_NAMES[program_name.strip()] = distributor_name
+
+def normalize_distributor_name(program_name):
+    """
+    Normalize PROGRAM_NAME to match database distributor names
+    Examples:
+    - "GamersGate.com" → "GamersGate"
+    - "GOG.COM INT" → "GOG"
+    - "IndieGala" → "IndieGala" (same)
+
+    Args:
+        program_name: Original program/source name
+
+    Returns:
+        str: Distributor name for database lookup (original name if unmapped)
+    """
+    program_name = program_name.strip()
+    return DISTRIBUTOR_NAMES.get(program_name, program_name)
@@ -0,0 +1,173 @@
+"""
+Fuzzy title matching index over normalized item titles
+Feed titles that miss the exact normalized_title lookup are matched here. Candidates
+are the items sharing the query's base title (edition suffixes stripped) plus those
+from an inverted token index (only the rarest query tokens are probed, so cost does
+not grow with the catalogue). All candidates are ranked by trigram similarity of the
+full titles against a threshold, so "X" and "X PC" only match when close enough
+"""
+from array import array
+
+from utils.title_normalizer import normalize_title
+
+# Trailing suffixes removed before matching, on normalized titles without apostrophes (longest first)
+EDITION_SUFFIXES = sorted([
+    "game of the year edition", "game of the year", "goty edition", "goty",
+    "digital deluxe edition", "deluxe edition", "deluxe",
+    "definitive edition", "complete edition", "ultimate edition", "gold edition",
+    "standard edition", "special edition", "premium edition", "enhanced edition",
+    "anniversary edition", "collectors edition", "legendary edition",
+    "directors cut", "remastered", "remaster", "hd remaster",
+    "pc", "steam", "steam key", "pc steam", "windows",
+], key=len, reverse=True)
+
+DEFAULT_THRESHOLD = 0.85
+
+def strip_edition(normalized):
+    """
+    Reduce a normalized title to its base title for fuzzy matching
+    Drops apostrophes ("baldur's" == "baldurs") and trailing edition/platform suffixes
+
+    Args:
+        normalized: Title produced by normalize_title
+
+    Returns:
+        str: Base title (a title that is only a suffix, e.g. "goty", is kept)
+    """
+    normalized = normalized.replace("'", "")
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in EDITION_SUFFIXES:
+            if normalized.endswith(" " + suffix):
+                normalized = normalized[:-len(suffix) - 1].rstrip()
+                stripped = True
+                break
+    return normalized
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _numbers(tokens):
+    return frozenset(token for token in tokens if token.isdigit())
+
+def _full_title(normalized):
+    return normalized.replace("'", "")
+
+class FuzzyTitleIndex:
+    """
+    Candidate index over (item_id, normalized_title) pairs
+    Items with the query's base title and the token-vote survivors from the rarest
+    query tokens' postings are re-ranked together on full-title similarity
+    """
+    def __init__(self, items, threshold=DEFAULT_THRESHOLD, probe_tokens=3, max_candidates=200, max_posting=20000):
+        """
+        Args:
+            items: Iterable of (item_id, normalized_title), first item wins on duplicate titles
+            threshold: Minimum trigram similarity (Dice coefficient) for a fuzzy match
+            probe_tokens: Number of rarest query tokens whose postings are read
+            max_candidates: Candidates re-ranked per query (highest token votes first)
+            max_posting: Postings longer than this ("the", "of") are skipped when rarer tokens exist
+        """
+        self.threshold = threshold
+        self.probe_tokens = probe_tokens
+        self.max_candidates = max_candidates
+        self.max_posting = max_posting
+
+        self.item_ids = array("q")
+        self.titles = []
+        self.base_map = {}
+        self.postings = {}
+
+        seen = set()
+        for item_id, normalized_title in items:
+            title = _full_title(normalized_title or "")
+            base = strip_edition(title)
+            if not base or title in seen:
+                continue
+            seen.add(title)
+            position = len(self.titles)
+            self.item_ids.append(item_id)
+            self.titles.append(title)
+            self.base_map.setdefault(base, []).append(position)
+            for token in set(base.split()):
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = array("I")
+                posting.append(position)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def match(self, title):
+        """
+        Find the best matching item for a title
+
+        Args:
+            title: Raw or normalized title
+
+        Returns:
+            tuple: (item_id, score), or None if nothing reaches the threshold
+        """
+        full = _full_title(normalize_title(title))
+        base = strip_edition(full)
+        if not base:
+            return None
+
+        # Same base title ("x", "x deluxe edition", "x pc") is always a candidate, never an automatic hit
+        candidates = list(self.base_map.get(base, ()))
+
+        tokens = set(base.split())
+        probed = sorted((self.postings[t] for t in tokens if t in self.postings), key=len)
+        if probed:
+            probed = [p for p in probed if len(p) <= self.max_posting] or probed[:1]
+            probed = probed[:self.probe_tokens]
+
+            votes = {}
+            for posting in probed:
+                for candidate in posting:
+                    votes[candidate] = votes.get(candidate, 0) + 1
+
+            # A candidate must share at least half of the probed tokens
+            min_votes = (len(probed) + 1) // 2
+            voted = [c for c, v in votes.items() if v >= min_votes]
+            if len(voted) > self.max_candidates:
+                voted.sort(key=lambda c: -votes[c])
+                voted = voted[:self.max_candidates]
+            candidates.extend(voted)
+
+        query_numbers = _numbers(full.split())
+        query_grams = _trigrams(full)
+        best = None
+        best_score = self.threshold
+        for candidate in candidates:
+            candidate_title = self.titles[candidate]
+            # Sequels/volumes must agree ("Game 2" is not "Game 3")
+            if _numbers(candidate_title.split()) != query_numbers:
+                continue
+            grams = _trigrams(candidate_title)
+            score = 2 * len(query_grams & grams) / (len(query_grams) + len(grams))
+            if score > best_score or (score == best_score and best is None):
+                best, best_score = candidate, score
+
+        if best is None:
+            return None
+        return self.item_ids[best], round(best_score, 3)
+
+    def match_many(self, titles):
+        """
+        Match a batch of titles
+
+        Args:
+            titles: Iterable of titles
+
+        Returns:
+            dict: title -> (item_id, score) for titles that matched
+        """
+        matches = {}
+        for title in titles:
+            result = self.match(title)
+            if result:
+                matches[title] = result
+        return matches
@@ -0,0 +1,177 @@
+"""
+Price parsing shared by feed ingestion, scrapers and validation
+Handles currency symbols and codes, HTML entities, thousands separators and
+locale decimal commas ("1.234,56", "19,99 €", "$1,299.00", "USD 29.99")
+"""
+from functools import lru_cache
+import html
+import re
+
+# Currency symbols and codes, longest first so "R$" wins over "$"
+CURRENCY_SYMBOLS = {
+    "R$": "BRL",
+    "C$": "CAD",
+    "A$": "AUD",
+    "zł": "PLN",
+    "$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "¥": "JPY",
+    "₽": "RUB",
+    "₹": "INR",
+    "₩": "KRW",
+}
+CURRENCY_CODES = ("USD", "EUR", "GBP", "JPY", "RUB", "PLN", "BRL", "CAD", "AUD", "CHF", "SEK", "NOK", "DKK", "INR", "KRW", "CNY", "TRY")
+
+# Values that mean "no price"
+NO_PRICE_VALUES = frozenset(["", "free", "n/a", "?", "-"])
+
+# Memoized price strings (a feed has a few thousand distinct values, e.g. ~11k in 300k rows)
+PRICE_CACHE_SIZE = 65536
+
+# Plain "29.99" with optional currency text around it, parsed without the separator logic
+_PLAIN_PRICE = re.compile(r"[^\d&.,\-]*(\d+(?:\.\d+)?)[^\d&.,]*")
+# Optional sign and bare leading decimal point (".99", "-5.00"), but not the dot of "Rs.99"
+_NUMBER = re.compile(r"(?:(?<![\w.,])-)?(?:(?<![^\W\d_])\.)?\d[\d.,'\s]*")
+_CURRENCY_CODE = re.compile(r"\b(" + "|".join(CURRENCY_CODES) + r")\b", re.IGNORECASE)
+_GROUPING = str.maketrans("", "", " '\u00a0\u202f\u2009")
+
+def parse_price(value, default=None):
+    """
+    Parse a price string to a float
+
+    Args:
+        value: Price string (or number), e.g. "$29.99", "19,99 €", "1.234,56 EUR", "Free"
+        default: Value returned when no price can be parsed
+
+    Returns:
+        float: Parsed price, or default
+    """
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    result = _parse_price_cached(value)
+    return default if result is None else result
+
+def parse_prices(values, default=None):
+    """
+    Parse a list of price strings (batch API)
+    Feeds repeat a small set of price strings, so most values are cache hits
+
+    Args:
+        values: Iterable of price strings
+        default: Value used for entries that can't be parsed
+
+    Returns:
+        list: Parsed prices in input order
+    """
+    parse = _parse_price_cached
+    results = []
+    for value in values:
+        if value is None:
+            results.append(default)
+        elif isinstance(value, (int, float)):
+            results.append(float(value))
+        else:
+            result = parse(value)
+            results.append(default if result is None else result)
+    return results
+
+def detect_currency(value):
+    """
+    Detect the currency of a price string
+
+    Args:
+        value: Price string
+
+    Returns:
+        str: ISO 4217 currency code, or None if no symbol/code found
+    """
+    if not value:
+        return None
+    text = html.unescape(str(value))
+
+    match = _CURRENCY_CODE.search(text)
+    if match:
+        return match.group(1).upper()
+
+    for symbol, code in CURRENCY_SYMBOLS.items():
+        if symbol in text:
+            return code
+    return None
+
+def calculate_discount(list_price, sale_price):
+    """
+    Calculate discount percentage from list price and sale price
+
+    Args:
+        list_price: List price (float or price string)
+        sale_price: Sale price (float or price string)
+
+    Returns:
+        int: Rounded whole number percentage, or 0 if it can't be calculated
+    """
+    list_value = parse_price(list_price)
+    sale_value = parse_price(sale_price)
+
+    if list_value is None or sale_value is None or list_value <= 0:
+        return 0
+    return round((list_value - sale_value) / list_value * 100)
+
+def format_price(value):
+    """
+    Format a parsed price as a plain decimal string
+
+    Args:
+        value: Price as float (or None)
+
+    Returns:
+        str: e.g. "29.99", or "" for None
+    """
+    return "" if value is None else f"{value:.2f}"
+
+@lru_cache(maxsize=PRICE_CACHE_SIZE)
+def _parse_price_cached(value):
+    """Parse one price string (None if it contains no price)"""
+    plain = _PLAIN_PRICE.fullmatch(value)
+    if plain:
+        return float(plain.group(1))
+
+    text = value.strip()
+    if text.lower() in NO_PRICE_VALUES:
+        return None
+    if "&" in text:
+        text = html.unescape(text)
+
+    match = _NUMBER.search(text)
+    if not match:
+        return None
+
+    number = match.group(0).translate(_GROUPING).rstrip(".,")
+    if not number:
+        return None
+
+    last_dot = number.rfind(".")
+    last_comma = number.rfind(",")
+    if last_dot >= 0 and last_comma >= 0:
+        # Both separators: the last one is the decimal separator
+        if last_comma > last_dot:
+            number = number.replace(".", "").replace(",", ".")
+        else:
+            number = number.replace(",", "")
+    elif last_comma >= 0:
+        # Comma only: decimal comma unless it groups thousands ("1,299", "1,299,000")
+        if number.count(",") == 1 and len(number) - last_comma - 1 != 3:
+            number = number.replace(",", ".")
+        else:
+            number = number.replace(",", "")
+    elif number.count(".") > 1:
+        # Dots used as thousands separators ("1.299.000")
+        number = number.replace(".", "")
+
+    try:
+        return float(number)
+    except ValueError:
+        return None
@@ -0,0 +1,86 @@
+"""
+Adaptive request rate limiter shared by concurrent scrapers/API clients
+"""
+import threading
+import time
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe request pacer with additive-increase / multiplicative-decrease control
+    Requests are spaced 1/rate seconds apart across all threads. Every success raises
+    the rate a little, every throttled response (429/5xx) halves it and pauses all callers
+    """
+    def __init__(self, rate=1.0, min_rate=0.1, max_rate=10.0, increase=0.1, decrease=0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+
+        # Counters exposed through stats()
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait_time = 0.0
+
+    def acquire(self):
+        """Block until the caller may send its next request"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_time)
+            self.next_time = slot + 1 / self.rate
+            self.requests += 1
+            wait = slot - now
+            self.total_wait_time += wait
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def on_success(self):
+        """Record a successful response (additive increase)"""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        """
+        Record a throttled response (multiplicative decrease)
+
+        Args:
+            retry_after: Seconds the server asked to wait (optional)
+        """
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self.next_time = max(self.next_time, time.monotonic() + pause)
+            self.throttled += 1
+
+    def stats(self):
+        """
+        Get limiter statistics
+
+        Returns:
+            dict: Current rate, request/throttle counts and total pacing wait
+        """
+        with self.lock:
+            return {
+                "rate": round(self.rate, 3),
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "total_wait_seconds": round(self.total_wait_time, 3)
+            }
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given in seconds
+
+    Args:
+        value: Header value (or None)
+
+    Returns:
+        float: Seconds to wait, or None if missing/not numeric
+    """
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,67 @@
+"""
+Title normalization shared by ingestion, validation and the items catalogue
+Produces the same keys as the original three-pass regex normalizer (stored in
+items.normalized_title), with one precompiled translate() pass and a memo cache
+"""
+from functools import lru_cache
+import re
+
+# Memoized titles (feeds and the catalogue repeat the same titles across runs/calls)
+NORMALIZE_CACHE_SIZE = 65536
+
+# Punctuation that separates words ("Title: Subtitle", "Title - Edition")
+_SEPARATORS = "-:;–—"
+
+def _build_translate_table():
+    """
+    translate() table: separators -> space, ASCII punctuation and control characters
+    removed; letters, digits, "_", "'" and whitespace kept
+    """
+    table = {ord(char): " " for char in _SEPARATORS}
+    for code in range(128):
+        char = chr(code)
+        if code not in table and not (char.isalnum() or char.isspace() or char in "_'"):
+            table[code] = None
+    return table
+
+_TRANSLATE_TABLE = _build_translate_table()
+# Only needed for titles with non-ASCII characters left after translate()
+_NON_WORD = re.compile(r"[^\w\s']")
+
+def normalize_title(title):
+    """
+    Normalize title for fuzzy matching by removing punctuation and normalizing whitespace
+    Handles variations like:
+    - "Cronos: The New Dawn - Deluxe Edition" vs "Cronos: The New Dawn Deluxe Edition"
+    - Different hyphen styles, colons, etc.
+
+    Args:
+        title: Title string to normalize
+
+    Returns:
+        str: Normalized title for matching
+    """
+    if not title:
+        return ""
+    return _normalize_cached(title)
+
+def normalize_many(titles):
+    """
+    Normalize a batch of titles (bulk API)
+
+    Args:
+        titles: Iterable of title strings
+
+    Returns:
+        list: Normalized titles in input order
+    """
+    normalize = _normalize_cached
+    return [normalize(title) if title else "" for title in titles]
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_cached(title):
+    """Normalize one title (lowercase, translate punctuation, collapse whitespace)"""
+    normalized = title.lower().translate(_TRANSLATE_TABLE)
+    if not normalized.isascii():
+        normalized = _NON_WORD.sub("", normalized)
+    return " ".join(normalized.split())